@@ -0,0 +1,96 @@
+"""
+Shared test fixtures.
+
+Redis is an in-memory fakeredis server (with Lua, for the scripts in
+throttling and otp), fresh for every test, and the per-process caches in
+front of it are emptied so no test sees another's state.
+"""
+
+import fakeredis
+import pytest
+from rest_framework.test import APIClient
+
+import satyacheck.celery  # noqa: F401 (makes the project's Celery app current)
+from satyacheck.services import redis_client
+
+
+@pytest.fixture(autouse=True)
+def redis_server(monkeypatch):
+    """In-memory Redis shared by the sync and asyncio clients."""
+    from satyacheck.apps.admin_panel.bans import ban_set
+    from satyacheck.apps.users import activity, otp
+    from satyacheck.core import authentication, throttling
+    from satyacheck.services import cache_service
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_client, '_client', fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(redis_client, '_async_client', fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(otp, '_verify_script', None)
+    monkeypatch.setattr(throttling, '_script', None)
+    monkeypatch.setattr(authentication, '_cache_script', None)
+
+    # Activity is flushed explicitly by the tests that read it
+    monkeypatch.setattr(activity.activity_buffer, '_ensure_started', lambda: None)
+
+    from django.core.cache import caches
+    caches['default'].clear()
+    cache_service._local.clear_prefix('')
+    for namespace in cache_service._namespaces.values():
+        namespace._version = None
+    authentication._users.clear_prefix('')
+    authentication._versions.clear_prefix('')
+    ban_set._bans = None
+
+    yield server
+
+    activity.activity_buffer._activities = []
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    from satyacheck.apps.users.tests.factories import UserFactory
+    return UserFactory()
+
+
+@pytest.fixture
+def admin_user(db):
+    from satyacheck.apps.users.tests.factories import UserFactory
+    return UserFactory(role='admin', is_staff=True)
+
+
+@pytest.fixture
+def moderator(db):
+    from satyacheck.apps.users.tests.factories import UserFactory
+    return UserFactory(role='journalist')
+
+
+def _authenticate(client, user):
+    """Send requests from client with an access token for user."""
+    from satyacheck.core.authentication import PrincipalRefreshToken
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {PrincipalRefreshToken.for_user(user).access_token}')
+    return client
+
+
+@pytest.fixture
+def authenticate():
+    return _authenticate
+
+
+@pytest.fixture
+def user_client(api_client, user):
+    return _authenticate(api_client, user)
+
+
+@pytest.fixture
+def admin_client(api_client, admin_user):
+    return _authenticate(api_client, admin_user)
+
+
+@pytest.fixture
+def moderator_client(api_client, moderator):
+    return _authenticate(api_client, moderator)
@@ -0,0 +1,24 @@
+"""
+Gunicorn settings, read automatically when gunicorn starts in this directory.
+
+With PROMETHEUS_MULTIPROC_DIR set, workers write metrics to files there
+(see satyacheck.core.metrics). The directory is emptied at startup so
+counters from a previous run are not added in, and a worker's live
+gauges are dropped when it exits.
+"""
+
+import os
+import shutil
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
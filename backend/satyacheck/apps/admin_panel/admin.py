@@ -20,10 +20,13 @@ class AdminReportAdmin(admin.ModelAdmin):
 class ModerationQueueAdmin(admin.ModelAdmin):
     """Admin interface for moderation queue."""
     
-    list_display = ('submission', 'priority', 'assigned_to', 'is_completed', 'created_at')
+    list_display = (
+        'submission', 'priority', 'priority_score', 'assigned_to',
+        'lease_expires_at', 'is_completed', 'created_at'
+    )
     list_filter = ('priority', 'is_completed')
     search_fields = ('submission__title', 'reason')
-    readonly_fields = ('id', 'created_at', 'completed_at')
+    readonly_fields = ('id', 'priority_score', 'created_at', 'completed_at')
 
 
 @admin.register(UserBan)
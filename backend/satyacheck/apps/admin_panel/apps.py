@@ -1 +1,10 @@
-# Init
+from django.apps import AppConfig
+
+
+class AdminPanelConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'satyacheck.apps.admin_panel'
+    verbose_name = 'Admin Panel'
+    
+    def ready(self):
+        import satyacheck.apps.admin_panel.signals
@@ -0,0 +1,134 @@
+"""
+Active ban set.
+
+Active bans live in a Redis sorted set of user IDs scored by their unban
+time (infinity for permanent or open-ended bans), so a ban drops out on
+its unban date without anyone lifting it. Each process keeps a snapshot
+of the set, refreshed every BAN_CACHE_REFRESH seconds, so checking a
+user costs no database queries and usually no Redis round trip either.
+The database is only read to rebuild the set, or while Redis is down.
+
+The set is kept in step with the database by UserBan's save and delete
+signals, and rebuilt by the rebuild_ban_set periodic task in case an
+update was lost. A built set carries a sentinel member; a set without it
+(never built, or evicted by Redis) is not trusted and is rebuilt first.
+"""
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+import logging
+import redis
+import threading
+import time
+
+from satyacheck.services.redis_client import get_redis
+from .models import UserBan
+
+logger = logging.getLogger('satyacheck')
+
+BAN_SET_KEY = 'bans:active'
+# Member present once the set has been built from the database. It lives
+# in the set itself, so it is lost along with the bans if Redis evicts the key.
+BAN_SET_READY_MEMBER = '_ready'
+
+
+def ban_expiry(ban):
+    """Get the unix time a ban ends, or infinity if it does not."""
+    if ban.is_permanent or ban.unban_date is None:
+        return float('inf')
+    return ban.unban_date.timestamp()
+
+
+def active_bans_from_db():
+    """Get {user_id: expiry} for bans that are active now."""
+    bans = UserBan.objects.filter(
+        Q(is_permanent=True) | Q(unban_date__isnull=True) | Q(unban_date__gt=timezone.now())
+    ).only('user_id', 'is_permanent', 'unban_date')
+    return {str(ban.user_id): ban_expiry(ban) for ban in bans}
+
+
+class BanSet:
+    """Process-local snapshot of the shared active ban set."""
+
+    def __init__(self, refresh_interval):
+        """
+        Args:
+            refresh_interval (float): Seconds between snapshot reloads; bans
+                made by other processes take at most this long to apply here
+        """
+        self.refresh_interval = refresh_interval
+        self._bans = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def is_banned(self, user_id):
+        """Check whether user_id has an active ban."""
+        expiry = self._snapshot().get(str(user_id))
+        return expiry is not None and expiry > time.time()
+
+    def add(self, ban):
+        """Add a ban to the shared set and this process's snapshot."""
+        user_id = str(ban.user_id)
+        expiry = ban_expiry(ban)
+        try:
+            get_redis().zadd(BAN_SET_KEY, {user_id: expiry})
+        except redis.RedisError as e:
+            logger.warning(f"Could not add ban for {user_id} to the ban set: {str(e)}")
+        with self._lock:
+            if self._bans is not None:
+                self._bans = dict(self._bans, **{user_id: expiry})
+
+    def remove(self, user_id):
+        """Remove a user from the shared set and this process's snapshot."""
+        user_id = str(user_id)
+        try:
+            get_redis().zrem(BAN_SET_KEY, user_id)
+        except redis.RedisError as e:
+            logger.warning(f"Could not remove ban for {user_id} from the ban set: {str(e)}")
+        with self._lock:
+            if self._bans is not None and user_id in self._bans:
+                self._bans = {key: value for key, value in self._bans.items() if key != user_id}
+
+    def rebuild(self):
+        """Replace the shared set with the active bans in the database."""
+        bans = active_bans_from_db()
+        pipe = get_redis().pipeline()
+        pipe.delete(BAN_SET_KEY)
+        pipe.zadd(BAN_SET_KEY, dict(bans, **{BAN_SET_READY_MEMBER: float('inf')}))
+        pipe.execute()
+        return bans
+
+    def refresh(self):
+        """Reload the snapshot now."""
+        with self._lock:
+            self._bans = self._load()
+            self._loaded_at = time.monotonic()
+
+    def _snapshot(self):
+        if self._bans is None or time.monotonic() - self._loaded_at > self.refresh_interval:
+            self.refresh()
+        return self._bans
+
+    def _load(self):
+        try:
+            now = time.time()
+            pipe = get_redis().pipeline()
+            pipe.zremrangebyscore(BAN_SET_KEY, '-inf', now)
+            pipe.zrangebyscore(BAN_SET_KEY, now, '+inf', withscores=True)
+            _, members = pipe.execute()
+            bans = {member.decode(): expiry for member, expiry in members}
+            if bans.pop(BAN_SET_READY_MEMBER, None) is None:
+                return self.rebuild()
+            return bans
+        except redis.RedisError as e:
+            logger.warning(f"Ban set unavailable, reading bans from the database: {str(e)}")
+            return active_bans_from_db()
+
+
+ban_set = BanSet(settings.BAN_CACHE_REFRESH)
+
+
+def is_banned(user_id):
+    """Check whether user_id has an active ban."""
+    return ban_set.is_banned(user_id)
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.8 on 2026-10-19 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('submissions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBan',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('reason', models.CharField(choices=[('spam', 'Spam'), ('harassment', 'Harassment'), ('misinformation', 'Persistent Misinformation'), ('violation', 'Terms of Service Violation'), ('other', 'Other')], max_length=100)),
+                ('description', models.TextField()),
+                ('is_permanent', models.BooleanField(default=False)),
+                ('unban_date', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('banned_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bans_issued', to=settings.AUTH_USER_MODEL)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ban', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_ban',
+            },
+        ),
+        migrations.CreateModel(
+            name='AdminReport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=500)),
+                ('description', models.TextField()),
+                ('report_type', models.CharField(choices=[('user_report', 'User Report'), ('content_review', 'Content Review'), ('pattern_detection', 'Pattern Detection')], max_length=50)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('rejected', 'Rejected')], default='open', max_length=20)),
+                ('resolution_notes', models.TextField(blank=True, null=True)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_reports', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_reports', to=settings.AUTH_USER_MODEL)),
+                ('reported_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_reports', to=settings.AUTH_USER_MODEL)),
+                ('submission', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='admin_reports', to='submissions.submission')),
+            ],
+            options={
+                'db_table': 'admin_report',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ModerationQueue',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('priority', models.CharField(choices=[('high', 'High'), ('medium', 'Medium'), ('low', 'Low')], default='medium', max_length=20)),
+                ('priority_score', models.FloatField(default=0.0)),
+                ('reason', models.TextField(help_text='Reason for moderation')),
+                ('cluster_key', models.CharField(blank=True, max_length=64, null=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('is_completed', models.BooleanField(default=False)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderation_queue', to=settings.AUTH_USER_MODEL)),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='moderation_queue', to='submissions.submission')),
+            ],
+            options={
+                'db_table': 'moderation_queue',
+                'ordering': ['-priority_score', 'created_at'],
+                'indexes': [models.Index(condition=models.Q(('is_completed', False)), fields=['-priority_score', 'created_at'], name='moderation_open_priority_idx'), models.Index(condition=models.Q(('is_completed', False)), fields=['cluster_key'], name='moderation_open_cluster_idx')],
+            },
+        ),
+    ]
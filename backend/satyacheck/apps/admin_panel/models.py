@@ -101,7 +101,11 @@ class ModerationQueue(models.Model):
     )
     
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
+    # Sort key with ageing folded in; see admin_panel.queue.compute_priority_score
+    priority_score = models.FloatField(default=0.0)
     reason = models.TextField(help_text='Reason for moderation')
+    # Items sharing a key are near-identical and moderated together; see admin_panel.queue.compute_cluster_key
+    cluster_key = models.CharField(max_length=64, blank=True, null=True)
     
     assigned_to = models.ForeignKey(
         User,
@@ -111,6 +115,10 @@ class ModerationQueue(models.Model):
         related_name='moderation_queue'
     )
     
+    # Claims are leases; an expired lease puts the item back in the queue
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    
     is_completed = models.BooleanField(default=False)
     completed_at = models.DateTimeField(blank=True, null=True)
     
@@ -118,7 +126,19 @@ class ModerationQueue(models.Model):
     
     class Meta:
         db_table = 'moderation_queue'
-        ordering = ['-priority', 'created_at']
+        ordering = ['-priority_score', 'created_at']
+        indexes = [
+            models.Index(
+                fields=['-priority_score', 'created_at'],
+                condition=models.Q(is_completed=False),
+                name='moderation_open_priority_idx'
+            ),
+            models.Index(
+                fields=['cluster_key'],
+                condition=models.Q(is_completed=False),
+                name='moderation_open_cluster_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"Queue item for {self.submission.title}"
@@ -0,0 +1,346 @@
+"""
+Moderation work queue.
+
+Items are ordered by a numeric priority built from the misinformation
+score, virality (how many submissions share the content) and age.
+Moderators claim items as time-limited leases, so many moderators can
+pull work at once without taking the same item.
+
+Near-identical submissions share a cluster key. Clusters are claimed and
+decided as a unit, so a viral claim is moderated once, not per copy.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import hashlib
+import math
+import re
+
+from satyacheck.apps.submissions.caching import invalidate_submissions
+from satyacheck.apps.submissions.events import publish_status_change
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.statistics import track_update
+from .models import ModerationQueue
+
+# Fixed origin for the age term, so stored scores stay comparable
+AGE_ORIGIN = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# Moderation decisions accepted by complete()
+DECISIONS = ('approve', 'reject', 'flag')
+
+# Query parameters that differ between shares of the same link
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|igshid|ref|si)$')
+
+
+def compute_base_priority(score, duplicates):
+    """
+    Priority from 0 to 100 before ageing.
+    Up to 60 points for the misinformation score (unanalyzed counts as 50)
+    and up to 40 for virality, growing logarithmically with duplicates.
+    """
+    severity = (50 if score is None else score) / 100
+    virality = min(math.log1p(duplicates) / math.log1p(settings.MODERATION_VIRALITY_SATURATION), 1)
+    return round(60 * severity + 40 * virality, 2)
+
+
+def compute_priority_score(base_priority, created_at):
+    """
+    Sort key for an item.
+
+    Items gain MODERATION_AGE_POINTS_PER_HOUR while they wait. That gain
+    grows at the same rate for every item, so ordering by current
+    priority is the same as ordering by base priority minus the age
+    points at creation. Storing that keeps the order index-friendly
+    without periodic rescoring.
+    """
+    hours = (created_at - AGE_ORIGIN).total_seconds() / 3600
+    return base_priority - settings.MODERATION_AGE_POINTS_PER_HOUR * hours
+
+
+def current_priority(item, now=None):
+    """Get an item's priority including the age it has accumulated."""
+    now = now or timezone.now()
+    hours = (now - AGE_ORIGIN).total_seconds() / 3600
+    return round(item.priority_score + settings.MODERATION_AGE_POINTS_PER_HOUR * hours, 2)
+
+
+def priority_label(base_priority):
+    """Map a base priority to the 'high'/'medium'/'low' label."""
+    if base_priority >= settings.MODERATION_HIGH_PRIORITY:
+        return 'high'
+    if base_priority >= settings.MODERATION_MEDIUM_PRIORITY:
+        return 'medium'
+    return 'low'
+
+
+def compute_cluster_key(submission):
+    """
+    Key shared by near-identical submissions.
+    Text is compared ignoring case, punctuation and spacing; links ignore
+    the scheme, 'www.', fragment, tracking parameters and a trailing slash.
+    Anything else is a cluster of its own.
+    """
+    content = None
+    if submission.submission_type == 'text' and submission.text_content:
+        content = ' '.join(re.findall(r'\w+', submission.text_content.lower()))
+    elif submission.submission_type == 'link' and submission.source_url:
+        parts = urlsplit(submission.source_url.strip())
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parts.query)
+            if not TRACKING_PARAMS.match(key.lower())
+        ))
+        host = parts.netloc.lower().removeprefix('www.')
+        content = f"{host}{parts.path.rstrip('/')}?{query}"
+    
+    if not content:
+        return str(submission.id)
+    return hashlib.sha256(f'{submission.submission_type}:{content}'.encode('utf-8')).hexdigest()
+
+
+def _duplicate_counts(content_hashes):
+    """Get {content_hash: number of submissions} in one grouped query."""
+    return dict(
+        Submission.objects.filter(content_hash__in=set(filter(None, content_hashes)))
+        .values('content_hash')
+        .annotate(count=Count('id'))
+        .values_list('content_hash', 'count')
+    )
+
+
+def _score(submission, duplicate_counts):
+    """Get (base priority, label) for a submission."""
+    result = getattr(submission, 'verification_result', None)
+    score = result.misinformation_score if result is not None else None
+    # Other submissions with the same content
+    duplicates = max(duplicate_counts.get(submission.content_hash, 1) - 1, 0)
+
+    base = compute_base_priority(score, duplicates)
+    return base, priority_label(base)
+
+
+def enqueue(submission, reason):
+    """
+    Add a submission to the queue (re-opening a completed item) and
+    score it. Returns the queue item.
+    """
+    base, label = _score(submission, _duplicate_counts([submission.content_hash]))
+    item, created = ModerationQueue.objects.get_or_create(
+        submission=submission,
+        defaults={'reason': reason, 'priority': label}
+    )
+
+    if not created and item.is_completed:
+        item.reason = reason
+        item.is_completed = False
+        item.completed_at = None
+        item.assigned_to = None
+        item.claimed_at = None
+        item.lease_expires_at = None
+
+    item.priority = label
+    item.priority_score = compute_priority_score(base, item.created_at)
+    item.cluster_key = compute_cluster_key(submission)
+    item.save()
+    return item
+
+
+def rescore_open_items(batch_size=500):
+    """Recompute priorities of open items, as scores and duplicates change. Returns the count."""
+    items = ModerationQueue.objects.filter(is_completed=False).select_related(
+        'submission', 'submission__verification_result'
+    ).order_by('id')
+
+    count = 0
+    batch = []
+    for item in items.iterator(chunk_size=batch_size):
+        batch.append(item)
+        if len(batch) == batch_size:
+            count += _rescore(batch)
+            batch = []
+    if batch:
+        count += _rescore(batch)
+    return count
+
+
+def _rescore(items):
+    duplicate_counts = _duplicate_counts(item.submission.content_hash for item in items)
+    for item in items:
+        base, item.priority = _score(item.submission, duplicate_counts)
+        item.priority_score = compute_priority_score(base, item.created_at)
+        item.cluster_key = compute_cluster_key(item.submission)
+    ModerationQueue.objects.bulk_update(items, ['priority', 'priority_score', 'cluster_key'])
+    return len(items)
+
+
+def available_filter(now):
+    """Q for items nobody holds: unassigned, or with an expired lease."""
+    return Q(is_completed=False) & (Q(assigned_to__isnull=True) | Q(lease_expires_at__lt=now))
+
+
+def _open_members():
+    """Open items in the same cluster as the outer item."""
+    return ModerationQueue.objects.filter(cluster_key=OuterRef('cluster_key'), is_completed=False).order_by()
+
+
+def with_cluster_size(queryset):
+    """Annotate items with cluster_size, the number of open items in their cluster."""
+    sizes = _open_members().values('cluster_key').annotate(count=Count('id')).values('count')
+    return queryset.annotate(cluster_size=Coalesce(Subquery(sizes), 1))
+
+
+def cluster_heads(queryset):
+    """
+    Limit queryset to the highest-priority open item of each cluster,
+    annotated with cluster_size. These stand in for their clusters.
+    """
+    head = _open_members().order_by('-priority_score', 'created_at').values('id')[:1]
+    return with_cluster_size(
+        queryset.annotate(cluster_head=Subquery(head)).filter(
+            Q(cluster_key__isnull=True) | Q(id=F('cluster_head'))
+        )
+    )
+
+
+def claim_next(moderator, count):
+    """
+    Lease the next count available clusters to moderator, highest priority
+    first. Returns the claimed cluster heads; the rest of each cluster is
+    leased along with its head.
+
+    On PostgreSQL candidates are locked with FOR UPDATE SKIP LOCKED, so
+    concurrent claims skip each other's rows instead of waiting. Elsewhere
+    each candidate is taken with a conditional UPDATE that fails if
+    another moderator got there first.
+    """
+    now = timezone.now()
+    lease = {
+        'assigned_to': moderator,
+        'claimed_at': now,
+        'lease_expires_at': now + timedelta(seconds=settings.MODERATION_LEASE_SECONDS),
+    }
+    available = ModerationQueue.objects.filter(available_filter(now))
+    heads = cluster_heads(available).order_by('-priority_score', 'created_at')
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                heads.select_for_update(skip_locked=True, of=('self',)).values_list('id', flat=True)[:count]
+            )
+            ModerationQueue.objects.filter(id__in=ids).update(**lease)
+        else:
+            ids = []
+            candidates = heads.values('id', 'assigned_to_id', 'lease_expires_at')[:count * 2]
+            for candidate in candidates:
+                claimed = ModerationQueue.objects.filter(
+                    id=candidate['id'],
+                    assigned_to_id=candidate['assigned_to_id'],
+                    lease_expires_at=candidate['lease_expires_at'],
+                    is_completed=False
+                ).update(**lease)
+                if claimed:
+                    ids.append(candidate['id'])
+                    if len(ids) == count:
+                        break
+        
+        cluster_keys = ModerationQueue.objects.filter(id__in=ids, cluster_key__isnull=False).values('cluster_key')
+        members = available.filter(cluster_key__in=cluster_keys)
+        if connection.features.has_select_for_update_skip_locked:
+            members = ModerationQueue.objects.filter(
+                id__in=list(members.select_for_update(skip_locked=True).values_list('id', flat=True))
+            )
+        members.update(**lease)
+
+    return list(
+        with_cluster_size(ModerationQueue.objects.filter(id__in=ids)).select_related(
+            'submission', 'submission__user', 'assigned_to'
+        ).order_by('-priority_score', 'created_at')
+    )
+
+
+def claim(item_id, moderator):
+    """Lease one specific item to moderator. Returns False if someone else holds it."""
+    now = timezone.now()
+    return bool(
+        ModerationQueue.objects.filter(
+            Q(id=item_id) & (available_filter(now) | Q(assigned_to=moderator, is_completed=False))
+        ).update(
+            assigned_to=moderator,
+            claimed_at=now,
+            lease_expires_at=now + timedelta(seconds=settings.MODERATION_LEASE_SECONDS)
+        )
+    )
+
+
+def release(item_id, moderator):
+    """Give up moderator's lease on an item. Returns False if they did not hold it."""
+    return bool(
+        ModerationQueue.objects.filter(id=item_id, assigned_to=moderator, is_completed=False).update(
+            assigned_to=None,
+            claimed_at=None,
+            lease_expires_at=None
+        )
+    )
+
+
+def holds_lease(item, moderator, now=None):
+    """Check whether moderator may work on item (their lease, or nobody's)."""
+    now = now or timezone.now()
+    if item.assigned_to_id is None or item.assigned_to_id == moderator.pk:
+        return True
+    return item.lease_expires_at is not None and item.lease_expires_at < now
+
+
+def decision_changes(action_taken, moderator, notes, now):
+    """Get the submission field changes for a moderation decision."""
+    if action_taken == 'approve':
+        return {
+            'status': 'completed',
+            'verified_by': moderator,
+            'verification_notes': notes,
+            'verified_at': now,
+        }
+    if action_taken == 'reject':
+        return {'status': 'rejected', 'verified_by': moderator, 'verification_notes': notes}
+    if action_taken == 'flag':
+        return {'is_flagged': True, 'flag_reason': notes}
+    raise ValueError(f"Unknown moderation decision: {action_taken!r}")
+
+
+def complete(item, moderator, action_taken, notes='', whole_cluster=True):
+    """
+    Apply a moderation decision to item and, by default, every open item
+    in its cluster, including copies leased to other moderators. Uses
+    set-based updates in one transaction and publishes the new status to
+    the submissions' event streams. Returns the decided submission ids.
+    Raises ValueError, before changing anything, if action_taken is not
+    one of DECISIONS.
+    """
+    now = timezone.now()
+    changes = decision_changes(action_taken, moderator, notes, now)
+    items = ModerationQueue.objects.filter(is_completed=False)
+    if whole_cluster and item.cluster_key:
+        items = items.filter(cluster_key=item.cluster_key)
+    else:
+        items = items.filter(id=item.id)
+
+    with transaction.atomic():
+        submission_ids = list(items.select_for_update().values_list('submission_id', flat=True))
+        if changes:
+            track_update(Submission.objects.filter(id__in=submission_ids), **changes)
+        ModerationQueue.objects.filter(submission_id__in=submission_ids, is_completed=False).update(
+            assigned_to=moderator,
+            lease_expires_at=None,
+            is_completed=True,
+            completed_at=now
+        )
+
+    invalidate_submissions(*submission_ids)
+    if 'status' in changes:
+        # Open event streams close on the decision, as they do on analysis
+        transaction.on_commit(lambda: publish_status_change(submission_ids, changes['status']))
+    return submission_ids
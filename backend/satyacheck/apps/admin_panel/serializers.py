@@ -4,6 +4,7 @@ Serializers for admin panel.
 
 from rest_framework import serializers
 from .models import AdminReport, ModerationQueue, UserBan
+from .queue import current_priority
 from satyacheck.apps.users.serializers import UserSerializer
 from satyacheck.apps.submissions.serializers import SubmissionListSerializer
 
@@ -30,15 +31,30 @@ class ModerationQueueSerializer(serializers.ModelSerializer):
     
     submission_details = SubmissionListSerializer(source='submission', read_only=True)
     assigned_to_user = UserSerializer(source='assigned_to', read_only=True)
+    current_priority = serializers.SerializerMethodField()
+    cluster_size = serializers.SerializerMethodField()
     
     class Meta:
         model = ModerationQueue
         fields = [
-            'id', 'submission', 'submission_details', 'priority', 'reason',
-            'assigned_to', 'assigned_to_user', 'is_completed', 'completed_at',
+            'id', 'submission', 'submission_details', 'priority', 'priority_score',
+            'current_priority', 'reason', 'cluster_key', 'cluster_size',
+            'assigned_to', 'assigned_to_user',
+            'claimed_at', 'lease_expires_at', 'is_completed', 'completed_at',
             'created_at'
         ]
-        read_only_fields = ['id', 'created_at', 'completed_at']
+        read_only_fields = [
+            'id', 'priority', 'priority_score', 'cluster_key', 'assigned_to', 'claimed_at',
+            'lease_expires_at', 'created_at', 'completed_at'
+        ]
+    
+    def get_current_priority(self, obj):
+        """Get priority including the age the item has accumulated."""
+        return current_priority(obj)
+    
+    def get_cluster_size(self, obj):
+        """Get the number of open items in the cluster, where annotated."""
+        return getattr(obj, 'cluster_size', None)
 
 
 class UserBanSerializer(serializers.ModelSerializer):
@@ -0,0 +1,22 @@
+"""
+Admin panel model signals.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .bans import ban_set
+from .models import UserBan
+
+
+@receiver(post_save, sender=UserBan)
+def add_to_ban_set(sender, instance, **kwargs):
+    """Publish a ban, or its new unban date, to the active ban set once committed."""
+    transaction.on_commit(lambda: ban_set.add(instance))
+
+
+@receiver(post_delete, sender=UserBan)
+def remove_from_ban_set(sender, instance, **kwargs):
+    """Lift a deleted ban from the active ban set once committed."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: ban_set.remove(user_id))
@@ -0,0 +1,33 @@
+"""
+Celery tasks for admin panel.
+"""
+
+from celery import shared_task
+import logging
+
+from .bans import ban_set
+from .queue import rescore_open_items
+
+logger = logging.getLogger('satyacheck')
+
+
+@shared_task
+def rescore_moderation_queue():
+    """
+    Refresh queue priorities as analysis results and duplicates arrive.
+    Scheduled by CELERY_BEAT_SCHEDULE.
+    """
+    count = rescore_open_items()
+    logger.info(f"Moderation queue rescored ({count} items)")
+    return {'success': True, 'rescored': count}
+
+
+@shared_task
+def rebuild_ban_set():
+    """
+    Rebuild the active ban set from the database, restoring any update
+    that did not reach Redis. Scheduled by CELERY_BEAT_SCHEDULE.
+    """
+    bans = ban_set.rebuild()
+    logger.info(f"Ban set rebuilt ({len(bans)} active bans)")
+    return {'success': True, 'active': len(bans)}
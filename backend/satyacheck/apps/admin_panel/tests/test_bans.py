@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from satyacheck.apps.admin_panel.bans import BAN_SET_KEY, ban_set
+from satyacheck.apps.admin_panel.models import UserBan
+from satyacheck.apps.admin_panel.tasks import rebuild_ban_set
+from satyacheck.services.redis_client import get_redis
+
+pytestmark = pytest.mark.django_db
+
+
+def ban(user, **kwargs):
+    return UserBan.objects.create(user=user, reason='spam', description='', **kwargs)
+
+
+def test_saved_ban_reaches_the_set(user, django_capture_on_commit_callbacks):
+    assert not ban_set.is_banned(user.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ban(user, is_permanent=True)
+
+    assert get_redis().zscore(BAN_SET_KEY, str(user.pk)) == float('inf')
+    assert ban_set.is_banned(user.pk)
+
+
+def test_changed_unban_date_reaches_the_set(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        user_ban = ban(user, is_permanent=True)
+    assert ban_set.is_banned(user.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_ban.is_permanent = False
+        user_ban.unban_date = timezone.now() - timedelta(minutes=1)
+        user_ban.save()
+
+    assert not ban_set.is_banned(user.pk)
+
+
+def test_deleted_ban_leaves_the_set(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        user_ban = ban(user, is_permanent=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_ban.delete()
+
+    assert get_redis().zscore(BAN_SET_KEY, str(user.pk)) is None
+    assert not ban_set.is_banned(user.pk)
+
+
+def test_evicted_set_is_rebuilt(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        ban(user, is_permanent=True)
+    get_redis().delete(BAN_SET_KEY)
+    ban_set.refresh()
+
+    assert ban_set.is_banned(user.pk)
+
+
+def test_set_without_sentinel_is_rebuilt(user, admin_user, django_capture_on_commit_callbacks):
+    ban(user, is_permanent=True)
+    # A stray write after eviction recreates the key without the rest of the bans
+    with django_capture_on_commit_callbacks(execute=True):
+        ban(admin_user, is_permanent=True)
+    get_redis().delete(BAN_SET_KEY)
+    get_redis().zadd(BAN_SET_KEY, {str(admin_user.pk): float('inf')})
+    ban_set.refresh()
+
+    assert ban_set.is_banned(user.pk)
+
+
+def test_periodic_rebuild_restores_lost_updates(user):
+    assert not ban_set.is_banned(user.pk)
+    # Saved but never published, as if Redis was down at commit
+    ban(user, is_permanent=True)
+
+    assert rebuild_ban_set()['active'] == 1
+    ban_set.refresh()
+    assert ban_set.is_banned(user.pk)
+
+
+def test_expired_bans_are_not_loaded(user):
+    ban(user, unban_date=timezone.now() - timedelta(days=1))
+
+    assert not ban_set.is_banned(user.pk)
@@ -0,0 +1,127 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection, transaction
+from django.utils import timezone
+
+from satyacheck.apps.admin_panel import queue
+from satyacheck.apps.admin_panel.models import ModerationQueue
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory, VerificationResultFactory
+from satyacheck.apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def flagged(score=None, text=None):
+    submission = SubmissionFactory(**({'text_content': text} if text else {}))
+    if score is not None:
+        VerificationResultFactory(submission=submission, misinformation_score=score)
+    return queue.enqueue(submission, 'Flagged by user')
+
+
+def test_base_priority_weighs_score_and_virality(settings):
+    settings.MODERATION_VIRALITY_SATURATION = 50
+
+    assert queue.compute_base_priority(None, 0) == 30
+    assert queue.compute_base_priority(100, 0) == 60
+    assert queue.compute_base_priority(100, 50) == 100
+    assert queue.compute_base_priority(100, 500) == 100
+
+
+def test_older_items_gain_priority():
+    now = timezone.now()
+
+    older = queue.compute_priority_score(50, now - timedelta(hours=10))
+    newer = queue.compute_priority_score(55, now)
+
+    assert older > newer
+
+
+def test_enqueue_labels_priority():
+    assert flagged(score=95).priority == 'medium'
+    assert flagged(score=10).priority == 'low'
+
+
+def test_duplicates_raise_priority():
+    single = flagged(score=50, text='A claim shared once')
+    for _ in range(5):
+        SubmissionFactory(text_content='A claim shared widely')
+    viral = flagged(score=50, text='A claim shared widely')
+
+    assert viral.priority_score > single.priority_score
+
+
+def test_claims_highest_priority_first(moderator):
+    low = flagged(score=10)
+    high = flagged(score=90)
+
+    [claimed] = queue.claim_next(moderator, 1)
+
+    assert claimed.id == high.id
+    low.refresh_from_db()
+    assert low.assigned_to is None
+
+
+def test_moderators_do_not_share_leases(moderator):
+    first = flagged(score=90)
+    second = flagged(score=50)
+    other = UserFactory(role='journalist')
+
+    assert [item.id for item in queue.claim_next(moderator, 1)] == [first.id]
+    assert [item.id for item in queue.claim_next(other, 5)] == [second.id]
+    assert queue.claim_next(UserFactory(role='journalist'), 5) == []
+
+
+def test_expired_lease_is_claimable_again(moderator):
+    item = flagged(score=90)
+    queue.claim_next(moderator, 1)
+    ModerationQueue.objects.filter(id=item.id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+    other = UserFactory(role='journalist')
+
+    assert queue.holds_lease(ModerationQueue.objects.get(id=item.id), other)
+    assert [claimed.id for claimed in queue.claim_next(other, 1)] == [item.id]
+
+
+def test_claim_and_release_specific_item(moderator):
+    item = flagged(score=90)
+    other = UserFactory(role='journalist')
+
+    assert queue.claim(item.id, moderator)
+    assert not queue.claim(item.id, other)
+    assert not queue.release(item.id, other)
+    assert queue.release(item.id, moderator)
+    assert queue.claim(item.id, other)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(not connection.features.has_select_for_update_skip_locked, reason='needs SKIP LOCKED')
+def test_concurrent_claims_skip_locked_rows():
+    first = flagged(score=90)
+    second = flagged(score=50)
+    moderator, other = UserFactory(role='journalist'), UserFactory(role='journalist')
+    locked = threading.Event()
+    done = threading.Event()
+    claimed = []
+
+    def claim_in_other_transaction():
+        try:
+            with transaction.atomic():
+                list(ModerationQueue.objects.select_for_update().filter(id=first.id))
+                locked.set()
+                done.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=claim_in_other_transaction)
+    thread.start()
+    try:
+        assert locked.wait(5)
+        # Does not wait for the locked row, and does not take it
+        claimed = queue.claim_next(moderator, 2)
+    finally:
+        done.set()
+        thread.join()
+
+    assert [item.id for item in claimed] == [second.id]
+    assert [item.id for item in queue.claim_next(other, 2)] == [first.id]
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from satyacheck.apps.admin_panel import queue
+from satyacheck.apps.admin_panel.models import AdminReport, ModerationQueue
+from satyacheck.apps.admin_panel.views import compute_dashboard
+from satyacheck.apps.users.models import User
+from satyacheck.apps.users.tests.factories import UserFactory
+from .test_queue import flagged
+
+pytestmark = pytest.mark.django_db
+
+
+def complete_url(item):
+    return f'/api/v1/admin/moderation/{item.id}/complete/'
+
+
+def report(status):
+    return AdminReport.objects.create(title='Report', description='', report_type='user_report', status=status)
+
+
+def cluster(size, text='The same forwarded claim'):
+    return [flagged(score=50, text=text) for _ in range(size)]
+
+
+@pytest.mark.parametrize('data', [{}, {'action_taken': 'delete'}, {'action_taken': ''}])
+def test_unknown_action_is_rejected(admin_client, admin_user, data):
+    first, second = cluster(2)
+    queue.claim(first.id, admin_user)
+    status = first.submission.status
+
+    response = admin_client.post(complete_url(first), data, format='json')
+
+    assert response.status_code == 400
+    assert not ModerationQueue.objects.filter(is_completed=True).exists()
+    first.submission.refresh_from_db()
+    assert first.submission.status == status
+
+
+def test_unknown_action_raises_before_any_change(admin_user):
+    item = flagged(score=50)
+
+    with pytest.raises(ValueError):
+        queue.complete(item, admin_user, 'delete')
+
+    item.refresh_from_db()
+    assert not item.is_completed
+
+
+def test_decision_applies_to_whole_cluster(admin_client, admin_user):
+    items = cluster(3)
+    queue.claim(items[0].id, admin_user)
+
+    response = admin_client.post(complete_url(items[0]), {'action_taken': 'reject'}, format='json')
+
+    assert response.status_code == 200
+    assert response.data['completed'] == 3
+    assert ModerationQueue.objects.filter(is_completed=True).count() == 3
+
+
+def test_decision_can_be_limited_to_one_item(admin_client, admin_user):
+    items = cluster(3)
+    queue.claim(items[0].id, admin_user)
+
+    response = admin_client.post(
+        complete_url(items[0]), {'action_taken': 'approve', 'apply_to_cluster': False}, format='json'
+    )
+
+    assert response.data['completed'] == 1
+    assert list(ModerationQueue.objects.filter(is_completed=True).values_list('id', flat=True)) == [items[0].id]
+
+
+def test_cannot_complete_another_moderators_task(admin_client):
+    item = flagged(score=50)
+    queue.claim(item.id, UserFactory(role='journalist'))
+
+    response = admin_client.post(complete_url(item), {'action_taken': 'approve'}, format='json')
+
+    assert response.status_code == 409
+    item.refresh_from_db()
+    assert not item.is_completed
+
+
+def test_dashboard_counts_with_one_query_per_table(admin_user, django_assert_num_queries):
+    UserFactory()
+    User.objects.filter(id=UserFactory().id).update(created_at=timezone.now() - timedelta(days=30))
+    for status in ('open', 'open', 'in_progress', 'resolved'):
+        report(status)
+    claimed = flagged(score=90)
+    flagged(score=10)
+    queue.claim(claimed.id, admin_user)
+    ModerationQueue.objects.filter(id=claimed.id).update(priority='high')
+
+    with django_assert_num_queries(5):
+        dashboard = compute_dashboard()
+
+    assert dashboard['total_users'] == User.objects.count()
+    assert dashboard['new_users_7_days'] == User.objects.count() - 1
+    assert dashboard['open_reports'] == 2
+    assert dashboard['in_progress_reports'] == 1
+    assert dashboard['moderation_queue'] == 2
+    assert dashboard['moderation_queue_unclaimed'] == 1
+    assert dashboard['moderation_queue_high_priority'] == 1
+    assert dashboard['total_submissions'] == 2
+    assert dashboard['recent_submissions_7_days'] == 2
+    assert dashboard['average_misinformation_score'] == 50
+
+
+def test_dashboard_is_cached(admin_client):
+    url = '/api/v1/admin/dashboard/dashboard/'
+    report('open')
+
+    assert admin_client.get(url).data['open_reports'] == 1
+    report('open')
+
+    assert admin_client.get(url).data['open_reports'] == 1
+
+
+def test_dashboard_is_admin_only(moderator_client):
+    assert moderator_client.get('/api/v1/admin/dashboard/dashboard/').status_code == 403
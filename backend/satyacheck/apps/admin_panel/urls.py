@@ -6,7 +6,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     AdminReportViewSet, ModerationQueueViewSet,
-    UserBanViewSet, AdminDashboardViewSet
+    UserBanViewSet, AdminDashboardViewSet, ProfileViewSet
 )
 
 router = DefaultRouter()
@@ -14,6 +14,7 @@ router.register(r'reports', AdminReportViewSet, basename='admin-report')
 router.register(r'moderation', ModerationQueueViewSet, basename='moderation-queue')
 router.register(r'bans', UserBanViewSet, basename='user-ban')
 router.register(r'dashboard', AdminDashboardViewSet, basename='admin-dashboard')
+router.register(r'profiles', ProfileViewSet, basename='request-profile')
 
 urlpatterns = [
     path('', include(router.urls)),
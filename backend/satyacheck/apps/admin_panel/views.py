@@ -2,19 +2,33 @@
 Views for admin panel.
 """
 
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Avg, Count, Q
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from . import queue
 from .models import AdminReport, ModerationQueue, UserBan
 from .serializers import AdminReportSerializer, ModerationQueueSerializer, UserBanSerializer
 from satyacheck.apps.users.models import User, UserActivity
 from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.statistics import get_statistics
+from satyacheck.core import profiling
+from satyacheck.core.authentication import bump_auth_version
+from satyacheck.services import cache_service
 import logging
+import redis
 
 logger = logging.getLogger('satyacheck')
 audit_logger = logging.getLogger('satyacheck.audit')
 
+dashboard_cache = cache_service.get_namespace('admin_dashboard', timeout=settings.ADMIN_DASHBOARD_CACHE_TIMEOUT)
+
 
 class AdminReportViewSet(viewsets.ModelViewSet):
     """
@@ -86,66 +100,118 @@ class ModerationQueueViewSet(viewsets.ModelViewSet):
     serializer_class = ModerationQueueSerializer
     permission_classes = [IsAdminUser]
     
+    def perform_create(self, serializer):
+        """Score new items; priority is computed, not supplied."""
+        item = serializer.save()
+        serializer.instance = queue.enqueue(item.submission, item.reason)
+    
     @action(detail=False, methods=['get'])
     def my_queue(self, request):
         """Get current moderator's queue."""
-        queue = ModerationQueue.objects.filter(
-            assigned_to=request.user,
-            is_completed=False
-        ).order_by('-priority', 'created_at')
+        items = queue.with_cluster_size(
+            ModerationQueue.objects.filter(assigned_to=request.user, is_completed=False)
+        ).order_by('-priority_score', 'created_at')
         
-        serializer = self.get_serializer(queue, many=True)
+        serializer = self.get_serializer(items, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """Get the open queue with each cluster of near-identical items shown once."""
+        heads = queue.cluster_heads(self.get_queryset()).select_related(
+            'submission', 'submission__user', 'assigned_to'
+        ).order_by('-priority_score', 'created_at')
+        
+        page = self.paginate_queryset(heads)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer(heads, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'])
+    def claim(self, request):
+        """Claim the next highest-priority clusters."""
+        try:
+            count = int(request.data.get('count', 1))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'count must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        count = max(1, min(count, settings.MODERATION_MAX_CLAIM))
+        
+        items = queue.claim_next(request.user, count)
+        
+        serializer = self.get_serializer(items, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def assign_to_me(self, request, pk=None):
         """Assign moderation task to self."""
         task = self.get_object()
-        task.assigned_to = request.user
-        task.save()
+        if not queue.claim(task.id, request.user):
+            return Response(
+                {'error': 'Task is assigned to another moderator.'},
+                status=status.HTTP_409_CONFLICT
+            )
         
         return Response({
             'success': True,
             'message': 'Task assigned to you.'
         })
     
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None):
+        """Return a claimed task to the queue."""
+        task = self.get_object()
+        if not queue.release(task.id, request.user):
+            return Response(
+                {'error': 'Task is not assigned to you.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        return Response({
+            'success': True,
+            'message': 'Task returned to the queue.'
+        })
+    
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
-        """Mark moderation task as complete."""
+        """
+        Mark moderation task as complete.
+        The decision applies to the task's whole cluster unless apply_to_cluster is false.
+        """
+        action_taken = request.data.get('action_taken')
+        if action_taken not in queue.DECISIONS:
+            return Response(
+                {'error': f"action_taken must be one of: {', '.join(queue.DECISIONS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         task = self.get_object()
-        action_taken = request.data.get('action_taken')  # 'approve', 'reject', 'flag'
-        notes = request.data.get('notes', '')
+        if not queue.holds_lease(task, request.user):
+            return Response(
+                {'error': 'Task is assigned to another moderator.'},
+                status=status.HTTP_409_CONFLICT
+            )
         
-        submission = task.submission
+        notes = request.data.get('notes', '')
         
-        from django.utils import timezone
+        whole_cluster = request.data.get('apply_to_cluster', True) not in (False, 'false', '0', 0)
         
-        if action_taken == 'approve':
-            submission.status = 'completed'
-            submission.verified_by = request.user
-            submission.verification_notes = notes
-            submission.verified_at = timezone.now()
-        elif action_taken == 'reject':
-            submission.status = 'rejected'
-            submission.verified_by = request.user
-            submission.verification_notes = notes
-        elif action_taken == 'flag':
-            submission.is_flagged = True
-            submission.flag_reason = notes
-        
-        submission.save()
-        
-        task.is_completed = True
-        task.completed_at = timezone.now()
-        task.save()
+        submission_ids = queue.complete(task, request.user, action_taken, notes, whole_cluster=whole_cluster)
         
         audit_logger.info(
-            f"Moderation task {task.id} completed - Action: {action_taken} - By: {request.user.username}"
+            f"Moderation task {task.id} completed - Action: {action_taken} - "
+            f"Submissions: {len(submission_ids)} - By: {request.user.username}"
         )
         
         return Response({
             'success': True,
-            'message': 'Moderation task completed.'
+            'message': 'Moderation task completed.',
+            'completed': len(submission_ids)
         })
 
 
@@ -167,6 +233,16 @@ class UserBanViewSet(viewsets.ModelViewSet):
         is_permanent = request.data.get('is_permanent', False)
         unban_date = request.data.get('unban_date')
         
+        if unban_date:
+            unban_date = parse_datetime(str(unban_date))
+            if unban_date is None:
+                return Response(
+                    {'error': 'Invalid unban_date.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(unban_date):
+                unban_date = timezone.make_aware(unban_date)
+        
         try:
             user = User.objects.get(id=user_id)
         except User.DoesNotExist:
@@ -176,11 +252,14 @@ class UserBanViewSet(viewsets.ModelViewSet):
             )
         
         # Check if user is already banned
-        if hasattr(user, 'ban') and user.ban.is_active():
-            return Response(
-                {'error': 'User is already banned.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        if hasattr(user, 'ban'):
+            if user.ban.is_active():
+                return Response(
+                    {'error': 'User is already banned.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # An expired ban is replaced
+            user.ban.delete()
         
         # Create ban
         ban = UserBan.objects.create(
@@ -192,9 +271,9 @@ class UserBanViewSet(viewsets.ModelViewSet):
             banned_by=request.user
         )
         
-        # Disable user account
-        user.is_active = False
-        user.save()
+        # Enforced at authentication from the ban set (updated by the UserBan
+        # signals), which also lifts the ban on its unban date
+        bump_auth_version(user.pk)
         
         audit_logger.info(
             f"User {user.username} banned - Reason: {reason} - By: {request.user.username}"
@@ -209,8 +288,10 @@ class UserBanViewSet(viewsets.ModelViewSet):
         ban = self.get_object()
         user = ban.user
         
-        user.is_active = True
-        user.save()
+        # Bans used to deactivate the account
+        if not user.is_active:
+            user.is_active = True
+            user.save(update_fields=['is_active'])
         
         ban.delete()
         
@@ -231,51 +312,120 @@ class AdminDashboardViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
-        """Get admin dashboard statistics."""
-        from django.db.models import Count, Avg
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Calculate statistics
-        total_submissions = Submission.objects.count()
-        total_users = User.objects.count()
-        open_reports = AdminReport.objects.filter(status='open').count()
-        moderation_queue_count = ModerationQueue.objects.filter(is_completed=False).count()
-        
-        # Last 7 days submissions
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        recent_submissions = Submission.objects.filter(
-            created_at__gte=seven_days_ago
-        ).count()
-        
-        # Average misinformation score
-        avg_score = Submission.objects.filter(
-            verification_result__isnull=False
-        ).aggregate(
-            Avg('verification_result__misinformation_score')
-        )['verification_result__misinformation_score__avg']
-        
-        # Submissions by type
-        submissions_by_type = dict(
-            Submission.objects.values('submission_type').annotate(
-                count=Count('id')
-            ).values_list('submission_type', 'count')
-        )
+        """
+        Get admin dashboard statistics.
+        One conditional aggregate per table, cached for ADMIN_DASHBOARD_CACHE_TIMEOUT
+        so concurrent refreshes share a single computation.
+        """
+        return Response(dashboard_cache.get_or_set('dashboard', compute_dashboard))
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """
+    ViewSet for request profiles (see satyacheck.core.profiling).
+    Admin only.
+    """
+    
+    permission_classes = [IsAdminUser]
+    
+    def list(self, request):
+        """List stored profiles, newest first."""
+        try:
+            return Response(profiling.list_profiles())
+        except redis.RedisError as e:
+            return self._unavailable(e)
+    
+    def retrieve(self, request, pk=None):
+        """Get a profile's report: timings, SQL statements, duplicate queries and top functions."""
+        try:
+            report = profiling.get_report(pk)
+        except redis.RedisError as e:
+            return self._unavailable(e)
         
-        # Submissions by status
-        submissions_by_status = dict(
-            Submission.objects.values('status').annotate(
-                count=Count('id')
-            ).values_list('status', 'count')
-        )
+        if report is None:
+            return Response({'error': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(report)
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        Download a profile in the pstats format.
+        GET: /api/v1/admin/profiles/{id}/download/
+        """
+        try:
+            data = profiling.get_pstats(pk)
+        except redis.RedisError as e:
+            return self._unavailable(e)
+        
+        if data is None:
+            return Response({'error': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+        
+        response = HttpResponse(data, content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="profile-{pk}.prof"'
+        return response
+    
+    @action(detail=False, methods=['post'])
+    def token(self, request):
+        """
+        Get a token that profiles the requests carrying it.
+        POST: /api/v1/admin/profiles/token/
+        Send it as the X-Profile header or the ?profile= query parameter.
+        """
+        audit_logger.info(f"Profiling token issued to {request.user.username}")
         
         return Response({
-            'total_submissions': total_submissions,
-            'total_users': total_users,
-            'open_reports': open_reports,
-            'moderation_queue': moderation_queue_count,
-            'recent_submissions_7_days': recent_submissions,
-            'average_misinformation_score': round(avg_score or 0, 2),
-            'submissions_by_type': submissions_by_type,
-            'submissions_by_status': submissions_by_status,
+            'token': profiling.issue_token(request.user),
+            'expires_in': settings.PROFILING_TOKEN_MAX_AGE,
         })
+    
+    @staticmethod
+    def _unavailable(error):
+        logger.error(f"Profile store unavailable: {str(error)}")
+        return Response(
+            {'error': 'Profiles are temporarily unavailable.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+def compute_dashboard():
+    """Compute the admin dashboard statistics."""
+    now = timezone.now()
+    seven_days_ago = now - timedelta(days=7)
+    
+    # Submission totals come from the counters table
+    statistics = get_statistics()
+    
+    submissions = Submission.objects.aggregate(
+        recent=Count('id', filter=Q(created_at__gte=seven_days_ago)),
+        average_score=Avg('verification_result__misinformation_score')
+    )
+    users = User.objects.aggregate(
+        total=Count('id'),
+        new=Count('id', filter=Q(created_at__gte=seven_days_ago))
+    )
+    reports = AdminReport.objects.aggregate(
+        open=Count('id', filter=Q(status='open')),
+        in_progress=Count('id', filter=Q(status='in_progress'))
+    )
+    moderation = ModerationQueue.objects.filter(is_completed=False).aggregate(
+        open=Count('id'),
+        unclaimed=Count('id', filter=queue.available_filter(now)),
+        high_priority=Count('id', filter=Q(priority='high'))
+    )
+    
+    return {
+        'total_submissions': statistics['total'],
+        'total_users': users['total'],
+        'new_users_7_days': users['new'],
+        'open_reports': reports['open'],
+        'in_progress_reports': reports['in_progress'],
+        'moderation_queue': moderation['open'],
+        'moderation_queue_unclaimed': moderation['unclaimed'],
+        'moderation_queue_high_priority': moderation['high_priority'],
+        'recent_submissions_7_days': submissions['recent'],
+        'average_misinformation_score': round(submissions['average_score'] or 0, 2),
+        'submissions_by_type': statistics['by_type'],
+        'submissions_by_status': statistics['by_status'],
+        'statistics_updated_at': statistics['updated_at'],
+        'generated_at': now,
+    }
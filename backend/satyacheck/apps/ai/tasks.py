@@ -2,76 +2,133 @@
 Celery tasks for background processing.
 """
 
-from celery import shared_task
-from django.core.cache import cache
+from celery import shared_task, group
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
 from django.utils import timezone
 import logging
 
 from satyacheck.apps.submissions.models import Submission, VerificationResult, ScrapedContent
+from satyacheck.apps.submissions.caching import invalidate_submissions
+from satyacheck.apps.submissions.events import publish_submission_event
+from satyacheck.apps.submissions.statistics import track_update
 from satyacheck.services.ai_service import get_model
+from satyacheck.services.single_flight import SingleFlight
+from satyacheck.services.stage_timing import StageTimer, record_timings, timed
 from satyacheck.services.web_scraper import WebScraper, find_similar_articles
 
 logger = logging.getLogger('satyacheck.ai')
 
+analysis_flight = SingleFlight(
+    'analysis',
+    lock_timeout=settings.CELERY_TASK_TIME_LIMIT,
+    waiter_timeout=settings.ANALYSIS_COALESCE_RETRY_DELAY * (settings.ANALYSIS_COALESCE_MAX_RETRIES + 1)
+)
+
+UNVERIFIABLE_LINK_RESULT = {
+    'score': 50,
+    'confidence': 'low',
+    'category': 'unverifiable',
+    'explanation': 'Unable to verify content from URL.'
+}
+
 
 @shared_task
-def analyze_submission(submission_id):
+def analyze_submission(submission_id, attempt=0):
     """
     Analyze a submission for misinformation.
     This task runs asynchronously in Celery.
+    
+    Submissions with identical content are coalesced: one worker runs the
+    analysis while the others register as waiters, receive a copy of the
+    result, and are re-queued to check in case the owner never finishes.
     """
     try:
-        submission = Submission.objects.get(id=submission_id)
+        submission = Submission.objects.select_related('verification_result').get(id=submission_id)
+        
+        if hasattr(submission, 'verification_result'):
+            # Already completed by a coalesced run
+            return {'success': True, 'submission_id': submission_id, 'coalesced': True}
         
         logger.info(f"Starting analysis for submission {submission_id}")
         
-        # Mark as analyzing
-        submission.status = 'analyzing'
-        submission.save(update_fields=['status'])
+        timer = StageTimer()
+        timer.add('queue_wait', (timezone.now() - submission.created_at).total_seconds())
         
-        # Get AI model
-        model = get_model()
+        # Mark as analyzing (submissions created through the API already are)
+        if submission.status != 'analyzing':
+            submission.mark_analyzing()
+            publish_submission_event(submission.id, 'analyzing')
         
-        # Perform analysis based on type
-        if submission.submission_type == 'text':
-            result = model.analyze_text(submission.text_content, submission.language)
-        elif submission.submission_type == 'image':
-            result = model.analyze_image(submission.file.path)
-        elif submission.submission_type == 'video':
-            result = model.analyze_video(submission.file.path)
-        elif submission.submission_type == 'audio':
-            result = model.analyze_audio(submission.file.path)
-        elif submission.submission_type == 'link':
-            # Scrape and analyze
-            result = analyze_link_submission.apply_async(args=[submission_id]).get()
-        else:
-            logger.error(f"Unknown submission type: {submission.submission_type}")
-            return
+        content_hash = submission.content_hash
+        owns_flight = False
         
-        # Create verification result
-        verification = VerificationResult.objects.create(
-            submission=submission,
-            misinformation_score=result['score'],
-            confidence_level=result['confidence'],
-            primary_category=result['category'],
-            explanation=result['explanation'],
-            explanation_nepali=result.get('explanation_nepali', ''),
-            explanation_hindi=result.get('explanation_hindi', ''),
-            model_used='distilbert-base-uncased',
-            model_version='1.0',
-            text_analysis_score=result.get('component_scores', {}).get('sentiment'),
-        )
+        if content_hash:
+            existing = _find_existing_result(submission)
+            if existing is not None:
+                verification = _copy_verification_result(existing, submission)
+                verification.save()
+                _complete_submission(submission, verification)
+                logger.info(f"Reused analysis of identical content for submission {submission_id}")
+                return {
+                    'success': True,
+                    'submission_id': submission_id,
+                    'score': verification.misinformation_score,
+                    'coalesced': True,
+                }
+            
+            owns_flight = analysis_flight.acquire(content_hash, submission_id)
+            if not owns_flight:
+                if attempt < settings.ANALYSIS_COALESCE_MAX_RETRIES:
+                    analysis_flight.add_waiter(content_hash, submission_id)
+                    analyze_submission.apply_async(
+                        args=[submission_id],
+                        kwargs={'attempt': attempt + 1},
+                        countdown=settings.ANALYSIS_COALESCE_RETRY_DELAY
+                    )
+                    logger.info(f"Submission {submission_id} is waiting on identical content in analysis")
+                    return {'success': True, 'submission_id': submission_id, 'coalesced': True}
+                
+                logger.warning(f"Gave up waiting on identical content for submission {submission_id}, analyzing it directly")
         
-        # Mark submission as completed
-        submission.status = 'completed'
-        submission.analyzed_at = timezone.now()
-        submission.save(update_fields=['status', 'analyzed_at'])
+        try:
+            with timer:
+                # Get AI model
+                model = get_model()
+                
+                # Perform analysis based on type
+                if submission.submission_type == 'text':
+                    result = model.analyze_text(submission.text_content, submission.language)
+                elif submission.submission_type in ('image', 'video', 'audio'):
+                    result = _analyze_media(model, submission)
+                elif submission.submission_type == 'link':
+                    # Scrape and analyze (timed by the subtask)
+                    result = analyze_link_submission.apply_async(args=[submission_id]).get()
+                    timer.merge(result.get('stage_timings', {}))
+                else:
+                    logger.error(f"Unknown submission type: {submission.submission_type}")
+                    return
+                
+                # Create verification result
+                verification = _build_verification_result(submission, result)
+                with timed('persist'):
+                    verification.save()
+                
+                # Mark submission as completed
+                _complete_submission(submission, verification)
+            
+            _save_timings([verification], [timer])
+            
+            if owns_flight:
+                _fan_out_result(verification, analysis_flight.drain_waiters(content_hash))
+        finally:
+            if owns_flight:
+                analysis_flight.release(content_hash, submission_id)
         
         logger.info(f"Analysis completed for submission {submission_id} - Score: {result['score']}")
         
-        # Send notification (if needed)
-        notify_user_analysis_complete.delay(submission_id)
-        
         return {
             'success': True,
             'submission_id': submission_id,
@@ -89,7 +146,9 @@ def analyze_submission(submission_id):
         try:
             submission = Submission.objects.get(id=submission_id)
             submission.status = 'completed'
-            submission.save(update_fields=['status'])
+            submission.save(update_fields=['status', 'updated_at'])
+            invalidate_submissions(submission.id)
+            publish_submission_event(submission.id, 'completed')
         except:
             pass
         
@@ -101,48 +160,28 @@ def analyze_link_submission(submission_id):
     """
     Analyze a link submission.
     Scrapes the URL and analyzes the content.
+    The result carries the stage timings under 'stage_timings'.
     """
     try:
         submission = Submission.objects.get(id=submission_id)
         
-        logger.info(f"Scraping link for submission {submission_id}: {submission.source_url}")
-        
-        # Scrape content
-        scraper = WebScraper()
-        scraped = scraper.scrape_url(submission.source_url)
-        
-        if not scraped['success']:
-            logger.error(f"Failed to scrape URL: {scraped.get('error')}")
-            result = {
-                'score': 50,
-                'confidence': 'low',
-                'category': 'unverifiable',
-                'explanation': 'Unable to verify content from URL.'
-            }
-        else:
-            # Save scraped content
-            ScrapedContent.objects.create(
-                submission=submission,
-                source_url=submission.source_url,
-                domain=scraped['domain'],
-                title=scraped['title'],
-                description=scraped['description'],
-                main_text=scraped['main_text'],
-                authors=scraped['authors'],
-                language=scraped['language'],
-                external_links=scraped.get('links', []),
-            )
-            
-            # Analyze text content
-            model = get_model()
-            result = model.analyze_text(scraped['main_text'], scraped['language'])
+        with StageTimer() as timer:
+            # Scrape content
+            scraped = _scrape_link(submission)
             
-            # Add source analysis
-            from satyacheck.services.web_scraper import NewsAggregator
-            if NewsAggregator.is_trusted_source(submission.source_url):
-                credibility = NewsAggregator.get_source_credibility(submission.source_url)
-                result['source_credibility_score'] = credibility
+            if scraped is None:
+                result = dict(UNVERIFIABLE_LINK_RESULT)
+            else:
+                # Analyze text content
+                model = get_model()
+                result = dict(model.analyze_text(scraped['main_text'], scraped['language']))
+                
+                # Add source analysis
+                credibility = _source_credibility(submission.source_url)
+                if credibility is not None:
+                    result['source_credibility_score'] = credibility
         
+        result['stage_timings'] = timer.as_dict()
         return result
     
     except Exception as e:
@@ -155,6 +194,391 @@ def analyze_link_submission(submission_id):
         }
 
 
+@shared_task
+def analyze_submission_batch(submission_ids):
+    """
+    Analyze a batch of submissions for misinformation.
+    Text content (including scraped link text) is classified in a single
+    batched model call; media submissions are analyzed one at a time.
+    Results, timings and status updates are written with one query each.
+    Time spent on the whole batch (text inference, writes, notification)
+    is shared equally among the submissions it was spent on.
+    
+    Identical content is coalesced as in analyze_submission: recent
+    results are reused, each content hash is analyzed once per batch, and
+    content another worker is analyzing is left to analyze_submission to
+    wait for.
+    """
+    submissions = list(
+        Submission.objects.filter(
+            id__in=submission_ids,
+            verification_result__isnull=True
+        )
+    )
+    
+    if not submissions:
+        return {'success': True, 'analyzed': 0}
+    
+    logger.info(f"Starting batch analysis for {len(submissions)} submissions")
+    
+    reused = _reuse_existing_results(submissions)
+    
+    # One submission per content hash is analyzed; its duplicates get copies
+    leaders = {}
+    duplicates = {}
+    for submission in submissions:
+        if submission.id in reused or not submission.content_hash:
+            continue
+        if submission.content_hash in leaders:
+            duplicates.setdefault(submission.content_hash, []).append(submission)
+        else:
+            leaders[submission.content_hash] = submission
+    
+    owned = []
+    deferred = set()
+    for content_hash, leader in leaders.items():
+        if analysis_flight.acquire(content_hash, str(leader.id)):
+            owned.append(content_hash)
+            continue
+        # Another worker is analyzing this content: wait for it like a single analysis would
+        for submission in [leader] + duplicates.pop(content_hash, []):
+            analysis_flight.add_waiter(content_hash, str(submission.id))
+            analyze_submission.apply_async(
+                args=[str(submission.id)],
+                kwargs={'attempt': 1},
+                countdown=settings.ANALYSIS_COALESCE_RETRY_DELAY
+            )
+            deferred.add(submission.id)
+    
+    skipped = reused | deferred | {submission.id for group in duplicates.values() for submission in group}
+    submissions = [submission for submission in submissions if submission.id not in skipped]
+    
+    try:
+        analyzed = _analyze_batch(submissions)
+        
+        for content_hash in owned:
+            leader = leaders[content_hash]
+            waiter_ids = analysis_flight.drain_waiters(content_hash)
+            waiter_ids += [str(submission.id) for submission in duplicates.get(content_hash, [])]
+            if leader.id in analyzed:
+                _fan_out_result(analyzed[leader.id], waiter_ids)
+            else:
+                # The analysis failed; duplicates end up like the submission they copy
+                _complete_without_result(waiter_ids)
+    finally:
+        for content_hash in owned:
+            analysis_flight.release(content_hash, str(leaders[content_hash].id))
+    
+    return {
+        'success': True,
+        'analyzed': len(analyzed),
+        'coalesced': len(skipped),
+    }
+
+
+def _analyze_batch(submissions):
+    """
+    Run the batched analysis of analyze_submission_batch for submissions
+    that need it. Returns {submission id: saved VerificationResult}.
+    """
+    if not submissions:
+        return {}
+    
+    now = timezone.now()
+    timers = {}
+    for submission in submissions:
+        timers[submission.id] = StageTimer()
+        timers[submission.id].add('queue_wait', (now - submission.created_at).total_seconds())
+    
+    model = get_model()
+    results = {}
+    texts = []
+    languages = []
+    text_submissions = []
+    credibility_scores = {}
+    
+    for submission in submissions:
+        try:
+            with timers[submission.id]:
+                if submission.submission_type == 'text':
+                    texts.append(submission.text_content)
+                    languages.append(submission.language)
+                    text_submissions.append(submission)
+                elif submission.submission_type == 'link':
+                    scraped = _scrape_link(submission)
+                    if scraped is None:
+                        results[submission.id] = dict(UNVERIFIABLE_LINK_RESULT)
+                        continue
+                    
+                    texts.append(scraped['main_text'])
+                    languages.append(scraped['language'])
+                    text_submissions.append(submission)
+                    
+                    credibility = _source_credibility(submission.source_url)
+                    if credibility is not None:
+                        credibility_scores[submission.id] = credibility
+                elif submission.submission_type in ('image', 'video', 'audio'):
+                    results[submission.id] = _analyze_media(model, submission)
+                else:
+                    logger.error(f"Unknown submission type: {submission.submission_type}")
+        
+        except Exception as e:
+            logger.error(f"Error preparing submission {submission.id} for batch analysis: {str(e)}")
+    
+    with StageTimer() as text_timer:
+        text_results = model.analyze_texts(texts, languages)
+    
+    for submission, result in zip(text_submissions, text_results):
+        if submission.id in credibility_scores:
+            result['source_credibility_score'] = credibility_scores[submission.id]
+        results[submission.id] = result
+    
+    analyzed = [submission for submission in submissions if submission.id in results]
+    
+    with StageTimer() as batch_timer:
+        verifications = {
+            submission.id: _build_verification_result(submission, results[submission.id])
+            for submission in analyzed
+        }
+        with timed('persist'):
+            VerificationResult.objects.bulk_create(verifications.values(), ignore_conflicts=True)
+            
+            # Submissions that failed to prepare are still marked completed, as in analyze_submission
+            track_update(
+                Submission.objects.filter(id__in=[submission.id for submission in submissions]),
+                status='completed',
+                analyzed_at=timezone.now()
+            )
+            invalidate_submissions(*[submission.id for submission in submissions])
+        
+        with timed('notify'):
+            for submission in submissions:
+                publish_submission_event(submission.id, 'completed', verifications.get(submission.id))
+            
+            for submission in analyzed:
+                notify_user_analysis_complete.delay(str(submission.id))
+    
+    logger.info(f"Batch analysis completed for {len(analyzed)} of {len(submissions)} submissions")
+    
+    for submission in text_submissions:
+        timers[submission.id].merge(_share(text_timer, len(text_submissions)))
+    for submission in analyzed:
+        timers[submission.id].merge(_share(batch_timer, len(analyzed)))
+    _save_timings(
+        [verifications[submission.id] for submission in analyzed],
+        [timers[submission.id] for submission in analyzed]
+    )
+    
+    return {submission.id: verifications[submission.id] for submission in analyzed}
+
+
+def dispatch_analysis_batches(submission_ids, batch_size=None):
+    """
+    Queue analysis for many submissions as a group of batch tasks.
+    Each task receives at most batch_size submissions (ANALYSIS_BATCH_SIZE by default).
+    """
+    batch_size = batch_size or settings.ANALYSIS_BATCH_SIZE
+    submission_ids = [str(submission_id) for submission_id in submission_ids]
+    
+    return group(
+        analyze_submission_batch.s(submission_ids[start:start + batch_size])
+        for start in range(0, len(submission_ids), batch_size)
+    ).apply_async()
+
+
+def _analyze_media(model, submission):
+    """Run the model analyzer matching a media submission's type."""
+    analyzers = {
+        'image': model.analyze_image,
+        'video': model.analyze_video,
+        'audio': model.analyze_audio,
+    }
+    with timed('inference'):
+        return analyzers[submission.submission_type](submission.file.path)
+
+
+def _share(timer, count):
+    """Get one of count equal shares of a timer's stages."""
+    return {stage: milliseconds / count for stage, milliseconds in timer.timings.items()}
+
+
+def _save_timings(verifications, timers):
+    """Store each result's stage timings and add them to the rolling histograms."""
+    for verification, timer in zip(verifications, timers):
+        verification.stage_timings = timer.as_dict()
+        verification.analysis_duration_ms = timer.elapsed_ms()
+    
+    VerificationResult.objects.bulk_update(verifications, ['stage_timings', 'analysis_duration_ms'])
+    record_timings(verifications)
+
+
+def _scrape_link(submission):
+    """
+    Scrape a link submission's URL and store the scraped content.
+    Returns the scraped data, or None if scraping failed.
+    """
+    logger.info(f"Scraping link for submission {submission.id}: {submission.source_url}")
+    
+    scraper = WebScraper()
+    scraped = scraper.scrape_url(submission.source_url)
+    
+    if not scraped['success']:
+        logger.error(f"Failed to scrape URL: {scraped.get('error')}")
+        return None
+    
+    # Save scraped content
+    ScrapedContent.objects.create(
+        submission=submission,
+        source_url=submission.source_url,
+        domain=scraped['domain'],
+        title=scraped['title'],
+        description=scraped['description'],
+        main_text=scraped['main_text'],
+        authors=scraped['authors'],
+        language=scraped['language'],
+        external_links=scraped.get('links', []),
+    )
+    
+    return scraped
+
+
+def _source_credibility(url):
+    """Get credibility score for a trusted source URL, or None if untrusted."""
+    from satyacheck.services.web_scraper import NewsAggregator
+    if NewsAggregator.is_trusted_source(url):
+        return NewsAggregator.get_source_credibility(url)
+    return None
+
+
+def _complete_submission(submission, verification):
+    """Mark a submission completed with its saved result and notify listeners."""
+    with timed('persist'):
+        submission.status = 'completed'
+        submission.analyzed_at = timezone.now()
+        submission.save(update_fields=['status', 'analyzed_at', 'updated_at'])
+        invalidate_submissions(submission.id)
+    
+    with timed('notify'):
+        publish_submission_event(submission.id, 'completed', verification)
+        
+        # Send notification (if needed)
+        notify_user_analysis_complete.delay(str(submission.id))
+
+
+def _find_existing_result(submission):
+    """Get a recent result for identical content, or None."""
+    since = timezone.now() - timedelta(seconds=settings.ANALYSIS_RESULT_REUSE_WINDOW)
+    return VerificationResult.objects.filter(
+        submission__content_hash=submission.content_hash,
+        created_at__gte=since
+    ).exclude(submission=submission).order_by('-created_at').first()
+
+
+def _reuse_existing_results(submissions):
+    """
+    Complete submissions whose content already has a recent result (see
+    _find_existing_result) with copies of it, with one query per step
+    for the whole batch. Returns the ids of the submissions completed.
+    """
+    hashes = {submission.content_hash for submission in submissions if submission.content_hash}
+    if not hashes:
+        return set()
+    
+    since = timezone.now() - timedelta(seconds=settings.ANALYSIS_RESULT_REUSE_WINDOW)
+    existing = VerificationResult.objects.filter(
+        submission__content_hash__in=hashes,
+        created_at__gte=since
+    ).annotate(source_hash=F('submission__content_hash'))
+    if connection.features.can_distinct_on_fields:
+        existing = existing.order_by('submission__content_hash', '-created_at').distinct('submission__content_hash')
+    else:
+        existing = existing.order_by('-created_at')
+    
+    latest = {}
+    for result in existing:
+        latest.setdefault(result.source_hash, result)
+    
+    copies = {
+        submission.id: _copy_verification_result(latest[submission.content_hash], submission)
+        for submission in submissions
+        if submission.content_hash in latest
+    }
+    if copies:
+        _complete_with_copies(copies)
+        logger.info(f"Reused analysis of identical content for {len(copies)} submissions in batch")
+    return set(copies)
+
+
+def _copy_verification_result(source, submission):
+    """Build an unsaved copy of source for another submission."""
+    copy = VerificationResult(submission=submission)
+    # Timings belong to the analysis that ran, not to the copies it was shared with
+    for field in VerificationResult._meta.concrete_fields:
+        if field.name not in ('id', 'submission', 'created_at', 'updated_at', 'stage_timings', 'analysis_duration_ms'):
+            setattr(copy, field.attname, getattr(source, field.attname))
+    return copy
+
+
+def _fan_out_result(verification, waiter_ids):
+    """Give every waiting duplicate a copy of verification and complete it."""
+    waiters = list(
+        Submission.objects.filter(id__in=waiter_ids, verification_result__isnull=True)
+        .exclude(id=verification.submission_id)
+    )
+    if not waiters:
+        return
+    
+    _complete_with_copies({waiter.id: _copy_verification_result(verification, waiter) for waiter in waiters})
+    
+    logger.info(f"Fanned out analysis of submission {verification.submission_id} to {len(waiters)} duplicates")
+
+
+def _complete_with_copies(copies):
+    """Save {submission id: unsaved result copy} and complete those submissions."""
+    VerificationResult.objects.bulk_create(copies.values(), ignore_conflicts=True)
+    
+    track_update(
+        Submission.objects.filter(id__in=list(copies)),
+        status='completed',
+        analyzed_at=timezone.now()
+    )
+    invalidate_submissions(*copies)
+    
+    for submission_id, copy in copies.items():
+        publish_submission_event(submission_id, 'completed', copy)
+        notify_user_analysis_complete.delay(str(submission_id))
+
+
+def _complete_without_result(submission_ids):
+    """Mark submissions completed without a result, as a failed analysis leaves them."""
+    if not submission_ids:
+        return
+    track_update(
+        Submission.objects.filter(id__in=submission_ids, verification_result__isnull=True),
+        status='completed',
+        analyzed_at=timezone.now()
+    )
+    invalidate_submissions(*submission_ids)
+    for submission_id in submission_ids:
+        publish_submission_event(submission_id, 'completed')
+
+
+def _build_verification_result(submission, result):
+    """Build an unsaved VerificationResult from an analysis result."""
+    return VerificationResult(
+        submission=submission,
+        misinformation_score=result['score'],
+        confidence_level=result['confidence'],
+        primary_category=result['category'],
+        explanation=result['explanation'],
+        explanation_nepali=result.get('explanation_nepali', ''),
+        explanation_hindi=result.get('explanation_hindi', ''),
+        model_used='distilbert-base-uncased',
+        model_version='1.0',
+        text_analysis_score=result.get('component_scores', {}).get('sentiment'),
+    )
+
+
 @shared_task
 def find_similar_news(submission_id):
     """
@@ -181,7 +605,8 @@ def find_similar_news(submission_id):
         try:
             verification = submission.verification_result
             verification.similar_articles = [article['url'] for article in similar]
-            verification.save(update_fields=['similar_articles'])
+            verification.save(update_fields=['similar_articles', 'updated_at'])
+            invalidate_submissions(submission.id)
         except:
             pass
     
@@ -219,63 +644,18 @@ def notify_user_analysis_complete(submission_id):
 @shared_task
 def generate_daily_report():
     """
-    Generate daily report of submissions and statistics.
+    Generate the report for yesterday and update misinformation trends.
     Run once per day.
     """
-    from django.utils import timezone
     from datetime import timedelta
-    from django.db.models import Count, Avg
-    from satyacheck.apps.reporting.models import Report, MisinformationTrend
+    from django.utils import timezone
+    from satyacheck.apps.reporting.engine import create_report, update_trends
     
     try:
-        # Get submissions from last 24 hours
-        start = timezone.now() - timedelta(days=1)
-        submissions = Submission.objects.filter(created_at__gte=start)
-        
-        # Calculate statistics
-        data = {
-            'total_submissions': submissions.count(),
-            'by_type': dict(
-                submissions.values('submission_type').annotate(
-                    count=Count('id')
-                ).values_list('submission_type', 'count')
-            ),
-            'average_score': submissions.filter(
-                verification_result__isnull=False
-            ).aggregate(
-                Avg('verification_result__misinformation_score')
-            )['verification_result__misinformation_score__avg'] or 0,
-        }
+        yesterday = timezone.localdate() - timedelta(days=1)
         
-        # Create report
-        Report.objects.create(
-            title='Daily Report - ' + timezone.now().strftime('%Y-%m-%d'),
-            report_type='daily',
-            start_date=start,
-            end_date=timezone.now(),
-            data=data,
-            is_public=True
-        )
-        
-        # Update trends
-        for category in ['fake_news', 'propaganda', 'spam', 'satire', 'misleading']:
-            count = submissions.filter(
-                verification_result__primary_category=category
-            ).count()
-            
-            avg_score = submissions.filter(
-                verification_result__primary_category=category
-            ).aggregate(
-                Avg('verification_result__misinformation_score')
-            )['verification_result__misinformation_score__avg'] or 0
-            
-            if count > 0:
-                MisinformationTrend.objects.update_or_create(
-                    date=timezone.now().date(),
-                    category=category,
-                    language=None,
-                    defaults={'count': count, 'average_score': avg_score}
-                )
+        create_report('daily', last_day=yesterday)
+        update_trends(yesterday)
         
         logger.info("Daily report generated successfully")
     
@@ -0,0 +1,94 @@
+import pytest
+
+pytest.importorskip('torch')
+
+from satyacheck.apps.ai import tasks
+from satyacheck.apps.submissions.models import Submission, VerificationResult
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory, VerificationResultFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeModel:
+    def __init__(self):
+        self.texts = []
+
+    def analyze_texts(self, texts, languages):
+        self.texts.extend(texts)
+        return [
+            {'score': 70, 'confidence': 'medium', 'category': 'misleading', 'explanation': 'Checked.'}
+            for _ in texts
+        ]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(tasks, 'get_model', lambda: model)
+    # The release script is registered on the previous test's Redis client
+    monkeypatch.setattr(tasks.analysis_flight, '_release', None)
+    return model
+
+
+def analyzing(text, count=1):
+    return [SubmissionFactory(status='analyzing', text_content=text) for _ in range(count)]
+
+
+def test_identical_content_is_analyzed_once_per_batch(model):
+    submissions = analyzing('The river embankment was never built', count=3) + analyzing('Another claim')
+
+    result = tasks.analyze_submission_batch([str(submission.id) for submission in submissions])
+
+    assert result['analyzed'] == 2
+    assert sorted(model.texts) == ['Another claim', 'The river embankment was never built']
+    assert VerificationResult.objects.count() == 4
+    assert set(Submission.objects.values_list('status', flat=True)) == {'completed'}
+
+
+def test_recent_result_is_reused(model):
+    earlier = SubmissionFactory(text_content='Vaccines contain microchips')
+    VerificationResultFactory(submission=earlier, misinformation_score=95)
+    [submission] = analyzing('Vaccines contain microchips')
+
+    result = tasks.analyze_submission_batch([str(submission.id)])
+
+    assert result['analyzed'] == 0
+    assert model.texts == []
+    assert VerificationResult.objects.get(submission=submission).misinformation_score == 95
+
+
+def test_content_in_flight_elsewhere_is_left_to_wait(model, monkeypatch):
+    [submission] = analyzing('Claim being analyzed by another worker')
+    assert tasks.analysis_flight.acquire(submission.content_hash, 'another-submission')
+    queued = []
+    monkeypatch.setattr(
+        tasks.analyze_submission, 'apply_async',
+        lambda args, kwargs, countdown: queued.append((args, kwargs))
+    )
+
+    result = tasks.analyze_submission_batch([str(submission.id)])
+
+    assert result['coalesced'] == 1
+    assert model.texts == []
+    assert queued == [([str(submission.id)], {'attempt': 1})]
+    assert tasks.analysis_flight.drain_waiters(submission.content_hash) == [str(submission.id)]
+
+
+def test_waiters_from_other_workers_receive_the_result(model):
+    [submission] = analyzing('Claim with a waiting duplicate')
+    [waiter] = analyzing('Claim with a waiting duplicate')
+    tasks.analysis_flight.add_waiter(submission.content_hash, str(waiter.id))
+
+    tasks.analyze_submission_batch([str(submission.id)])
+
+    waiter.refresh_from_db()
+    assert waiter.status == 'completed'
+    assert VerificationResult.objects.get(submission=waiter).misinformation_score == 70
+
+
+def test_lock_is_released_after_the_batch(model):
+    [submission] = analyzing('Claim analyzed in a batch')
+
+    tasks.analyze_submission_batch([str(submission.id)])
+
+    assert tasks.analysis_flight.acquire(submission.content_hash, 'next')
@@ -61,6 +61,12 @@ class AnalysisTestViewSet(viewsets.ViewSet):
     """
     
     permission_classes = [IsAuthenticated]
+    # Inference is charged above ordinary writes (see satyacheck.core.throttling)
+    throttle_costs = {
+        'test_text_analysis': 'text_analysis',
+        'test_image_analysis': 'image_analysis',
+        'test_url_analysis': 'url_analysis',
+    }
     
     @action(detail=False, methods=['post'])
     def test_text_analysis(self, request):
@@ -0,0 +1,247 @@
+"""
+Report engine.
+
+Every breakdown a report needs comes from one grouped aggregation over
+submissions, folded into an additive per-day partial. Partials for past
+days are stored in DailyReportPartial, so weekly and monthly reports only
+aggregate the days that are missing or still settling and merge the rest.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from satyacheck.apps.submissions.models import Submission
+from .models import DailyReportPartial, MisinformationTrend, Report
+
+REPORT_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 30}
+TREND_CATEGORIES = ('fake_news', 'propaganda', 'spam', 'satire', 'misleading')
+
+
+def empty_partial():
+    """Get a partial with no submissions."""
+    return {
+        'total': 0,
+        'flagged': 0,
+        'score_sum': 0.0,
+        'scored': 0,
+        'by_type': {},
+        'by_language': {},
+        'by_status': {},
+        'by_category': {},
+    }
+
+
+def _add_count(counts, key, count):
+    counts[key] = counts.get(key, 0) + count
+
+
+def _add_category(categories, category, count, score_sum, scored):
+    entry = categories.setdefault(category, {'count': 0, 'score_sum': 0.0, 'scored': 0})
+    entry['count'] += count
+    entry['score_sum'] += score_sum
+    entry['scored'] += scored
+
+
+def merge_partials(partials):
+    """Sum several partials into one."""
+    merged = empty_partial()
+    for partial in partials:
+        for field in ('total', 'flagged', 'score_sum', 'scored'):
+            merged[field] += partial[field]
+        for field in ('by_type', 'by_language', 'by_status'):
+            for key, count in partial[field].items():
+                _add_count(merged[field], key, count)
+        for category, entry in partial['by_category'].items():
+            _add_category(merged['by_category'], category, entry['count'], entry['score_sum'], entry['scored'])
+    return merged
+
+
+def aggregate_days(first_day, last_day):
+    """
+    Compute partials for each day from first_day to last_day (inclusive)
+    in a single grouped query. Returns {date: partial}.
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+
+    rows = Submission.objects.filter(
+        created_at__gte=start,
+        created_at__lt=end
+    ).annotate(
+        day=TruncDate('created_at', tzinfo=tz)
+    ).values(
+        'day', 'submission_type', 'language', 'status', 'is_flagged',
+        'verification_result__primary_category'
+    ).annotate(
+        count=Count('id'),
+        score_sum=Sum('verification_result__misinformation_score'),
+        scored=Count('verification_result__misinformation_score'),
+    ).order_by()
+
+    partials = defaultdict(empty_partial)
+    for row in rows:
+        partial = partials[row['day']]
+        count = row['count']
+        score_sum = row['score_sum'] or 0.0
+
+        partial['total'] += count
+        partial['score_sum'] += score_sum
+        partial['scored'] += row['scored']
+        if row['is_flagged']:
+            partial['flagged'] += count
+        _add_count(partial['by_type'], row['submission_type'], count)
+        _add_count(partial['by_language'], row['language'], count)
+        _add_count(partial['by_status'], row['status'], count)
+
+        category = row['verification_result__primary_category']
+        if category:
+            _add_category(partial['by_category'], category, count, score_sum, row['scored'])
+
+    day = first_day
+    result = {}
+    while day <= last_day:
+        result[day] = partials.get(day, empty_partial())
+        day += timedelta(days=1)
+    return result
+
+
+def get_daily_partials(first_day, last_day):
+    """
+    Get {date: partial} for a range of days.
+
+    A stored partial is reused once it was computed more than
+    REPORT_PARTIAL_SETTLE_DAYS after its day (late analysis and moderation
+    mostly happen before that). Each run of missing or unsettled days is
+    aggregated with one query, and complete days are stored.
+    """
+    stored = {
+        partial.date: partial.data
+        for partial in DailyReportPartial.objects.filter(date__gte=first_day, date__lte=last_day)
+        if _is_settled(partial)
+    }
+
+    partials = {}
+    run_start = None
+    day = first_day
+    while day <= last_day + timedelta(days=1):
+        if day <= last_day and day not in stored:
+            run_start = run_start or day
+        else:
+            if run_start is not None:
+                partials.update(_compute_partials(run_start, day - timedelta(days=1)))
+                run_start = None
+            if day <= last_day:
+                partials[day] = stored[day]
+        day += timedelta(days=1)
+
+    return partials
+
+
+def _compute_partials(first_day, last_day):
+    """Aggregate a run of days and store the ones that are complete."""
+    today = timezone.localdate()
+    computed = aggregate_days(first_day, last_day)
+
+    # Today is still filling up; only store complete days
+    complete = [day for day in computed if day < today]
+    if complete:
+        with transaction.atomic():
+            DailyReportPartial.objects.filter(date__in=complete).delete()
+            DailyReportPartial.objects.bulk_create(
+                DailyReportPartial(date=day, data=computed[day]) for day in complete
+            )
+    return computed
+
+
+def _is_settled(partial):
+    """Check whether a stored partial was computed after its day settled."""
+    settled_on = partial.date + timedelta(days=settings.REPORT_PARTIAL_SETTLE_DAYS)
+    return timezone.localdate(partial.updated_at) > settled_on
+
+
+def finalize(partial):
+    """Turn a partial into report data."""
+    return {
+        'total_submissions': partial['total'],
+        'by_type': partial['by_type'],
+        'by_language': partial['by_language'],
+        'by_status': partial['by_status'],
+        'by_category': {
+            category: {
+                'count': entry['count'],
+                'average_score': entry['score_sum'] / entry['scored'] if entry['scored'] else 0,
+            }
+            for category, entry in partial['by_category'].items()
+        },
+        'flagged': partial['flagged'],
+        'verified': partial['by_status'].get('completed', 0),
+        'average_misinformation_score': partial['score_sum'] / partial['scored'] if partial['scored'] else 0,
+    }
+
+
+def build_report_data(first_day, last_day):
+    """Get report data for the days from first_day to last_day (inclusive)."""
+    partials = get_daily_partials(first_day, last_day)
+    return finalize(merge_partials(partials.values()))
+
+
+def new_report(report_type, last_day=None, **fields):
+    """
+    Get an unsaved, pending 'daily', 'weekly' or 'monthly' Report covering
+    the days up to and including last_day (default: today).
+    """
+    last_day = last_day or timezone.localdate()
+    first_day = last_day - timedelta(days=REPORT_DAYS[report_type] - 1)
+    tz = timezone.get_current_timezone()
+
+    return Report(
+        title=f"{report_type.capitalize()} Report - {last_day:%Y-%m-%d}",
+        report_type=report_type,
+        start_date=timezone.make_aware(datetime.combine(first_day, time.min), tz),
+        end_date=min(
+            timezone.now(),
+            timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+        ),
+        status='pending',
+        **fields
+    )
+
+
+def populate_report(report):
+    """Compute and save the data for a report built by new_report()."""
+    first_day = timezone.localdate(report.start_date)
+    last_day = first_day + timedelta(days=REPORT_DAYS[report.report_type] - 1)
+
+    report.data = build_report_data(first_day, last_day)
+    report.status = 'completed'
+    report.completed_at = timezone.now()
+    report.save()
+    return report
+
+
+def create_report(report_type, last_day=None, is_public=True):
+    """Build and save a report synchronously (used by scheduled tasks)."""
+    return populate_report(new_report(report_type, last_day, is_public=is_public))
+
+
+def update_trends(day):
+    """Store MisinformationTrend rows for day from its partial."""
+    partial = get_daily_partials(day, day)[day]
+    for category in TREND_CATEGORIES:
+        entry = partial['by_category'].get(category)
+        if entry and entry['count'] > 0:
+            MisinformationTrend.objects.update_or_create(
+                date=day,
+                category=category,
+                language=None,
+                defaults={
+                    'count': entry['count'],
+                    'average_score': entry['score_sum'] / entry['scored'] if entry['scored'] else 0,
+                }
+            )
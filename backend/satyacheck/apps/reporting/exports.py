@@ -0,0 +1,190 @@
+"""
+Submission exports.
+Rows (submissions joined with their verification results) are read in
+chunks with a server-side cursor and written straight to a temporary
+file, which is then stored in Report.file. Memory use does not grow with
+the number of rows.
+"""
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+import csv
+import io
+import tempfile
+
+from satyacheck.apps.submissions.models import Submission
+from .models import Report
+
+# (column, values() lookup, parquet type)
+EXPORT_COLUMNS = (
+    ('id', 'id', 'string'),
+    ('title', 'title', 'string'),
+    ('submission_type', 'submission_type', 'string'),
+    ('status', 'status', 'string'),
+    ('language', 'language', 'string'),
+    ('source_url', 'source_url', 'string'),
+    ('is_flagged', 'is_flagged', 'bool'),
+    ('username', 'user__username', 'string'),
+    ('created_at', 'created_at', 'timestamp'),
+    ('analyzed_at', 'analyzed_at', 'timestamp'),
+    ('misinformation_score', 'verification_result__misinformation_score', 'float'),
+    ('confidence_level', 'verification_result__confidence_level', 'string'),
+    ('primary_category', 'verification_result__primary_category', 'string'),
+    ('model_used', 'verification_result__model_used', 'string'),
+    ('model_version', 'verification_result__model_version', 'string'),
+)
+
+EXTENSIONS = {'csv': 'csv', 'jsonl': 'jsonl', 'parquet': 'parquet'}
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def get_export_queryset(parameters):
+    """Build the submission queryset described by a report's parameters."""
+    queryset = Submission.objects.all()
+
+    if parameters.get('user_id'):
+        queryset = queryset.filter(user_id=parameters['user_id'])
+    if parameters.get('submission_ids'):
+        queryset = queryset.filter(id__in=parameters['submission_ids'])
+    if parameters.get('status'):
+        queryset = queryset.filter(status=parameters['status'])
+    if parameters.get('submission_type'):
+        queryset = queryset.filter(submission_type=parameters['submission_type'])
+    if parameters.get('start_date'):
+        queryset = queryset.filter(created_at__gte=parse_datetime(parameters['start_date']))
+    if parameters.get('end_date'):
+        queryset = queryset.filter(created_at__lt=parse_datetime(parameters['end_date']))
+
+    return queryset.order_by('created_at', 'id')
+
+
+def iter_rows(queryset):
+    """Yield export rows as tuples, fetched in chunks (server-side cursor on PostgreSQL)."""
+    lookups = [lookup for _, lookup, _ in EXPORT_COLUMNS]
+    return queryset.values_list(*lookups).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def write_csv(rows, fileobj):
+    """Write rows as CSV to a binary file. Returns the row count."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow([column for column, _, _ in EXPORT_COLUMNS])
+
+    count = 0
+    for row in rows:
+        writer.writerow(['' if value is None else _format(value) for value in row])
+        count += 1
+
+    text.detach()
+    return count
+
+
+def write_jsonl(rows, fileobj):
+    """Write rows as JSON Lines to a binary file. Returns the row count."""
+    columns = [column for column, _, _ in EXPORT_COLUMNS]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    count = 0
+    for row in rows:
+        fileobj.write(encoder.encode(dict(zip(columns, row))).encode('utf-8'))
+        fileobj.write(b'\n')
+        count += 1
+    return count
+
+
+def write_parquet(rows, fileobj):
+    """Write rows as Parquet, one row group per chunk. Returns the row count."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        'string': pa.string(),
+        'bool': pa.bool_(),
+        'float': pa.float64(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }
+    schema = pa.schema([(column, types[kind]) for column, _, kind in EXPORT_COLUMNS])
+    kinds = [kind for _, _, kind in EXPORT_COLUMNS]
+
+    count = 0
+    chunk = []
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        for row in rows:
+            chunk.append({
+                column: str(value) if kind == 'string' and value is not None else value
+                for column, kind, value in zip(schema.names, kinds, row)
+            })
+            if len(chunk) >= settings.EXPORT_CHUNK_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(chunk, schema=schema))
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            writer.write_batch(pa.RecordBatch.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    return count
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'parquet': write_parquet}
+
+
+def _format(value):
+    """Format a CSV cell the way the API renders the value."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def run_export(report):
+    """
+    Write the export described by report to its file.
+    Returns the number of rows written.
+    """
+    export_format = report.export_format
+    rows = iter_rows(get_export_queryset(report.parameters))
+
+    with tempfile.TemporaryFile() as fileobj:
+        count = WRITERS[export_format](rows, fileobj)
+        fileobj.seek(0)
+        report.file.save(
+            f'export_{report.id}.{EXTENSIONS[export_format]}',
+            File(fileobj),
+            save=False
+        )
+
+    report.row_count = count
+    report.status = 'completed'
+    report.completed_at = timezone.now()
+    report.save(update_fields=['file', 'row_count', 'status', 'completed_at'])
+    return count
+
+
+def queue_export(user, export_format, parameters):
+    """Create a pending export report for user and queue it once committed."""
+    if not user.is_admin_user():
+        parameters = dict(parameters, user_id=str(user.pk))
+
+    now = timezone.now()
+    report = Report.objects.create(
+        title=f"Submission Export - {now:%Y-%m-%d %H:%M}",
+        report_type='export',
+        export_format=export_format,
+        status='pending',
+        parameters=parameters,
+        start_date=parse_datetime(parameters['start_date']) if parameters.get('start_date') else now,
+        end_date=parse_datetime(parameters['end_date']) if parameters.get('end_date') else now,
+        created_by=user,
+        is_public=False
+    )
+
+    from .tasks import export_submissions
+    report_id = str(report.id)
+    transaction.on_commit(lambda: export_submissions.delay(report_id))
+    return report
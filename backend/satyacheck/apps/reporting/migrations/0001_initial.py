@@ -0,0 +1,119 @@
+# Generated by Django 4.2.8 on 2026-10-19 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReportPartial',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField(unique=True)),
+                ('data', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'daily_report_partial',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TopContent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('period', models.CharField(max_length=50)),
+                ('content_type', models.CharField(choices=[('flagged', 'Most Flagged'), ('verified', 'Most Verified'), ('controversial', 'Most Controversial')], max_length=50)),
+                ('rank', models.IntegerField()),
+                ('title', models.CharField(max_length=500)),
+                ('submission_id', models.UUIDField()),
+                ('count', models.IntegerField()),
+                ('score', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'top_content',
+                'ordering': ['period', 'content_type', 'rank'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserStatistic',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('user_id', models.UUIDField()),
+                ('username', models.CharField(max_length=255)),
+                ('role', models.CharField(max_length=50)),
+                ('activity_count', models.IntegerField(default=0)),
+                ('submission_count', models.IntegerField(default=0)),
+                ('verification_count', models.IntegerField(default=0)),
+                ('flag_count', models.IntegerField(default=0)),
+                ('active_days', models.IntegerField(default=0)),
+                ('last_active', models.DateTimeField(blank=True, null=True)),
+                ('accuracy_score', models.FloatField(default=0.0)),
+                ('period', models.CharField(max_length=50)),
+                ('period_start', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'user_statistic',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(fields=['period', 'period_start'], name='user_statis_period_b0492b_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MisinformationTrend',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('category', models.CharField(max_length=100)),
+                ('count', models.IntegerField(default=0)),
+                ('average_score', models.FloatField(default=0.0)),
+                ('region', models.CharField(blank=True, max_length=100, null=True)),
+                ('language', models.CharField(blank=True, max_length=20, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'misinformation_trend',
+                'ordering': ['-date'],
+                'unique_together': {('date', 'category', 'language')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Report',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=500)),
+                ('report_type', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly'), ('custom', 'Custom'), ('export', 'Submission Export')], max_length=50)),
+                ('data', models.JSONField(default=dict)),
+                ('file', models.FileField(blank=True, help_text='Generated report file (CSV/PDF)', null=True, upload_to='reports/')),
+                ('export_format', models.CharField(blank=True, choices=[('csv', 'CSV'), ('jsonl', 'JSON Lines'), ('parquet', 'Parquet')], help_text='File format of a submission export', max_length=20, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='completed', max_length=20)),
+                ('parameters', models.JSONField(blank=True, default=dict, help_text='Filters used to build the report')),
+                ('row_count', models.IntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('start_date', models.DateTimeField()),
+                ('end_date', models.DateTimeField()),
+                ('is_public', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'report',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_by', 'created_at'], name='report_created_32f4f3_idx')],
+            },
+        ),
+    ]
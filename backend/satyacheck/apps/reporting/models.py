@@ -3,6 +3,7 @@ Models for reporting and analytics.
 """
 
 from django.db import models
+from satyacheck.apps.users.models import User
 import uuid
 
 
@@ -16,6 +17,20 @@ class Report(models.Model):
         ('weekly', 'Weekly'),
         ('monthly', 'Monthly'),
         ('custom', 'Custom'),
+        ('export', 'Submission Export'),
+    )
+    
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+    
+    FORMAT_CHOICES = (
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+        ('parquet', 'Parquet'),
     )
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -34,22 +49,69 @@ class Report(models.Model):
         help_text='Generated report file (CSV/PDF)'
     )
     
+    export_format = models.CharField(
+        max_length=20,
+        choices=FORMAT_CHOICES,
+        blank=True,
+        null=True,
+        help_text='File format of a submission export'
+    )
+    
+    # Generation (reports are built by Celery tasks)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='completed')
+    parameters = models.JSONField(default=dict, blank=True, help_text='Filters used to build the report')
+    row_count = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, null=True)
+    
     # Metadata
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
     
     is_public = models.BooleanField(default=False)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='reports'
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         db_table = 'report'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_by', 'created_at']),
+        ]
     
     def __str__(self):
         return self.title
 
 
+class DailyReportPartial(models.Model):
+    """
+    Additive submission aggregates for one day.
+    Reports spanning several days are merged from these instead of
+    rescanning submissions (see reporting.engine).
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    date = models.DateField(unique=True)
+    data = models.JSONField(default=dict)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'daily_report_partial'
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"Partial - {self.date}"
+
+
 class MisinformationTrend(models.Model):
     """
     Track trends in misinformation categories over time.
@@ -122,6 +184,7 @@ class UserStatistic(models.Model):
     role = models.CharField(max_length=50)
     
     # Activity
+    activity_count = models.IntegerField(default=0)
     submission_count = models.IntegerField(default=0)
     verification_count = models.IntegerField(default=0)
     flag_count = models.IntegerField(default=0)
@@ -134,6 +197,7 @@ class UserStatistic(models.Model):
     accuracy_score = models.FloatField(default=0.0)
     
     period = models.CharField(max_length=50)  # 'daily', 'weekly', 'monthly'
+    period_start = models.DateField(null=True, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -141,6 +205,9 @@ class UserStatistic(models.Model):
     class Meta:
         db_table = 'user_statistic'
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['period', 'period_start']),
+        ]
     
     def __str__(self):
         return f"{self.username} - {self.period}"
@@ -3,6 +3,7 @@ Serializers for reporting and analytics.
 """
 
 from rest_framework import serializers
+from satyacheck.apps.submissions.models import Submission
 from .models import Report, MisinformationTrend, TopContent, UserStatistic
 
 
@@ -13,9 +14,29 @@ class ReportSerializer(serializers.ModelSerializer):
         model = Report
         fields = [
             'id', 'title', 'report_type', 'data', 'file',
-            'start_date', 'end_date', 'is_public', 'created_at'
+            'export_format', 'status', 'parameters', 'row_count', 'error',
+            'start_date', 'end_date', 'is_public', 'created_at', 'completed_at'
         ]
-        read_only_fields = ['id', 'created_at', 'data', 'file']
+        read_only_fields = [
+            'id', 'created_at', 'data', 'file', 'export_format', 'status',
+            'parameters', 'row_count', 'error', 'completed_at'
+        ]
+
+
+class ReportExportSerializer(serializers.Serializer):
+    """Serializer for submission export requests."""
+    
+    export_format = serializers.ChoiceField(choices=Report.FORMAT_CHOICES, default='csv')
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
+    status = serializers.ChoiceField(choices=Submission.STATUS_CHOICES, required=False)
+    submission_type = serializers.ChoiceField(choices=Submission.SUBMISSION_TYPE_CHOICES, required=False)
+    
+    def validate(self, data):
+        """Validate the date range."""
+        if data.get('start_date') and data.get('end_date') and data['start_date'] >= data['end_date']:
+            raise serializers.ValidationError('start_date must be before end_date.')
+        return data
 
 
 class MisinformationTrendSerializer(serializers.ModelSerializer):
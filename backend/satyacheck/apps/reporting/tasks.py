@@ -0,0 +1,43 @@
+"""
+Celery tasks for reporting.
+"""
+
+from celery import shared_task
+import logging
+
+from .engine import populate_report
+from .exports import run_export
+from .models import Report
+
+logger = logging.getLogger('satyacheck')
+
+
+@shared_task
+def generate_report(report_id):
+    """Compute a pending daily/weekly/monthly report."""
+    return _run(report_id, populate_report)
+
+
+@shared_task
+def export_submissions(report_id):
+    """Write a pending submission export to its file."""
+    return _run(report_id, run_export)
+
+
+def _run(report_id, build):
+    """Run build(report), recording progress and failures on the report."""
+    updated = Report.objects.filter(id=report_id, status='pending').update(status='running')
+    if not updated:
+        # Already picked up by another worker, or deleted
+        return {'success': False, 'error': 'Report is not pending'}
+
+    report = Report.objects.get(id=report_id)
+    try:
+        build(report)
+    except Exception as e:
+        logger.error(f"Error building report {report_id}: {str(e)}")
+        Report.objects.filter(id=report_id).update(status='failed', error=str(e))
+        return {'success': False, 'error': str(e)}
+
+    logger.info(f"Report {report_id} ({report.report_type}) completed")
+    return {'success': True, 'report_id': str(report_id), 'row_count': report.row_count}
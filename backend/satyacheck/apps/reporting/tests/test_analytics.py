@@ -0,0 +1,31 @@
+import pytest
+
+from satyacheck.apps.reporting.views import analytics_cache
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('endpoint', ['top_content', 'user_statistics'])
+def test_unknown_period_falls_back_to_default(user_client, endpoint):
+    response = user_client.get(f'/api/v1/reports/analytics/{endpoint}/', {'period': 'x' * 200})
+
+    assert response.status_code == 200
+    assert response.data['period'] == 'week'
+    assert analytics_cache.get(f"{endpoint}:{'x' * 200}") is None
+    assert analytics_cache.get(f'{endpoint}:week') is not None
+
+
+@pytest.mark.parametrize('period', ['today', 'week', 'month'])
+def test_known_periods_are_kept(user_client, period):
+    response = user_client.get('/api/v1/reports/analytics/user_statistics/', {'period': period})
+
+    assert response.data['period'] == period
+
+
+def test_trends_are_cached(user_client, django_assert_num_queries):
+    user_client.get('/api/v1/reports/analytics/misinformation_trends/')
+
+    with django_assert_num_queries(0):
+        response = user_client.get('/api/v1/reports/analytics/misinformation_trends/')
+
+    assert response.status_code == 200
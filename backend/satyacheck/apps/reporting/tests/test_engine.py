@@ -0,0 +1,104 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.utils import timezone
+
+from satyacheck.apps.reporting import engine
+from satyacheck.apps.reporting.models import DailyReportPartial
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory, VerificationResultFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def submitted_on(day, score=None, category='false', **fields):
+    submission = SubmissionFactory(**fields)
+    created_at = timezone.make_aware(datetime.combine(day, time(12)))
+    Submission.objects.filter(pk=submission.pk).update(created_at=created_at)
+    if score is not None:
+        VerificationResultFactory(submission=submission, misinformation_score=score, primary_category=category)
+    return submission
+
+
+@pytest.fixture
+def days():
+    today = timezone.localdate()
+    return today - timedelta(days=10), today - timedelta(days=9)
+
+
+def test_one_query_aggregates_every_day(days, django_assert_num_queries):
+    first, second = days
+    submitted_on(first, score=80)
+    submitted_on(first, score=40, is_flagged=True)
+    submitted_on(second, score=60, category='misleading', language='ne')
+
+    with django_assert_num_queries(1):
+        partials = engine.aggregate_days(first, second)
+
+    assert partials[first]['total'] == 2
+    assert partials[first]['flagged'] == 1
+    assert partials[first]['by_category']['false'] == {'count': 2, 'score_sum': 120.0, 'scored': 2}
+    assert partials[second]['by_language'] == {'ne': 1}
+
+
+def test_days_without_submissions_are_empty(days):
+    first, second = days
+
+    assert engine.aggregate_days(first, second) == {
+        first: engine.empty_partial(),
+        second: engine.empty_partial(),
+    }
+
+
+def test_merged_report_data(days):
+    first, second = days
+    submitted_on(first, score=80)
+    submitted_on(second, score=40)
+    submitted_on(second)
+
+    data = engine.build_report_data(first, second)
+
+    assert data['total_submissions'] == 3
+    assert data['by_category']['false'] == {'count': 2, 'average_score': 60.0}
+    assert data['average_misinformation_score'] == 60.0
+    assert data['verified'] == 3
+
+
+def test_complete_days_are_stored_but_not_today():
+    today = timezone.localdate()
+
+    engine.get_daily_partials(today - timedelta(days=2), today)
+
+    assert set(DailyReportPartial.objects.values_list('date', flat=True)) == {
+        today - timedelta(days=2), today - timedelta(days=1)
+    }
+
+
+def test_settled_partials_are_reused(days, django_assert_num_queries):
+    first, second = days
+    engine.get_daily_partials(first, second)
+    DailyReportPartial.objects.update(updated_at=timezone.now())
+    submitted_on(first, score=80)
+
+    with django_assert_num_queries(1):
+        partials = engine.get_daily_partials(first, second)
+
+    assert partials[first]['total'] == 0
+
+
+def test_unsettled_partials_are_recomputed(days):
+    first, second = days
+    engine.get_daily_partials(first, second)
+    DailyReportPartial.objects.update(updated_at=timezone.make_aware(datetime.combine(first, time(23))))
+    submitted_on(first, score=80)
+
+    assert engine.get_daily_partials(first, second)[first]['total'] == 1
+
+
+def test_new_report_covers_whole_days():
+    last_day = timezone.localdate() - timedelta(days=1)
+
+    report = engine.new_report('weekly', last_day)
+
+    assert timezone.localdate(report.start_date) == last_day - timedelta(days=6)
+    assert report.end_date == timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min))
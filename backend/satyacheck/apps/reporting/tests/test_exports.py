@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+
+import pytest
+
+from satyacheck.apps.reporting import tasks
+from satyacheck.apps.reporting.exports import EXPORT_COLUMNS
+from satyacheck.apps.reporting.models import Report
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory, VerificationResultFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def queue(client, django_capture_on_commit_callbacks, **data):
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = client.post('/api/v1/reports/reports/export/', data, format='json')
+    assert response.status_code == 202
+    assert len(callbacks) == 1
+    return response.data['id']
+
+
+def read_file(report_id):
+    report = Report.objects.get(id=report_id)
+    with report.file.open('rb') as fileobj:
+        return report, fileobj.read()
+
+
+def test_csv_export_of_own_submissions(user_client, user, django_capture_on_commit_callbacks):
+    VerificationResultFactory(submission=SubmissionFactory(user=user), misinformation_score=75)
+    SubmissionFactory()
+    report_id = queue(user_client, django_capture_on_commit_callbacks, export_format='csv')
+
+    assert Report.objects.get(id=report_id).status == 'pending'
+    assert tasks.export_submissions(report_id)['success']
+
+    report, content = read_file(report_id)
+    rows = list(csv.reader(io.StringIO(content.decode())))
+    assert report.status == 'completed'
+    assert report.row_count == 1
+    assert rows[0] == [column for column, _, _ in EXPORT_COLUMNS]
+    assert rows[1][rows[0].index('username')] == user.username
+    assert rows[1][rows[0].index('misinformation_score')] == '75.0'
+
+
+def test_admin_jsonl_export_covers_everyone(admin_client, django_capture_on_commit_callbacks):
+    SubmissionFactory.create_batch(3)
+    report_id = queue(admin_client, django_capture_on_commit_callbacks, export_format='jsonl')
+
+    tasks.export_submissions(report_id)
+
+    _, content = read_file(report_id)
+    lines = [json.loads(line) for line in content.decode().splitlines()]
+    assert len(lines) == 3
+    assert set(lines[0]) == {column for column, _, _ in EXPORT_COLUMNS}
+
+
+def test_parquet_export(admin_client, django_capture_on_commit_callbacks):
+    pq = pytest.importorskip('pyarrow.parquet')
+    SubmissionFactory.create_batch(2)
+    report_id = queue(admin_client, django_capture_on_commit_callbacks, export_format='parquet')
+
+    tasks.export_submissions(report_id)
+
+    _, content = read_file(report_id)
+    assert pq.read_table(io.BytesIO(content)).num_rows == 2
+
+
+def test_report_runs_once(admin_client, django_capture_on_commit_callbacks):
+    report_id = queue(admin_client, django_capture_on_commit_callbacks, export_format='csv')
+    tasks.export_submissions(report_id)
+
+    assert tasks.export_submissions(report_id) == {'success': False, 'error': 'Report is not pending'}
+
+
+def test_download_waits_for_the_file(admin_client, django_capture_on_commit_callbacks):
+    report_id = queue(admin_client, django_capture_on_commit_callbacks, export_format='csv')
+
+    assert admin_client.get(f'/api/v1/reports/reports/{report_id}/download/').status_code == 409
+
+    tasks.export_submissions(report_id)
+    response = admin_client.get(f'/api/v1/reports/reports/{report_id}/download/')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv'
+
+
+def test_failed_build_is_recorded(admin_client, django_capture_on_commit_callbacks, monkeypatch):
+    report_id = queue(admin_client, django_capture_on_commit_callbacks, export_format='csv')
+
+    def fail(report):
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(tasks, 'run_export', fail)
+    assert not tasks.export_submissions(report_id)['success']
+
+    report = Report.objects.get(id=report_id)
+    assert (report.status, report.error) == ('failed', 'disk full')
+
+
+def test_summary_report_is_generated_in_the_background(user_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = user_client.post('/api/v1/reports/reports/generate_weekly/')
+
+    assert response.status_code == 202
+    assert len(callbacks) == 1
+    assert tasks.generate_report(response.data['id'])['success']
+    assert Report.objects.get(id=response.data['id']).data['total_submissions'] == 0
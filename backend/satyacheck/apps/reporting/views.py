@@ -6,22 +6,39 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Count, Avg, Q
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 import csv
 import json
+import os
+import redis
 
+from .engine import new_report
+from .exports import CONTENT_TYPES, queue_export
 from .models import Report, MisinformationTrend, TopContent, UserStatistic
 from .serializers import (
-    ReportSerializer, MisinformationTrendSerializer,
+    ReportSerializer, ReportExportSerializer, MisinformationTrendSerializer,
     TopContentSerializer, UserStatisticSerializer
 )
+from .tasks import generate_report
 from satyacheck.apps.submissions.models import Submission, VerificationResult
+from satyacheck.apps.submissions.statistics import get_statistics
+from satyacheck.services import cache_service
+from satyacheck.services.stage_timing import TOTAL, get_timing_histograms
 
 import logging
 logger = logging.getLogger('satyacheck')
 
+analytics_cache = cache_service.get_namespace('analytics', timeout=settings.ANALYTICS_CACHE_TIMEOUT)
+
+# Periods accepted by the ?period= parameter; anything else gets the default
+PERIODS = ('today', 'week', 'month')
+DEFAULT_PERIOD = 'week'
+
 
 class ReportViewSet(viewsets.ModelViewSet):
     """
@@ -44,31 +61,69 @@ class ReportViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def generate_daily(self, request):
         """Generate daily report."""
-        return self._generate_report('daily')
+        return self._generate_report(request, 'daily')
     
     @action(detail=False, methods=['post'])
     def generate_weekly(self, request):
         """Generate weekly report."""
-        return self._generate_report('weekly')
+        return self._generate_report(request, 'weekly')
     
     @action(detail=False, methods=['post'])
     def generate_monthly(self, request):
         """Generate monthly report."""
-        return self._generate_report('monthly')
+        return self._generate_report(request, 'monthly')
+    
+    @action(detail=False, methods=['post'])
+    def export(self, request):
+        """
+        Queue an export of submissions joined with their results.
+        Admins export every submission, other users their own.
+        POST: /api/v1/reports/reports/export/
+        """
+        serializer = ReportExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        parameters = {
+            key: value.isoformat() if hasattr(value, 'isoformat') else value
+            for key, value in serializer.validated_data.items()
+            if key != 'export_format'
+        }
+        report = queue_export(request.user, serializer.validated_data['export_format'], parameters)
+        
+        return Response(self.get_serializer(report).data, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        Download a finished export file.
+        GET: /api/v1/reports/reports/<id>/download/
+        """
+        report = self.get_object()
+        
+        if not report.file:
+            return Response(
+                {'error': f'Report has no file (status: {report.status}).'},
+                status=status.HTTP_409_CONFLICT if report.status in ('pending', 'running') else status.HTTP_404_NOT_FOUND
+            )
+        
+        return self._file_response(report)
     
     @action(detail=True, methods=['get'])
     def export_csv(self, request, pk=None):
         """Export report as CSV."""
         report = self.get_object()
         
-        response = Response(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="report_{report.id}.csv"'
-        
-        # Write CSV
-        writer = csv.DictWriter(response, fieldnames=report.data.keys() if report.data else [])
-        writer.writeheader()
-        writer.writerow(report.data)
+        if report.file and report.export_format == 'csv':
+            return self._file_response(report)
         
+        # Summary reports: one metric per row, nested breakdowns flattened
+        writer = csv.writer(Echo())
+        rows = [('metric', 'value')] + list(_flatten(report.data or {}))
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in rows),
+            content_type='text/csv'
+        )
+        response['Content-Disposition'] = f'attachment; filename="report_{report.id}.csv"'
         return response
     
     @action(detail=True, methods=['get'])
@@ -76,6 +131,9 @@ class ReportViewSet(viewsets.ModelViewSet):
         """Export report as JSON."""
         report = self.get_object()
         
+        if report.file and report.export_format == 'jsonl':
+            return self._file_response(report)
+        
         return Response(
             {
                 'id': str(report.id),
@@ -87,55 +145,42 @@ class ReportViewSet(viewsets.ModelViewSet):
             content_type='application/json'
         )
     
-    def _generate_report(self, report_type):
-        """Generate a report."""
-        # Calculate period
-        if report_type == 'daily':
-            start = timezone.now() - timedelta(days=1)
-        elif report_type == 'weekly':
-            start = timezone.now() - timedelta(days=7)
-        else:  # monthly
-            start = timezone.now() - timedelta(days=30)
-        
-        end = timezone.now()
-        
-        # Get submissions in period
-        submissions = Submission.objects.filter(created_at__gte=start, created_at__lte=end)
+    def _generate_report(self, request, report_type):
+        """Queue a report covering the last day, 7 days or 30 days up to today."""
+        report = new_report(report_type, created_by=request.user, is_public=True)
+        report.save()
         
-        # Calculate statistics
-        data = {
-            'total_submissions': submissions.count(),
-            'by_type': dict(
-                submissions.values('submission_type').annotate(
-                    count=Count('id')
-                ).values_list('submission_type', 'count')
-            ),
-            'by_language': dict(
-                submissions.values('language').annotate(
-                    count=Count('id')
-                ).values_list('language', 'count')
-            ),
-            'flagged': submissions.filter(is_flagged=True).count(),
-            'verified': submissions.filter(status='completed').count(),
-            'average_misinformation_score': submissions.filter(
-                verification_result__isnull=False
-            ).aggregate(
-                Avg('verification_result__misinformation_score')
-            )['verification_result__misinformation_score__avg'] or 0,
-        }
-        
-        # Create report
-        report = Report.objects.create(
-            title=f"{report_type.capitalize()} Report",
-            report_type=report_type,
-            start_date=start,
-            end_date=end,
-            data=data,
-            is_public=True
-        )
+        report_id = str(report.id)
+        transaction.on_commit(lambda: generate_report.delay(report_id))
         
         serializer = self.get_serializer(report)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+    
+    @staticmethod
+    def _file_response(report):
+        """Stream a report's file from storage."""
+        return FileResponse(
+            report.file.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(report.file.name),
+            content_type=CONTENT_TYPES.get(report.export_format)
+        )
+
+
+class Echo:
+    """File-like object that returns what is written, for streaming csv.writer output."""
+    
+    def write(self, value):
+        return value
+
+
+def _flatten(data, prefix=''):
+    """Yield (dotted key, value) pairs from nested report data."""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f'{prefix}{key}.')
+        else:
+            yield f'{prefix}{key}', value
 
 
 class AnalyticsViewSet(viewsets.ViewSet):
@@ -148,27 +193,16 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def overview(self, request):
         """Get analytics overview."""
-        submissions = Submission.objects.all()
+        statistics = get_statistics()
         
         data = {
-            'total_submissions': submissions.count(),
-            'total_verified': submissions.filter(status='completed').count(),
-            'total_flagged': submissions.filter(is_flagged=True).count(),
-            'by_type': dict(
-                submissions.values('submission_type').annotate(
-                    count=Count('id')
-                ).values_list('submission_type', 'count')
-            ),
-            'by_status': dict(
-                submissions.values('status').annotate(
-                    count=Count('id')
-                ).values_list('status', 'count')
-            ),
-            'by_language': dict(
-                submissions.values('language').annotate(
-                    count=Count('id')
-                ).values_list('language', 'count')
-            ),
+            'total_submissions': statistics['total'],
+            'total_verified': statistics['by_status'].get('completed', 0),
+            'total_flagged': statistics['flagged'],
+            'by_type': statistics['by_type'],
+            'by_status': statistics['by_status'],
+            'by_language': statistics['by_language'],
+            'updated_at': statistics['updated_at'],
         }
         
         return Response(data)
@@ -176,77 +210,90 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def misinformation_trends(self, request):
         """Get misinformation trends."""
-        trends = MisinformationTrend.objects.all().order_by('-date')[:30]
+        def compute():
+            trends = MisinformationTrend.objects.all().order_by('-date')[:30]
+            
+            # Group by category
+            data = {}
+            for trend in trends:
+                if trend.category not in data:
+                    data[trend.category] = []
+                data[trend.category].append({
+                    'date': trend.date,
+                    'count': trend.count,
+                    'average_score': trend.average_score,
+                })
+            return data
         
-        # Group by category
-        data = {}
-        for trend in trends:
-            if trend.category not in data:
-                data[trend.category] = []
-            data[trend.category].append({
-                'date': trend.date,
-                'count': trend.count,
-                'average_score': trend.average_score,
-            })
-        
-        return Response(data)
+        return Response(analytics_cache.get_or_set('misinformation_trends', compute))
     
     @action(detail=False, methods=['get'])
     def top_content(self, request):
         """Get top flagged and verified content."""
-        period = request.query_params.get('period', 'week')
+        period = self._get_period(request)
         
-        if period == 'today':
-            start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == 'week':
-            start = timezone.now() - timedelta(days=7)
-        else:  # month
-            start = timezone.now() - timedelta(days=30)
-        
-        # Most flagged
-        flagged = Submission.objects.filter(
-            is_flagged=True,
-            created_at__gte=start
-        ).values('title', 'id').annotate(count=Count('id')).order_by('-count')[:10]
+        def compute():
+            start = self._period_start(period)
+            
+            # Most flagged
+            flagged = Submission.objects.filter(
+                is_flagged=True,
+                created_at__gte=start
+            ).values('title', 'id').annotate(count=Count('id')).order_by('-count')[:10]
+            
+            # Most verified
+            verified = Submission.objects.filter(
+                status='completed',
+                created_at__gte=start
+            ).annotate(count=Count('id')).order_by('-count')[:10]
+            
+            return {
+                'period': period,
+                'most_flagged': list(flagged),
+                'most_verified': list(verified),
+            }
         
-        # Most verified
-        verified = Submission.objects.filter(
-            status='completed',
-            created_at__gte=start
-        ).annotate(count=Count('id')).order_by('-count')[:10]
-        
-        return Response({
-            'period': period,
-            'most_flagged': list(flagged),
-            'most_verified': list(verified),
-        })
+        return Response(analytics_cache.get_or_set(f'top_content:{period}', compute))
     
     @action(detail=False, methods=['get'])
     def user_statistics(self, request):
         """Get user statistics."""
-        period = request.query_params.get('period', 'week')
+        period = self._get_period(request)
+        
+        def compute():
+            start = self._period_start(period)
+            
+            # Most active users
+            from satyacheck.apps.users.models import User, UserActivity
+            
+            active_users = UserActivity.objects.filter(
+                created_at__gte=start
+            ).values('user').annotate(
+                activity_count=Count('id')
+            ).order_by('-activity_count')[:10]
+            
+            return {
+                'period': period,
+                'most_active_users': list(active_users),
+            }
         
-        # Calculate period
+        return Response(analytics_cache.get_or_set(f'user_statistics:{period}', compute))
+    
+    @staticmethod
+    def _get_period(request):
+        """Get the requested period, falling back to the default so cache keys stay bounded."""
+        period = request.query_params.get('period', DEFAULT_PERIOD)
+        return period if period in PERIODS else DEFAULT_PERIOD
+    
+    @staticmethod
+    def _period_start(period):
+        """Get the start of a 'today', 'week' or 'month' period."""
         if period == 'today':
-            start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            return timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
         elif period == 'week':
-            start = timezone.now() - timedelta(days=7)
+            return timezone.now() - timedelta(days=7)
         else:  # month
-            start = timezone.now() - timedelta(days=30)
-        
-        # Most active users
-        from satyacheck.apps.users.models import User, UserActivity
-        
-        active_users = UserActivity.objects.filter(
-            created_at__gte=start
-        ).values('user').annotate(
-            activity_count=Count('id')
-        ).order_by('-activity_count')[:10]
-        
-        return Response({
-            'period': period,
-            'most_active_users': list(active_users),
-        })
+            return timezone.now() - timedelta(days=30)
     
     @action(detail=False, methods=['get'])
     def system_health(self, request):
@@ -256,12 +303,22 @@ class AnalyticsViewSet(viewsets.ViewSet):
         
         submissions = Submission.objects.all()
         
+        # Rolling per-stage histograms over ANALYSIS_TIMING_WINDOW_HOURS
+        try:
+            analysis_timings = get_timing_histograms()
+        except redis.RedisError as e:
+            logger.warning(f"Analysis timings unavailable: {str(e)}")
+            analysis_timings = {}
+        total = analysis_timings.get(TOTAL)
+        
         data = {
             'pending_submissions': submissions.filter(status='pending').count(),
             'analyzing_submissions': submissions.filter(status='analyzing').count(),
-            'average_analysis_time_seconds': 0,  # Would need to calculate based on created_at and analyzed_at
+            'average_analysis_time_seconds': round(total['mean_ms'] / 1000, 3) if total else 0,
+            'analysis_stage_timings': analysis_timings,
             'error_count': 0,  # Would track failed analyses
             'database_status': 'healthy',
+            'cache': cache_service.get_stats(),
         }
         
         return Response(data)
@@ -1 +1,10 @@
-# Init
+from django.apps import AppConfig
+
+
+class SubmissionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'satyacheck.apps.submissions'
+    verbose_name = 'Submissions'
+    
+    def ready(self):
+        import satyacheck.apps.submissions.signals
@@ -0,0 +1,113 @@
+"""
+HTTP caching for submission and verification result reads.
+Validators (ETag/Last-Modified) are cached per submission so conditional
+GETs can be answered with 304 before the submission is loaded or serialized.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+import hashlib
+
+from satyacheck.services.cache_service import get_namespace
+from .models import Submission
+
+# Redis only: a stale local copy could answer 304 after another process changed the submission
+validator_cache = get_namespace(
+    'submission-validators',
+    timeout=settings.SUBMISSION_VALIDATOR_CACHE_TIMEOUT,
+    local_timeout=0
+)
+
+
+def get_validators(submission_id):
+    """
+    Get cache validators for a submission, or None if it does not exist.
+    Read from the cache, falling back to a single narrow query.
+    """
+    validators = validator_cache.get(str(submission_id))
+    if validators is not None:
+        return validators
+
+    try:
+        row = Submission.objects.filter(pk=submission_id).values(
+            'user_id', 'status', 'is_flagged', 'updated_at',
+            'verification_result__id', 'verification_result__updated_at'
+        ).first()
+    except (ValueError, TypeError, ValidationError):
+        # Malformed primary key; let the regular lookup produce the 404
+        return None
+
+    if row is None:
+        return None
+
+    result_modified = row['verification_result__updated_at']
+    validators = {
+        'user_id': row['user_id'],
+        'status': row['status'],
+        'is_flagged': row['is_flagged'],
+        'has_result': row['verification_result__id'] is not None,
+        'last_modified': max(filter(None, [row['updated_at'], result_modified])),
+        # State fields are hashed too, as not every write bumps updated_at
+        'version': hashlib.sha1(
+            '|'.join(str(value) for value in row.values()).encode('utf-8')
+        ).hexdigest()[:16],
+    }
+    validator_cache.set(str(submission_id), validators)
+    return validators
+
+
+def invalidate_submissions(*submission_ids):
+    """Drop cached validators after a submission or its result changes."""
+    validator_cache.delete_many([str(submission_id) for submission_id in submission_ids])
+
+
+def is_public(validators):
+    """Check whether the submission is visible to every user."""
+    return validators['status'] == 'completed' and not validators['is_flagged']
+
+
+def can_view(user, validators):
+    """Check whether user may read the submission (mirrors SubmissionViewSet)."""
+    return user.is_admin_user() or validators['user_id'] == user.pk or is_public(validators)
+
+
+def get_etag(validators, variant):
+    """Weak ETag for one representation (e.g. 'detail' or 'results')."""
+    return f'W/"{variant}-{validators["version"]}"'
+
+
+def conditional_response(request, submission_id, variant):
+    """
+    Return (response, validators).
+    response is a 304 when the client's copy is current, otherwise None.
+    """
+    validators = get_validators(submission_id)
+    if validators is None or not can_view(request.user, validators):
+        return None, None
+
+    response = get_conditional_response(
+        request,
+        etag=get_etag(validators, variant),
+        last_modified=int(validators['last_modified'].timestamp())
+    )
+    if response is not None:
+        apply_cache_headers(response, validators, variant)
+    return response, validators
+
+
+def apply_cache_headers(response, validators, variant):
+    """Set validators and Cache-Control on a submission read response."""
+    response['ETag'] = get_etag(validators, variant)
+    response['Last-Modified'] = http_date(validators['last_modified'].timestamp())
+
+    if is_public(validators) and validators['has_result']:
+        # Finished public results rarely change; let shared caches hold them
+        patch_cache_control(response, public=True, max_age=settings.PUBLIC_RESULT_CACHE_MAX_AGE)
+    else:
+        # Still changing or private: clients must revalidate every time
+        patch_cache_control(response, private=True, no_cache=True)
+
+    patch_vary_headers(response, ['Authorization'])
+    return response
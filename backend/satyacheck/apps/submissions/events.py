@@ -0,0 +1,286 @@
+"""
+Server-Sent Events for submission analysis progress.
+Celery tasks and moderation decisions publish status changes to Redis;
+each ASGI process keeps a single pattern subscription and fans events
+out to its open streams.
+
+EventSource cannot send an Authorization header, so browsers first POST
+to /api/v1/submissions/<id>/events/ticket/ for a ticket: a signed value
+naming the user and the submission, valid for SSE_TICKET_MAX_AGE
+seconds, passed as ?ticket= when opening the stream. Access tokens are
+never put in the URL, where proxies would log them.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+import asyncio
+import json
+import logging
+
+from satyacheck.apps.admin_panel.bans import is_banned
+from satyacheck.core.authentication import StatelessJWTAuthentication, get_user_cached
+from satyacheck.services.redis_client import get_redis, get_async_redis
+from .models import Submission, VerificationResult
+from .serializers import VerificationResultSerializer
+
+logger = logging.getLogger('satyacheck')
+
+CHANNEL_PREFIX = 'submission-events:'
+TERMINAL_STATUSES = ('completed', 'rejected')
+TICKET_SALT = 'satyacheck.submission-events'
+
+
+def _event_payload(submission_id, status, result=None):
+    payload = {'submission_id': str(submission_id), 'status': status}
+    if result is not None:
+        payload['result'] = VerificationResultSerializer(result).data
+    return json.dumps(payload, cls=DjangoJSONEncoder)
+
+
+def publish_submission_event(submission_id, status, result=None):
+    """
+    Publish a status change for a submission.
+    Never raises: a missed push only means clients see it on their next read.
+    """
+    try:
+        get_redis().publish(f'{CHANNEL_PREFIX}{submission_id}', _event_payload(submission_id, status, result))
+    except Exception as e:
+        logger.warning(f"Could not publish event for submission {submission_id}: {str(e)}")
+
+
+def publish_status_change(submission_ids, status):
+    """
+    Publish the same status change for several submissions, e.g. after a
+    moderation decision, with their results when the new status is
+    'completed'. Never raises.
+    """
+    if not submission_ids:
+        return
+
+    results = {}
+    if status == 'completed':
+        results = {
+            result.submission_id: result
+            for result in VerificationResult.objects.filter(submission_id__in=submission_ids)
+        }
+
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for submission_id in submission_ids:
+            pipe.publish(
+                f'{CHANNEL_PREFIX}{submission_id}',
+                _event_payload(submission_id, status, results.get(submission_id))
+            )
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not publish events for {len(submission_ids)} submissions: {str(e)}")
+
+
+def issue_ticket(user, submission_id):
+    """Get a ticket opening user's event stream for one submission."""
+    return signing.dumps({'user': str(user.pk), 'submission': str(submission_id)}, salt=TICKET_SALT)
+
+
+def read_ticket(ticket, submission_id):
+    """
+    Get the user ID a ticket was issued to, or None if it is invalid,
+    expired or for another submission.
+    """
+    try:
+        claims = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.SSE_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if not isinstance(claims, dict) or claims.get('submission') != str(submission_id):
+        return None
+    return claims.get('user')
+
+
+class SubmissionEventHub:
+    """
+    Per-process fan-out of submission events.
+    One Redis pattern subscription serves every open stream in the process,
+    so an idle stream costs an asyncio queue rather than a connection.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.listener = None
+        self.ready = None
+
+    def subscribe(self, submission_id):
+        """Register a queue for events about submission_id."""
+        if self.listener is not None and self.listener.get_loop() is not asyncio.get_running_loop():
+            # Left by another event loop (e.g. an earlier async_to_sync
+            # call); neither it nor its streams will run again
+            self.subscribers = {}
+            self.listener = None
+
+        queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+        self.subscribers.setdefault(str(submission_id), set()).add(queue)
+
+        if self.listener is None or self.listener.done():
+            self.ready = asyncio.Event()
+            self.listener = asyncio.ensure_future(self.listen())
+        return queue
+
+    def unsubscribe(self, submission_id, queue):
+        """Remove a queue registered with subscribe()."""
+        queues = self.subscribers.get(str(submission_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[str(submission_id)]
+
+    async def wait_ready(self):
+        """Wait until the Redis subscription is active."""
+        await asyncio.wait_for(self.ready.wait(), timeout=settings.SSE_HEARTBEAT_INTERVAL)
+
+    async def listen(self):
+        """Keep the shared subscription open while any stream is subscribed."""
+        while self.subscribers:
+            try:
+                await self._consume()
+            except Exception as e:
+                logger.error(f"Submission event listener failed, reconnecting: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def _consume(self):
+        """Read the shared subscription and dispatch to local queues."""
+        pubsub = get_async_redis().pubsub()
+        try:
+            await pubsub.psubscribe(f'{CHANNEL_PREFIX}*')
+            self.ready.set()
+
+            while self.subscribers:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+
+                channel = message['channel'].decode('utf-8')
+                self.dispatch(channel[len(CHANNEL_PREFIX):], message['data'].decode('utf-8'))
+        finally:
+            await pubsub.close()
+
+    def dispatch(self, submission_id, data):
+        """
+        Queue an event for the streams of submission_id.
+        A slow client whose queue is full misses intermediate events, but a
+        terminal event replaces its oldest queued one: it is what ends the
+        stream and carries the result.
+        """
+        terminal = None
+        for queue in list(self.subscribers.get(submission_id, ())):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                if terminal is None:
+                    terminal = json.loads(data)['status'] in TERMINAL_STATUSES
+                if terminal:
+                    queue.get_nowait()
+                    queue.put_nowait(data)
+
+
+hub = SubmissionEventHub()
+
+
+def _authenticate(request, submission_id):
+    """Authenticate with a ?ticket= from issue_ticket() or the Authorization header."""
+    ticket = request.GET.get('ticket')
+    if ticket:
+        user_id = read_ticket(ticket, submission_id)
+        if user_id is None:
+            raise AuthenticationFailed('Invalid or expired ticket.')
+        user = get_user_cached(user_id)
+        if not user.is_active or is_banned(user.pk):
+            raise AuthenticationFailed('User is inactive or banned.')
+        return user
+
+    result = StatelessJWTAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+def _get_snapshot(user, submission_id):
+    """Get the current event payload, or None if user may not see it."""
+    submission = Submission.objects.select_related('verification_result').filter(pk=submission_id).first()
+    if submission is None:
+        return None
+
+    if not user.is_admin_user() and submission.user_id != user.pk:
+        if submission.is_flagged or submission.status != 'completed':
+            return None
+
+    payload = {'submission_id': str(submission.id), 'status': submission.status}
+    result = getattr(submission, 'verification_result', None)
+    if result is not None:
+        payload['result'] = VerificationResultSerializer(result).data
+    return json.dumps(payload, cls=DjangoJSONEncoder)
+
+
+def _format_event(data):
+    """Frame a JSON payload as an SSE 'status' event."""
+    return f'event: status\ndata: {data}\n\n'
+
+
+async def _stream(submission_id, queue, snapshot):
+    """Yield the snapshot, then pushed events, until analysis finishes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.SSE_MAX_DURATION
+
+    try:
+        yield _format_event(snapshot)
+        if json.loads(snapshot)['status'] in TERMINAL_STATUSES:
+            return
+
+        while loop.time() < deadline:
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing the idle connection
+                yield ': keep-alive\n\n'
+                continue
+
+            yield _format_event(data)
+            if json.loads(data)['status'] in TERMINAL_STATUSES:
+                return
+    finally:
+        hub.unsubscribe(submission_id, queue)
+
+
+async def submission_events(request, pk):
+    """
+    Stream analysis status for a submission as Server-Sent Events.
+    Sends the current state first, then each transition, and closes once
+    the submission is completed (the final event carries the result).
+    GET: /api/v1/submissions/<id>/events/?ticket=<ticket>
+    """
+    try:
+        user = await sync_to_async(_authenticate)(request, pk)
+    except AuthenticationFailed:
+        return JsonResponse({'error': 'Invalid or expired credentials.'}, status=401)
+
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+    request.user = user
+
+    # Subscribe before reading the snapshot so no transition falls in between
+    queue = hub.subscribe(pk)
+    try:
+        await hub.wait_ready()
+    except asyncio.TimeoutError:
+        hub.unsubscribe(pk, queue)
+        return JsonResponse({'error': 'Event stream unavailable.'}, status=503)
+
+    snapshot = await sync_to_async(_get_snapshot)(user, pk)
+    if snapshot is None:
+        hub.unsubscribe(pk, queue)
+        return JsonResponse({'error': 'Not found.'}, status=404)
+
+    response = StreamingHttpResponse(_stream(pk, queue, snapshot), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,22 @@
+"""
+Index submissions for full-text search.
+"""
+
+from django.core.management.base import BaseCommand
+
+from satyacheck.apps.submissions.search import backfill_search_index
+
+
+class Command(BaseCommand):
+    help = 'Index submissions missing from the full-text search index (all of them with --rebuild).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Re-index every submission, e.g. after changing the search configs'
+        )
+
+    def handle(self, *args, **options):
+        indexed = backfill_search_index(rebuild=options['rebuild'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} submissions'))
@@ -0,0 +1,235 @@
+# Generated by Django 4.2.8 on 2026-10-19 17:59
+
+from django.conf import settings
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+import satyacheck.apps.submissions.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapedContent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source_url', models.URLField(help_text='Source URL')),
+                ('domain', models.CharField(help_text='Domain of source', max_length=255)),
+                ('title', models.CharField(help_text='Page title', max_length=500)),
+                ('description', models.TextField(help_text='Page description/meta')),
+                ('main_text', models.TextField(help_text='Main article text')),
+                ('authors', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, help_text='Article authors', size=None)),
+                ('publish_date', models.DateTimeField(blank=True, null=True)),
+                ('language', models.CharField(help_text='Content language', max_length=50)),
+                ('external_links', django.contrib.postgres.fields.ArrayField(base_field=models.URLField(), blank=True, default=list, help_text='External links in article', size=None)),
+                ('scrape_success', models.BooleanField(default=True)),
+                ('scrape_error', models.TextField(blank=True, null=True)),
+                ('scraped_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'scraped_content',
+                'ordering': ['-scraped_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SourceDatabase',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Organization name', max_length=255)),
+                ('url', models.URLField(help_text='Primary URL')),
+                ('source_type', models.CharField(choices=[('news', 'News Organization'), ('government', 'Government'), ('academic', 'Academic'), ('fact_check', 'Fact-Checking'), ('other', 'Other')], help_text='Type of source', max_length=50)),
+                ('country', models.CharField(choices=[('np', 'Nepal'), ('in', 'India'), ('us', 'USA'), ('int', 'International')], help_text='Primary country', max_length=10)),
+                ('credibility_score', models.IntegerField(default=50, help_text='Credibility score (0-100)')),
+                ('is_verified', models.BooleanField(default=False, help_text='Verified by SatyaCheck team')),
+                ('description', models.TextField(blank=True, null=True)),
+                ('language', models.CharField(help_text='Primary language', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'source_database',
+                'ordering': ['-credibility_score'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Submission',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('submission_type', models.CharField(choices=[('text', 'Text'), ('image', 'Image'), ('video', 'Video'), ('audio', 'Audio'), ('link', 'Link')], help_text='Type of submission', max_length=20)),
+                ('title', models.CharField(help_text='Submission title/headline', max_length=500)),
+                ('description', models.TextField(blank=True, help_text='Submission description', null=True)),
+                ('text_content', models.TextField(blank=True, help_text='Text content (for text submissions)', null=True)),
+                ('file', models.FileField(blank=True, help_text='Uploaded file (image, video, audio)', null=True, upload_to=satyacheck.apps.submissions.models.get_submission_upload_path)),
+                ('source_url', models.URLField(blank=True, help_text='Source URL (for link submissions)', null=True)),
+                ('language', models.CharField(choices=[('en', 'English'), ('ne', 'Nepali'), ('hi', 'Hindi'), ('other', 'Other')], default='en', help_text='Content language', max_length=20)),
+                ('location', models.CharField(blank=True, help_text='Geographic location mentioned', max_length=200, null=True)),
+                ('tags', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, help_text='Tags for categorization', size=None)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('analyzing', 'Analyzing'), ('completed', 'Completed'), ('flagged', 'Flagged'), ('rejected', 'Rejected')], default='pending', help_text='Submission verification status', max_length=20)),
+                ('is_flagged', models.BooleanField(default=False, help_text='Whether submission is flagged')),
+                ('flag_reason', models.TextField(blank=True, help_text='Reason for flag', null=True)),
+                ('is_anonymous', models.BooleanField(default=False, help_text='Whether submission is anonymous')),
+                ('verification_notes', models.TextField(blank=True, help_text='Notes from verifier', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('analyzed_at', models.DateTimeField(blank=True, null=True)),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+                ('content_hash', models.CharField(blank=True, editable=False, help_text='SHA-256 of normalized content (text and link submissions)', max_length=64, null=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted full-text search vector', null=True)),
+            ],
+            options={
+                'db_table': 'submission',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SubmissionStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_type', models.CharField(choices=[('text', 'Text'), ('image', 'Image'), ('video', 'Video'), ('audio', 'Audio'), ('link', 'Link')], max_length=20)),
+                ('language', models.CharField(choices=[('en', 'English'), ('ne', 'Nepali'), ('hi', 'Hindi'), ('other', 'Other')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('analyzing', 'Analyzing'), ('completed', 'Completed'), ('flagged', 'Flagged'), ('rejected', 'Rejected')], max_length=20)),
+                ('is_flagged', models.BooleanField(default=False)),
+                ('count', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'submission_statistic',
+            },
+        ),
+        migrations.CreateModel(
+            name='VerificationResult',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('misinformation_score', models.FloatField(help_text='Score from 0-100 (higher = more likely to be misinformation)')),
+                ('confidence_level', models.CharField(choices=[('high', 'High Confidence'), ('medium', 'Medium Confidence'), ('low', 'Low Confidence')], help_text='Confidence level of analysis', max_length=20)),
+                ('primary_category', models.CharField(choices=[('fake_news', 'Fake News'), ('propaganda', 'Propaganda'), ('spam', 'Spam'), ('satire', 'Satire'), ('misleading', 'Misleading'), ('deepfake', 'Deepfake'), ('manipulated_image', 'Manipulated Image'), ('manipulated_video', 'Manipulated Video'), ('accurate', 'Accurate'), ('unverifiable', 'Unverifiable'), ('other', 'Other')], help_text='Primary misinformation category', max_length=50)),
+                ('secondary_categories', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=50), blank=True, default=list, help_text='Secondary categories', size=None)),
+                ('explanation', models.TextField(help_text='Human-readable explanation of result')),
+                ('explanation_nepali', models.TextField(blank=True, help_text='Explanation in Nepali', null=True)),
+                ('explanation_hindi', models.TextField(blank=True, help_text='Explanation in Hindi', null=True)),
+                ('key_findings', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, help_text='Key findings from analysis', size=None)),
+                ('supporting_evidence', django.contrib.postgres.fields.ArrayField(base_field=models.URLField(), blank=True, default=list, help_text='Links to supporting evidence', size=None)),
+                ('fact_check_sources', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, help_text='Fact-checking sources referenced', size=None)),
+                ('text_analysis_score', models.FloatField(blank=True, help_text='Text analysis score (0-100)', null=True)),
+                ('image_analysis_score', models.FloatField(blank=True, help_text='Image analysis score (0-100)', null=True)),
+                ('video_analysis_score', models.FloatField(blank=True, help_text='Video analysis score (0-100)', null=True)),
+                ('source_credibility_score', models.FloatField(blank=True, help_text='Source credibility score (0-100)', null=True)),
+                ('source_url', models.URLField(blank=True, help_text='URL of verified/checked source', null=True)),
+                ('similar_articles', django.contrib.postgres.fields.ArrayField(base_field=models.URLField(), blank=True, default=list, help_text='Similar/related articles found', size=None)),
+                ('model_used', models.CharField(help_text='AI model used for analysis', max_length=255)),
+                ('model_version', models.CharField(help_text='Version of AI model', max_length=50)),
+                ('stage_timings', models.JSONField(blank=True, default=dict, help_text='Milliseconds spent in each analysis stage, e.g. {"fetch": 420, "inference": 85}')),
+                ('analysis_duration_ms', models.PositiveIntegerField(blank=True, help_text='Milliseconds from analysis start to notification, excluding queue wait', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('submission', models.OneToOneField(help_text='Submission being verified', on_delete=django.db.models.deletion.CASCADE, related_name='verification_result', to='submissions.submission')),
+            ],
+            options={
+                'db_table': 'verification_result',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VerificationHistory',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('reason_for_reanalysis', models.TextField(help_text='Reason for re-analysis')),
+                ('score_change', models.FloatField(help_text='Change in misinformation score')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('new_result', models.ForeignKey(blank=True, help_text='New verification result', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='submissions.verificationresult')),
+                ('previous_result', models.ForeignKey(blank=True, help_text='Previous verification result', null=True, on_delete=django.db.models.deletion.SET_NULL, to='submissions.verificationresult')),
+                ('requested_by', models.ForeignKey(help_text='User who requested re-analysis', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('submission', models.ForeignKey(help_text='Submission being re-verified', on_delete=django.db.models.deletion.CASCADE, related_name='verification_history', to='submissions.submission')),
+            ],
+            options={
+                'db_table': 'verification_history',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='submissionstatistic',
+            constraint=models.UniqueConstraint(fields=('submission_type', 'language', 'status', 'is_flagged'), name='submission_statistic_unique_key'),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='user',
+            field=models.ForeignKey(help_text='User who submitted', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='submissions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='verified_by',
+            field=models.ForeignKey(blank=True, help_text='User who verified submission', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='verified_submissions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='sourcedatabase',
+            name='added_by',
+            field=models.ForeignKey(blank=True, help_text='User who added source', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='scrapedcontent',
+            name='submission',
+            field=models.OneToOneField(blank=True, help_text='Associated submission', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='scraped_content', to='submissions.submission'),
+        ),
+        migrations.AddIndex(
+            model_name='verificationresult',
+            index=models.Index(fields=['created_at', 'id'], name='verificatio_created_5e1551_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verificationresult',
+            index=models.Index(fields=['primary_category'], name='verificatio_primary_a59f71_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verificationresult',
+            index=models.Index(fields=['misinformation_score'], name='verificatio_misinfo_2244b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='submission_user_id_4f6be9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['created_at', 'id'], name='submission_created_2fea04_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(condition=models.Q(('is_flagged', False), ('status', 'completed')), fields=['created_at', 'id'], name='submission_public_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['status'], name='submission_status_81973f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['submission_type'], name='submission_submiss_19cd91_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['language'], name='submission_languag_27a27f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['is_flagged'], name='submission_is_flag_2f1e7d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['content_hash', 'created_at'], name='submission_content_2de777_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='submission_search_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='sourcedatabase',
+            unique_together={('name', 'url')},
+        ),
+    ]
@@ -0,0 +1,57 @@
+"""
+Create the SQLite full-text shadow table and index existing submissions.
+
+Submissions saved before search was added have no search vector (or no
+row in the shadow table) and would never match a search. The SQL is
+frozen here rather than taken from satyacheck.apps.submissions.search so
+this migration keeps doing the same thing as that module changes.
+"""
+
+from django.db import migrations
+
+FTS_TABLE = 'submission_fts'
+
+# search.SEARCH_CONFIGS and SEARCH_WEIGHTS at the time of this migration
+SEARCH_CONFIG_SQL = "(CASE language WHEN 'en' THEN 'english' ELSE 'simple' END)::regconfig"
+
+BACKFILL_SEARCH_VECTOR_SQL = f"""
+UPDATE submission SET search_vector =
+    setweight(to_tsvector({SEARCH_CONFIG_SQL}, COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector({SEARCH_CONFIG_SQL}, COALESCE(description, '')), 'B') ||
+    setweight(to_tsvector({SEARCH_CONFIG_SQL}, COALESCE(text_content, '')), 'C')
+WHERE search_vector IS NULL
+"""
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(BACKFILL_SEARCH_VECTOR_SQL)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"submission_id UNINDEXED, title, description, text_content, tokenize='unicode61')"
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (submission_id, title, description, text_content) "
+                f"SELECT id, COALESCE(title, ''), COALESCE(description, ''), COALESCE(text_content, '') "
+                f"FROM submission WHERE id NOT IN (SELECT submission_id FROM {FTS_TABLE})"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
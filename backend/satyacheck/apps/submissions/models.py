@@ -5,7 +5,10 @@ Handles all types of submissions: text, images, videos, audio, links.
 
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from satyacheck.apps.users.models import User
+import hashlib
 import uuid
 import os
 
@@ -157,20 +160,79 @@ class Submission(models.Model):
     analyzed_at = models.DateTimeField(blank=True, null=True)
     verified_at = models.DateTimeField(blank=True, null=True)
     
+    # Identical content shares a hash (used to coalesce analysis)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text='SHA-256 of normalized content (text and link submissions)'
+    )
+    
+    # Full-text search (maintained by satyacheck.apps.submissions.search)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Weighted full-text search vector'
+    )
+    
     class Meta:
         db_table = 'submission'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', 'created_at', 'id']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(status='completed', is_flagged=False),
+                name='submission_public_feed_idx'
+            ),
             models.Index(fields=['status']),
             models.Index(fields=['submission_type']),
             models.Index(fields=['language']),
             models.Index(fields=['is_flagged']),
+            models.Index(fields=['content_hash', 'created_at']),
+            GinIndex(fields=['search_vector'], name='submission_search_idx'),
         ]
     
+    # Statistic dimensions as last loaded or saved, see statistics.py
+    _statistic_key = None
+    
     def __str__(self):
         return f"{self.title} ({self.submission_type})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded statistic dimensions so saves can move counters."""
+        instance = super().from_db(db, field_names, values)
+        if all(field in field_names for field in SubmissionStatistic.DIMENSIONS):
+            instance._statistic_key = instance.get_statistic_key()
+        return instance
+    
+    def get_statistic_key(self):
+        """Get the (type, language, status, flagged) counter this submission falls in."""
+        return tuple(getattr(self, field) for field in SubmissionStatistic.DIMENSIONS)
+    
+    def save(self, *args, **kwargs):
+        """Save, keeping content_hash in step with the content."""
+        self.content_hash = self.compute_content_hash()
+        super().save(*args, **kwargs)
+    
+    def compute_content_hash(self):
+        """
+        Hash identifying identical content, or None if not applicable.
+        Text is whitespace-normalized; file uploads are not hashed.
+        """
+        if self.submission_type == 'text' and self.text_content:
+            content = ' '.join(self.text_content.split())
+        elif self.submission_type == 'link' and self.source_url:
+            content = self.source_url.strip()
+        else:
+            return None
+        
+        key = f'{self.submission_type}:{self.language}:{content}'
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
     def get_display_name(self):
         """Get display name (user or anonymous)."""
         if self.is_anonymous:
@@ -180,14 +242,14 @@ class Submission(models.Model):
     def mark_analyzing(self):
         """Mark submission as being analyzed."""
         self.status = 'analyzing'
-        self.save(update_fields=['status'])
+        self.save(update_fields=['status', 'updated_at'])
     
     def mark_completed(self):
         """Mark submission as completed."""
         from django.utils import timezone
         self.status = 'completed'
         self.analyzed_at = timezone.now()
-        self.save(update_fields=['status', 'analyzed_at'])
+        self.save(update_fields=['status', 'analyzed_at', 'updated_at'])
 
 
 class VerificationResult(models.Model):
@@ -332,6 +394,18 @@ class VerificationResult(models.Model):
         help_text='Version of AI model'
     )
     
+    # Analysis Timing (see satyacheck.services.stage_timing)
+    stage_timings = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Milliseconds spent in each analysis stage, e.g. {"fetch": 420, "inference": 85}'
+    )
+    analysis_duration_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Milliseconds from analysis start to notification, excluding queue wait'
+    )
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -340,6 +414,7 @@ class VerificationResult(models.Model):
         db_table = 'verification_result'
         ordering = ['-created_at']
         indexes = [
+            models.Index(fields=['created_at', 'id']),
             models.Index(fields=['primary_category']),
             models.Index(fields=['misinformation_score']),
         ]
@@ -548,3 +623,37 @@ class ScrapedContent(models.Model):
     
     def __str__(self):
         return f"{self.title} ({self.domain})"
+
+
+class SubmissionStatistic(models.Model):
+    """
+    Materialized submission counts per (type, language, status, flagged).
+    Kept current by satyacheck.apps.submissions.statistics and rebuilt
+    periodically, so statistics endpoints never scan the submission table.
+    """
+    
+    DIMENSIONS = ('submission_type', 'language', 'status', 'is_flagged')
+    
+    submission_type = models.CharField(max_length=20, choices=Submission.SUBMISSION_TYPE_CHOICES)
+    language = models.CharField(max_length=20, choices=Submission.LANGUAGE_CHOICES)
+    status = models.CharField(max_length=20, choices=Submission.STATUS_CHOICES)
+    is_flagged = models.BooleanField(default=False)
+    count = models.BigIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'submission_statistic'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['submission_type', 'language', 'status', 'is_flagged'],
+                name='submission_statistic_unique_key'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.submission_type}/{self.language}/{self.status}: {self.count}"
+    
+    def get_key(self):
+        """Get the dimension tuple this counter is keyed on."""
+        return tuple(getattr(self, field) for field in self.DIMENSIONS)
@@ -0,0 +1,211 @@
+"""
+Full-text search for submissions.
+On PostgreSQL, searches the GIN-indexed search_vector column.
+On SQLite, searches an FTS5 shadow table kept in sync with the submission table.
+
+Both are created and back-filled by migration 0002; `manage.py
+index_submissions` indexes anything missed and --rebuild re-indexes all.
+"""
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, CharField, F, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+import logging
+import uuid
+
+from .models import Submission
+
+logger = logging.getLogger('satyacheck')
+
+# PostgreSQL ships no Nepali or Hindi stemmer; 'simple' indexes them unstemmed
+SEARCH_CONFIGS = {
+    'en': 'english',
+    'ne': 'simple',
+    'hi': 'simple',
+}
+DEFAULT_SEARCH_CONFIG = 'simple'
+
+SEARCH_FIELDS = ('title', 'description', 'text_content')
+SEARCH_WEIGHTS = {'title': 'A', 'description': 'B', 'text_content': 'C'}
+
+FTS_TABLE = 'submission_fts'
+
+# Submissions indexed per statement by backfill_search_index()
+INDEX_BATCH_SIZE = 500
+
+
+def _search_config():
+    """Per-row text search config, chosen from the submission language."""
+    return Case(
+        *[When(language=code, then=Value(config)) for code, config in SEARCH_CONFIGS.items()],
+        default=Value(DEFAULT_SEARCH_CONFIG),
+        output_field=CharField()
+    )
+
+
+def _search_vector():
+    """Weighted search vector over title, description and text content."""
+    config = _search_config()
+    vector = None
+    for field in SEARCH_FIELDS:
+        part = SearchVector(field, weight=SEARCH_WEIGHTS[field], config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def _unindexed():
+    """Get the IDs of submissions missing from the search index."""
+    if connection.vendor == 'postgresql':
+        return Submission.objects.filter(search_vector__isnull=True).values_list('id', flat=True)
+
+    return Submission.objects.exclude(
+        id__in=RawSQL(f"SELECT submission_id FROM {FTS_TABLE}", [])
+    ).values_list('id', flat=True)
+
+
+def backfill_search_index(rebuild=False):
+    """
+    Index submissions in batches of INDEX_BATCH_SIZE: those missing from
+    the index, or every submission if rebuild. Returns the number indexed.
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return 0
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if rebuild:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            else:
+                # Rows of submissions deleted while the index was not maintained
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE submission_id NOT IN "
+                    f"(SELECT id FROM {Submission._meta.db_table})"
+                )
+
+    if rebuild:
+        submission_ids = Submission.objects.values_list('id', flat=True)
+    else:
+        submission_ids = _unindexed()
+
+    submission_ids = list(submission_ids.order_by('id'))
+    for start in range(0, len(submission_ids), INDEX_BATCH_SIZE):
+        index_submissions(submission_ids[start:start + INDEX_BATCH_SIZE])
+    return len(submission_ids)
+
+
+def _db_id(submission_id):
+    """Submission ID as stored in the submission table's id column."""
+    return Submission._meta.pk.get_db_prep_value(submission_id, connection)
+
+
+def index_submissions(submission_ids):
+    """
+    Refresh the search index for the given submissions.
+    Called after saves that touch searchable fields and after bulk inserts.
+    """
+    submission_ids = list(submission_ids)
+    if not submission_ids:
+        return
+
+    if connection.vendor == 'postgresql':
+        Submission.objects.filter(id__in=submission_ids).update(search_vector=_search_vector())
+    elif connection.vendor == 'sqlite':
+        rows = Submission.objects.filter(id__in=submission_ids).values_list('id', *SEARCH_FIELDS)
+        placeholders = ', '.join(['%s'] * len(submission_ids))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE submission_id IN ({placeholders})",
+                [_db_id(submission_id) for submission_id in submission_ids]
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (submission_id, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s, %s, %s, %s)",
+                [(_db_id(row[0]),) + tuple(value or '' for value in row[1:]) for row in rows]
+            )
+
+
+def unindex_submission(submission_id):
+    """Remove a deleted submission from the SQLite shadow table."""
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE submission_id = %s",
+            [_db_id(submission_id)]
+        )
+
+
+def search_submissions(queryset, terms):
+    """
+    Filter queryset to submissions matching terms, annotated with search_rank.
+    Higher search_rank means a better match.
+    """
+    if connection.vendor == 'postgresql':
+        query = None
+        for config in sorted(set(SEARCH_CONFIGS.values()) | {DEFAULT_SEARCH_CONFIG}):
+            part = SearchQuery(terms, config=config, search_type='websearch')
+            query = part if query is None else query | part
+
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+
+    if connection.vendor == 'sqlite':
+        return _search_sqlite(queryset, terms)
+
+    # Other backends: fall back to substring matching
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': terms})
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def _search_sqlite(queryset, terms):
+    """
+    Search the FTS5 shadow table and rank by bm25. Matches are limited to
+    queryset's rows before SEARCH_MAX_RESULTS is applied, so a user's own
+    matches are not crowded out by other users' submissions.
+    """
+    # Quote each term so user input is never parsed as FTS5 syntax
+    match = ' '.join('"%s"' % term.replace('"', '""') for term in terms.split())
+    scope_sql, scope_params = queryset.order_by().values('id').query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT submission_id, bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND submission_id IN ({scope_sql}) "
+            f"ORDER BY bm25({FTS_TABLE}) LIMIT %s",
+            [match, *scope_params, settings.SEARCH_MAX_RESULTS]
+        )
+        # bm25 is lower for better matches; negate so higher ranks first
+        ranks = {uuid.UUID(submission_id): -score for submission_id, score in cursor.fetchall()}
+
+    if not ranks:
+        return queryset.none()
+
+    return queryset.filter(id__in=ranks.keys()).annotate(
+        search_rank=Case(
+            *[When(id=submission_id, then=Value(rank)) for submission_id, rank in ranks.items()],
+            output_field=FloatField()
+        )
+    )
+
+
+class SubmissionSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by the full-text index instead of icontains scans.
+    Accepts the same ?search= parameter as DRF's SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter and rank submissions by the search terms."""
+        terms = ' '.join(self.get_search_terms(request))
+        if not terms:
+            return queryset
+
+        return search_submissions(queryset, terms)
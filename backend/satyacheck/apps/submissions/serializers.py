@@ -3,7 +3,9 @@ Serializers for submission and verification models.
 """
 
 from rest_framework import serializers
+from django.conf import settings
 from .models import Submission, VerificationResult, ScrapedContent, SourceDatabase
+from satyacheck.apps.users.models import User
 from satyacheck.apps.users.serializers import UserSerializer
 
 
@@ -53,10 +55,12 @@ class VerificationResultSerializer(serializers.ModelSerializer):
             'fact_check_sources', 'text_analysis_score', 'image_analysis_score',
             'video_analysis_score', 'source_credibility_score', 'source_url',
             'similar_articles', 'model_used', 'model_version',
+            'stage_timings', 'analysis_duration_ms',
             'risk_level', 'recommendation', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'created_at', 'updated_at', 'risk_level', 'recommendation'
+            'id', 'created_at', 'updated_at', 'risk_level', 'recommendation',
+            'stage_timings', 'analysis_duration_ms'
         ]
     
     def get_risk_level(self, obj):
@@ -95,6 +99,122 @@ class SubmissionListSerializer(serializers.ModelSerializer):
         return obj.get_display_name()
 
 
+class SubmissionListValuesSerializer:
+    """
+    Read-only fast path producing the same output as SubmissionListSerializer.
+    Works on .values() rows (see `fields`) with precomputed choice labels,
+    so no model instances or per-row field objects are created.
+    """
+    
+    user_fields = [
+        'id', 'username', 'email', 'first_name', 'last_name', 'phone', 'role',
+        'bio', 'location', 'organization', 'profile_picture', 'is_verified',
+        'is_phone_verified', 'is_identity_verified', 'two_factor_enabled',
+        'submission_count', 'created_at', 'updated_at'
+    ]
+    
+    fields = [
+        'id', 'user_id', 'title', 'submission_type', 'description', 'status',
+        'language', 'is_anonymous', 'is_flagged', 'created_at', 'updated_at',
+        'analyzed_at'
+    ] + [f'user__{field}' for field in user_fields]
+    
+    submission_type_labels = {key: str(label) for key, label in Submission.SUBMISSION_TYPE_CHOICES}
+    status_labels = {key: str(label) for key, label in Submission.STATUS_CHOICES}
+    language_labels = {key: str(label) for key, label in Submission.LANGUAGE_CHOICES}
+    role_labels = {key: str(label) for key, label in User.ROLE_CHOICES}
+    
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+        self._datetime_field = serializers.DateTimeField()
+        self._profile_picture_storage = User._meta.get_field('profile_picture').storage
+    
+    @property
+    def data(self):
+        """Serialize all rows."""
+        return [self.to_representation(row) for row in self.rows]
+    
+    def format_datetime(self, value):
+        """Format a datetime exactly as DRF's DateTimeField does."""
+        if value is None:
+            return None
+        return self._datetime_field.to_representation(value)
+    
+    def get_profile_picture_url(self, name):
+        """Build the profile picture URL exactly as DRF's ImageField does."""
+        if not name:
+            return None
+        url = self._profile_picture_storage.url(name)
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    
+    def get_user(self, row):
+        """Serialize the nested user as UserSerializer would."""
+        if row['user_id'] is None:
+            return None
+        
+        role = row['user__role']
+        return {
+            'id': str(row['user__id']),
+            'username': row['user__username'],
+            'email': row['user__email'],
+            'first_name': row['user__first_name'],
+            'last_name': row['user__last_name'],
+            'phone': row['user__phone'],
+            'role': role,
+            'role_display': self.role_labels.get(role, role),
+            'is_moderator': role in User.MODERATOR_ROLES,
+            'bio': row['user__bio'],
+            'location': row['user__location'],
+            'organization': row['user__organization'],
+            'profile_picture': self.get_profile_picture_url(row['user__profile_picture']),
+            'is_verified': row['user__is_verified'],
+            'is_phone_verified': row['user__is_phone_verified'],
+            'is_identity_verified': row['user__is_identity_verified'],
+            'two_factor_enabled': row['user__two_factor_enabled'],
+            'submission_count': row['user__submission_count'],
+            'created_at': self.format_datetime(row['user__created_at']),
+            'updated_at': self.format_datetime(row['user__updated_at']),
+        }
+    
+    def get_display_name(self, row):
+        """Same rules as Submission.get_display_name."""
+        if row['is_anonymous']:
+            return "Anonymous"
+        if row['user_id'] is None:
+            return "Unknown"
+        full_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+        return full_name or row['user__username']
+    
+    def to_representation(self, row):
+        """Serialize one values() row."""
+        submission_type = row['submission_type']
+        status = row['status']
+        language = row['language']
+        
+        return {
+            'id': str(row['id']),
+            'user': self.get_user(row),
+            'display_name': self.get_display_name(row),
+            'title': row['title'],
+            'submission_type': submission_type,
+            'submission_type_display': self.submission_type_labels.get(submission_type, submission_type),
+            'description': row['description'],
+            'status': status,
+            'status_display': self.status_labels.get(status, status),
+            'language': language,
+            'language_display': self.language_labels.get(language, language),
+            'is_anonymous': row['is_anonymous'],
+            'is_flagged': row['is_flagged'],
+            'created_at': self.format_datetime(row['created_at']),
+            'updated_at': self.format_datetime(row['updated_at']),
+            'analyzed_at': self.format_datetime(row['analyzed_at']),
+        }
+
+
 class SubmissionDetailSerializer(serializers.ModelSerializer):
     """Serializer for detailed submission data."""
     
@@ -181,6 +301,44 @@ class SubmissionCreateSerializer(serializers.ModelSerializer):
         return submission
 
 
+class BulkSubmissionItemSerializer(serializers.ModelSerializer):
+    """Serializer for a single item of a bulk submission (text or link only)."""
+    
+    submission_type = serializers.ChoiceField(choices=['text', 'link'])
+    
+    class Meta:
+        model = Submission
+        fields = [
+            'title', 'description', 'submission_type', 'text_content',
+            'source_url', 'language', 'location', 'tags', 'is_anonymous'
+        ]
+    
+    def validate(self, data):
+        """Validate content is present for the submission type."""
+        if data['submission_type'] == 'text' and not data.get('text_content'):
+            raise serializers.ValidationError(
+                {'text_content': 'Text content is required for text submissions.'}
+            )
+        elif data['submission_type'] == 'link' and not data.get('source_url'):
+            raise serializers.ValidationError(
+                {'source_url': 'URL is required for link submissions.'}
+            )
+        
+        return data
+
+
+class BulkSubmissionCreateSerializer(serializers.Serializer):
+    """Serializer for bulk submission ingestion."""
+    
+    # The length limit is checked before any item is validated
+    submissions = BulkSubmissionItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.BULK_SUBMISSION_MAX_ITEMS,
+        help_text='Submissions to ingest'
+    )
+
+
 class SubmissionUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating submissions."""
     
@@ -207,3 +365,8 @@ class BulkSubmissionSerializer(serializers.Serializer):
         allow_blank=True,
         help_text='Reason for action'
     )
+    export_format = serializers.ChoiceField(
+        choices=['csv', 'jsonl', 'parquet'],
+        default='csv',
+        help_text='File format for the export action'
+    )
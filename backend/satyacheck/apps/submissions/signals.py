@@ -0,0 +1,47 @@
+"""
+Submission model signals.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Submission
+from .search import SEARCH_FIELDS, index_submissions, unindex_submission
+from .statistics import DIMENSIONS, record_change
+
+SEARCH_SOURCE_FIELDS = set(SEARCH_FIELDS) | {'language'}
+
+
+@receiver(post_save, sender=Submission)
+def update_search_index(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the full-text index when searchable fields are saved."""
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    
+    index_submissions([instance.pk])
+
+
+@receiver(post_save, sender=Submission)
+def update_submission_statistics(sender, instance, created, update_fields=None, **kwargs):
+    """Move statistic counters when a submission is created or re-categorized."""
+    new_key = instance.get_statistic_key()
+    
+    if created:
+        record_change(None, new_key)
+    elif update_fields is None or set(DIMENSIONS).intersection(update_fields):
+        # Instances loaded without all dimensions are left to the periodic rebuild
+        if instance._statistic_key is not None:
+            record_change(instance._statistic_key, new_key)
+    
+    instance._statistic_key = new_key
+
+
+@receiver(post_delete, sender=Submission)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop deleted submissions from the full-text index."""
+    unindex_submission(instance.pk)
+
+
+@receiver(post_delete, sender=Submission)
+def remove_from_statistics(sender, instance, **kwargs):
+    """Decrement the counter a deleted submission was counted in."""
+    record_change(instance._statistic_key or instance.get_statistic_key(), None)
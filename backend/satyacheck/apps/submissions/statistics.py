@@ -0,0 +1,152 @@
+"""
+Materialized submission statistics.
+Counters in SubmissionStatistic move with every create, status change,
+flag and delete, and rebuild_statistics() re-derives them from the
+submission table to correct any drift.
+"""
+
+from collections import Counter
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+import logging
+
+from .models import Submission, SubmissionStatistic
+
+logger = logging.getLogger('satyacheck')
+
+DIMENSIONS = SubmissionStatistic.DIMENSIONS
+
+
+def apply_deltas(deltas):
+    """Apply {statistic key: delta} changes to the counters table."""
+    now = timezone.now()
+    
+    # Fixed key order so concurrent writers lock rows in the same order
+    for key, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        
+        dimensions = dict(zip(DIMENSIONS, key))
+        counters = SubmissionStatistic.objects.filter(**dimensions)
+        if counters.update(count=F('count') + delta, updated_at=now):
+            continue
+        
+        try:
+            with transaction.atomic():
+                SubmissionStatistic.objects.create(count=delta, **dimensions)
+        except IntegrityError:
+            # Another writer created the row first
+            counters.update(count=F('count') + delta, updated_at=now)
+
+
+def record_change(old_key, new_key):
+    """Move one submission from old_key to new_key (either may be None)."""
+    if old_key == new_key:
+        return
+    
+    deltas = Counter()
+    if old_key is not None:
+        deltas[old_key] -= 1
+    if new_key is not None:
+        deltas[new_key] += 1
+    apply_deltas(deltas)
+
+
+def record_created(submissions):
+    """Count submissions inserted with bulk_create, which sends no signals."""
+    apply_deltas(Counter(submission.get_statistic_key() for submission in submissions))
+
+
+def track_update(queryset, **changes):
+    """
+    queryset.update(**changes) that also moves the affected counters.
+    Use this instead of update() whenever a statistic dimension changes.
+    """
+    changes.setdefault('updated_at', timezone.now())
+    if not set(DIMENSIONS).intersection(changes):
+        return queryset.update(**changes)
+    
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().values_list(*DIMENSIONS))
+        updated = queryset.update(**changes)
+        
+        deltas = Counter()
+        for key in rows:
+            deltas[key] -= 1
+            deltas[tuple(changes.get(field, value) for field, value in zip(DIMENSIONS, key))] += 1
+        apply_deltas(deltas)
+    
+    return updated
+
+
+def rebuild_statistics():
+    """
+    Recompute all counters from the submission table.
+    Counter rows are locked and updated in place, so increments that
+    commit while the rebuild runs are applied on top rather than lost.
+    """
+    with transaction.atomic():
+        counters = {
+            counter.get_key(): counter
+            for counter in SubmissionStatistic.objects.select_for_update()
+        }
+        actual = {
+            tuple(row[:-1]): row[-1]
+            for row in Submission.objects.order_by().values_list(*DIMENSIONS).annotate(count=Count('id'))
+        }
+        
+        now = timezone.now()
+        changed = []
+        for key, counter in counters.items():
+            count = actual.pop(key, 0)
+            if counter.count != count:
+                changed.append(key)
+            counter.count = count
+            counter.updated_at = now
+        
+        SubmissionStatistic.objects.bulk_update(counters.values(), ['count', 'updated_at'])
+        SubmissionStatistic.objects.bulk_create([
+            SubmissionStatistic(count=count, **dict(zip(DIMENSIONS, key)))
+            for key, count in actual.items()
+        ])
+    
+    if changed or actual:
+        logger.warning(f"Submission statistics drifted and were corrected: {len(changed) + len(actual)} counters")
+    
+    return len(changed) + len(actual)
+
+
+def get_statistics():
+    """
+    Get submission totals from the counters table.
+    Reads one row per dimension combination, independent of submission volume.
+    """
+    counters = list(SubmissionStatistic.objects.all())
+    if not counters and Submission.objects.exists():
+        # First read after deploy: materialize from existing data
+        rebuild_statistics()
+        counters = list(SubmissionStatistic.objects.all())
+    
+    stats = {
+        'total': 0,
+        'flagged': 0,
+        'by_type': Counter(),
+        'by_language': Counter(),
+        'by_status': Counter(),
+        'updated_at': max((counter.updated_at for counter in counters), default=None),
+    }
+    for counter in counters:
+        if counter.count <= 0:
+            continue
+        stats['total'] += counter.count
+        stats['by_type'][counter.submission_type] += counter.count
+        stats['by_language'][counter.language] += counter.count
+        stats['by_status'][counter.status] += counter.count
+        if counter.is_flagged:
+            stats['flagged'] += counter.count
+    
+    for breakdown in ('by_type', 'by_language', 'by_status'):
+        stats[breakdown] = dict(stats[breakdown])
+    
+    return stats
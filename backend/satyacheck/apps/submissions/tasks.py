@@ -0,0 +1,21 @@
+"""
+Celery tasks for submissions.
+"""
+
+from celery import shared_task
+import logging
+
+from .statistics import rebuild_statistics
+
+logger = logging.getLogger('satyacheck')
+
+
+@shared_task
+def rebuild_submission_statistics():
+    """
+    Re-derive the materialized submission counters.
+    Scheduled by CELERY_BEAT_SCHEDULE to correct any drift.
+    """
+    corrected = rebuild_statistics()
+    logger.info(f"Submission statistics rebuilt ({corrected} counters corrected)")
+    return {'success': True, 'corrected': corrected}
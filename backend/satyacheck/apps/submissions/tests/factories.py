@@ -0,0 +1,31 @@
+"""
+Model factories for submissions.
+"""
+
+import factory
+
+from satyacheck.apps.submissions.models import Submission, VerificationResult
+from satyacheck.apps.users.tests.factories import UserFactory
+
+
+class SubmissionFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Submission
+
+    user = factory.SubFactory(UserFactory)
+    submission_type = 'text'
+    title = factory.Sequence(lambda n: f'Submission {n}')
+    text_content = factory.Sequence(lambda n: f'Claim number {n} about the flood relief fund')
+    language = 'en'
+    status = 'completed'
+
+
+class VerificationResultFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = VerificationResult
+
+    submission = factory.SubFactory(SubmissionFactory)
+    misinformation_score = 80
+    confidence_level = 'high'
+    primary_category = 'false'
+    explanation = 'Contradicted by official sources.'
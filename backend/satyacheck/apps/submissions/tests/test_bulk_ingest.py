@@ -0,0 +1,61 @@
+"""
+Tests for bulk submission ingestion.
+"""
+
+import pytest
+
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.search import search_submissions
+
+URL = '/api/v1/submissions/bulk_ingest/'
+
+pytestmark = pytest.mark.django_db
+
+
+def _items(count):
+    return [
+        {'submission_type': 'text', 'title': f'Item {i}', 'text_content': f'bulk claim {i}'}
+        for i in range(count)
+    ]
+
+
+def test_inserts_all_items_and_queues_analysis_once(user_client, user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = user_client.post(URL, {'submissions': _items(3)}, format='json')
+
+    assert response.status_code == 201
+    assert response.data['count'] == 3
+    submissions = Submission.objects.filter(user=user)
+    assert submissions.count() == 3
+    assert all(submission.status == 'analyzing' and submission.content_hash for submission in submissions)
+
+    user.refresh_from_db()
+    assert user.submission_count == 3
+    # Activity for the batch plus one analysis dispatch
+    assert len(callbacks) == 2
+
+
+def test_bulk_inserted_submissions_are_searchable(user_client, user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks():
+        user_client.post(URL, {'submissions': _items(2)}, format='json')
+
+    assert search_submissions(Submission.objects.all(), 'bulk claim').count() == 2
+
+
+def test_rejects_requests_over_the_item_limit_before_validating_items(user_client, settings):
+    items = [{'submission_type': 'image'}] * (settings.BULK_SUBMISSION_MAX_ITEMS + 1)
+
+    response = user_client.post(URL, {'submissions': items}, format='json')
+
+    assert response.status_code == 400
+    assert 'no more than' in str(response.data['submissions'])
+    assert not Submission.objects.exists()
+
+
+def test_rejects_unsupported_types_without_inserting(user_client):
+    items = _items(1) + [{'submission_type': 'image', 'title': 'Photo'}]
+
+    response = user_client.post(URL, {'submissions': items}, format='json')
+
+    assert response.status_code == 400
+    assert not Submission.objects.exists()
@@ -0,0 +1,51 @@
+"""
+Tests for the submission create path.
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.users.models import User
+
+URL = '/api/v1/submissions/'
+
+pytestmark = pytest.mark.django_db
+
+PAYLOAD = {'submission_type': 'text', 'title': 'Flood relief', 'text_content': 'Relief funds were diverted'}
+
+
+def test_inserts_as_analyzing_and_queues_analysis_on_commit(user_client, user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = user_client.post(URL, PAYLOAD, format='json')
+
+    assert response.status_code == 201
+    assert response.data['status'] == 'analyzing'
+    assert Submission.objects.get(pk=response.data['id']).status == 'analyzing'
+    # Nothing is dispatched before the transaction commits; then activity and analysis
+    assert len(callbacks) == 2
+
+
+def test_counter_is_incremented_in_the_database(user_client, user, django_capture_on_commit_callbacks):
+    # Another request counted a submission after this user was cached
+    User.objects.filter(pk=user.pk).update(submission_count=5)
+
+    with django_capture_on_commit_callbacks():
+        user_client.post(URL, PAYLOAD, format='json')
+        user_client.post(URL, PAYLOAD, format='json')
+
+    user.refresh_from_db()
+    assert user.submission_count == 7
+    assert user.last_submission_date is not None
+
+
+def test_writes_the_submission_once(user_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(), CaptureQueriesContext(connection) as queries:
+        user_client.post(URL, PAYLOAD, format='json')
+
+    writes = [query['sql'] for query in queries if query['sql'].startswith(('INSERT', 'UPDATE'))]
+    submission_writes = [sql for sql in writes if sql.startswith(('INSERT INTO "submission"', 'UPDATE "submission"'))]
+    # The insert plus the search vector; no follow-up status save
+    assert len(submission_writes) == 2
+    assert not any('"status"' in sql for sql in submission_writes if sql.startswith('UPDATE'))
@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from satyacheck.apps.admin_panel import queue
+from satyacheck.apps.submissions.events import (
+    CHANNEL_PREFIX, SubmissionEventHub, issue_ticket, publish_submission_event
+)
+from satyacheck.core.authentication import PrincipalRefreshToken
+from satyacheck.services.redis_client import get_redis
+from .factories import SubmissionFactory, VerificationResultFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def events_url(submission):
+    return f'/api/v1/submissions/{submission.id}/events/'
+
+
+def read_events(url, count=1, on_first=None, **extra):
+    """Open a stream through the ASGI stack and read up to count status events."""
+    async def read():
+        response = await AsyncClient().get(url, **extra)
+        events = []
+        if response.streaming:
+            async for chunk in response.streaming_content:
+                chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+                if not chunk.startswith('event: status'):
+                    continue
+                events.append(json.loads(chunk.split('data: ', 1)[1]))
+                if len(events) == count:
+                    break
+                if on_first is not None and len(events) == 1:
+                    on_first()
+        return response, events
+
+    return async_to_sync(read)()
+
+
+def test_ticket_opens_stream(user_client, user):
+    submission = SubmissionFactory(user=user)
+    VerificationResultFactory(submission=submission)
+
+    response = user_client.post(f'/api/v1/submissions/{submission.id}/events/ticket/')
+    assert response.status_code == 200
+    assert response.data['expires_in'] > 0
+
+    response, events = read_events(f"{events_url(submission)}?ticket={response.data['ticket']}")
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+    assert events[0]['status'] == 'completed'
+    assert events[0]['result']['misinformation_score'] == 80
+
+
+def test_ticket_is_bound_to_its_submission(user):
+    submission = SubmissionFactory(user=user)
+    other = SubmissionFactory(user=user)
+
+    response, events = read_events(f'{events_url(other)}?ticket={issue_ticket(user, submission.id)}')
+
+    assert response.status_code == 401
+    assert events == []
+
+
+def test_expired_ticket_is_rejected(user, settings):
+    settings.SSE_TICKET_MAX_AGE = -1
+    submission = SubmissionFactory(user=user)
+
+    response, _ = read_events(f'{events_url(submission)}?ticket={issue_ticket(user, submission.id)}')
+
+    assert response.status_code == 401
+
+
+def test_access_token_in_query_string_is_not_accepted(user):
+    submission = SubmissionFactory(user=user)
+    token = PrincipalRefreshToken.for_user(user).access_token
+
+    response, _ = read_events(f'{events_url(submission)}?token={token}')
+
+    assert response.status_code == 401
+
+
+def test_no_ticket_for_hidden_submission(user_client):
+    submission = SubmissionFactory(status='analyzing')
+
+    response = user_client.post(f'/api/v1/submissions/{submission.id}/events/ticket/')
+
+    assert response.status_code == 404
+
+
+def test_stream_pushes_published_status(user):
+    submission = SubmissionFactory(user=user, status='analyzing')
+    token = PrincipalRefreshToken.for_user(user).access_token
+
+    response, events = read_events(
+        events_url(submission),
+        count=2,
+        on_first=lambda: publish_submission_event(submission.id, 'completed'),
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == 200
+    assert [event['status'] for event in events] == ['analyzing', 'completed']
+
+
+@pytest.mark.parametrize('action_taken, status', [('approve', 'completed'), ('reject', 'rejected')])
+def test_moderation_decision_publishes_status(moderator, django_capture_on_commit_callbacks, action_taken, status):
+    submission = SubmissionFactory(status='pending')
+    VerificationResultFactory(submission=submission)
+    item = queue.enqueue(submission, 'Flagged by user')
+
+    pubsub = get_redis().pubsub()
+    pubsub.subscribe(f'{CHANNEL_PREFIX}{submission.id}')
+    pubsub.get_message(timeout=1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        queue.complete(item, moderator, action_taken)
+
+    message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+    payload = json.loads(message['data'])
+    assert payload['status'] == status
+    assert ('result' in payload) == (status == 'completed')
+
+
+def full_queue(settings, submission_id):
+    settings.SSE_QUEUE_SIZE = 2
+    hub = SubmissionEventHub()
+    queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+    hub.subscribers[str(submission_id)] = {queue}
+    for status in ('queued', 'analyzing'):
+        hub.dispatch(str(submission_id), json.dumps({'status': status}))
+    return hub, queue
+
+
+def test_full_queue_drops_intermediate_events(settings):
+    hub, queue = full_queue(settings, 'some-id')
+
+    hub.dispatch('some-id', json.dumps({'status': 'analyzing'}))
+
+    assert [json.loads(queue.get_nowait())['status'] for _ in range(queue.qsize())] == ['queued', 'analyzing']
+
+
+def test_full_queue_still_receives_the_terminal_event(settings):
+    hub, queue = full_queue(settings, 'some-id')
+
+    hub.dispatch('some-id', json.dumps({'status': 'completed'}))
+
+    assert [json.loads(queue.get_nowait())['status'] for _ in range(queue.qsize())] == ['analyzing', 'completed']
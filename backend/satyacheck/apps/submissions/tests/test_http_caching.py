@@ -0,0 +1,70 @@
+"""
+Tests for ETag/Last-Modified handling on submission reads.
+"""
+
+import pytest
+
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory, VerificationResultFactory
+
+URL = '/api/v1/submissions/'
+
+pytestmark = pytest.mark.django_db
+
+
+def test_matching_etag_is_not_modified(user_client, user):
+    submission = SubmissionFactory(user=user)
+    response = user_client.get(f'{URL}{submission.id}/')
+
+    repeat = user_client.get(f'{URL}{submission.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+    assert repeat.status_code == 304
+    assert repeat['ETag'] == response['ETag']
+
+
+def test_if_modified_since_is_not_modified(user_client, user):
+    submission = SubmissionFactory(user=user)
+    response = user_client.get(f'{URL}{submission.id}/')
+
+    repeat = user_client.get(f'{URL}{submission.id}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+    assert repeat.status_code == 304
+
+
+def test_update_changes_the_etag(user_client, user):
+    submission = SubmissionFactory(user=user)
+    etag = user_client.get(f'{URL}{submission.id}/')['ETag']
+
+    user_client.patch(f'{URL}{submission.id}/', {'title': 'Corrected title'}, format='json')
+    response = user_client.get(f'{URL}{submission.id}/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert response.data['title'] == 'Corrected title'
+
+
+def test_private_submissions_are_never_answered_from_validators(api_client, authenticate, user):
+    submission = SubmissionFactory(status='analyzing')
+    etag = authenticate(api_client, submission.user).get(f'{URL}{submission.id}/')['ETag']
+
+    response = authenticate(api_client, user).get(f'{URL}{submission.id}/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 404
+
+
+def test_finished_public_results_are_publicly_cacheable(user_client, user):
+    submission = SubmissionFactory(user=user, status='completed')
+    VerificationResultFactory(submission=submission)
+
+    response = user_client.get(f'{URL}{submission.id}/results/')
+
+    assert 'public' in response['Cache-Control']
+    assert 'Authorization' in response['Vary']
+
+
+def test_unfinished_submissions_must_revalidate(user_client, user):
+    submission = SubmissionFactory(user=user, status='analyzing')
+
+    response = user_client.get(f'{URL}{submission.id}/')
+
+    assert 'no-cache' in response['Cache-Control']
+    assert 'private' in response['Cache-Control']
@@ -0,0 +1,105 @@
+"""
+Query budgets for the submission read endpoints.
+
+Each endpoint must serve any number of rows, with every nested relation
+rendered, within a fixed number of queries. A serializer change that
+adds a per-row or lazy query fails here.
+"""
+
+import pytest
+
+from satyacheck.apps.submissions.models import ScrapedContent
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory, VerificationResultFactory
+
+URL = '/api/v1/submissions/'
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def submission(user, moderator):
+    submission = SubmissionFactory(user=user, submission_type='link', source_url='https://example.com/a', verified_by=moderator)
+    VerificationResultFactory(submission=submission)
+    ScrapedContent.objects.create(
+        submission=submission,
+        source_url=submission.source_url,
+        domain='example.com',
+        title='Page',
+        description='Description',
+        main_text='Text',
+    )
+    return submission
+
+
+@pytest.fixture
+def many_submissions(user, moderator):
+    for submission in SubmissionFactory.create_batch(15, user=user, verified_by=moderator):
+        VerificationResultFactory(submission=submission)
+
+
+@pytest.fixture
+def warm(user_client):
+    """Make a first request so per-process state (the ban set) is built."""
+    user_client.get(f'{URL}statistics/')
+
+
+@pytest.mark.parametrize('query, budget', [
+    ('', 1),
+    ('?include_count=true', 2),
+    ('?search=flood', 1),
+    ('?search=flood&include_count=true', 2),
+    ('?status=completed&language=en&ordering=created_at', 1),
+])
+def test_list(user_client, many_submissions, warm, django_assert_max_num_queries, query, budget):
+    with django_assert_max_num_queries(budget):
+        response = user_client.get(f'{URL}{query}')
+
+    assert response.status_code == 200
+    assert len(response.data['results']) == 15
+
+
+def test_list_next_page(user_client, many_submissions, warm, django_assert_max_num_queries):
+    cursor = user_client.get(f'{URL}?page_size=5').data['next']
+
+    with django_assert_max_num_queries(1):
+        response = user_client.get(cursor)
+
+    assert len(response.data['results']) == 5
+
+
+def test_retrieve(user_client, submission, warm, django_assert_max_num_queries):
+    # Cache validators (one query) and the object (one query with every relation joined)
+    with django_assert_max_num_queries(2):
+        response = user_client.get(f'{URL}{submission.id}/')
+
+    assert response.status_code == 200
+    assert response.data['verification_result'] is not None
+    assert response.data['scraped_content'] is not None
+    assert response.data['verified_by'] is not None
+
+
+def test_retrieve_with_cached_validators(user_client, submission, warm, django_assert_max_num_queries):
+    user_client.get(f'{URL}{submission.id}/')
+
+    with django_assert_max_num_queries(1):
+        response = user_client.get(f'{URL}{submission.id}/')
+
+    assert response.status_code == 200
+
+
+def test_retrieve_not_modified(user_client, submission, warm, django_assert_num_queries):
+    etag = user_client.get(f'{URL}{submission.id}/')['ETag']
+
+    with django_assert_num_queries(0):
+        response = user_client.get(f'{URL}{submission.id}/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+
+
+def test_results(user_client, submission, warm, django_assert_max_num_queries):
+    with django_assert_max_num_queries(2):
+        response = user_client.get(f'{URL}{submission.id}/results/')
+
+    assert response.status_code == 200
+    assert response.data['misinformation_score'] == 80
+
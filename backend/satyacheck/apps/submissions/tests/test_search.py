@@ -0,0 +1,58 @@
+"""
+Tests for full-text submission search.
+"""
+
+from django.core.management import call_command
+import io
+import pytest
+
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.search import search_submissions
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory
+
+URL = '/api/v1/submissions/'
+
+pytestmark = pytest.mark.django_db
+
+
+def test_ranks_title_matches_above_body_matches(user_client, user):
+    body = SubmissionFactory(user=user, title='Weather update', text_content='Dam breach rumours spread')
+    title = SubmissionFactory(user=user, title='Dam breach', text_content='Nothing happened')
+
+    response = user_client.get(f'{URL}?search=dam breach')
+
+    assert [row['id'] for row in response.data['results']] == [str(title.id), str(body.id)]
+
+
+def test_english_submissions_match_other_word_forms(user):
+    submission = SubmissionFactory(user=user, title='Voters were bribed', language='en')
+
+    assert list(search_submissions(Submission.objects.all(), 'bribing')) == [submission]
+
+
+def test_search_is_limited_to_visible_submissions(user_client, user):
+    own = SubmissionFactory(user=user, status='analyzing', title='Vaccine rumour')
+    SubmissionFactory(status='analyzing', title='Vaccine rumour')  # someone else's, not public yet
+    public = SubmissionFactory(status='completed', title='Vaccine rumour')
+
+    response = user_client.get(f'{URL}?search=vaccine')
+
+    assert {row['id'] for row in response.data['results']} == {str(own.id), str(public.id)}
+
+
+def test_index_submissions_command_indexes_rows_saved_before_search(user):
+    submission = SubmissionFactory(user=user, title='Fuel price hike')
+    Submission.objects.filter(pk=submission.pk).update(search_vector=None)
+    assert not search_submissions(Submission.objects.all(), 'fuel').exists()
+
+    call_command('index_submissions', stdout=io.StringIO())
+
+    assert list(search_submissions(Submission.objects.all(), 'fuel')) == [submission]
+
+
+def test_saving_other_fields_keeps_the_index(user):
+    submission = SubmissionFactory(user=user, title='Bridge collapse')
+    submission.status = 'completed'
+    submission.save(update_fields=['status'])
+
+    assert search_submissions(Submission.objects.all(), 'bridge').exists()
@@ -0,0 +1,30 @@
+"""
+Tests for the values()-based list serializer.
+"""
+
+from rest_framework.test import APIRequestFactory
+import pytest
+
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.serializers import SubmissionListSerializer, SubmissionListValuesSerializer
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory
+from satyacheck.apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('role', ['user', 'journalist', 'ngo', 'admin'])
+def test_matches_the_model_serializer(role):
+    submission = SubmissionFactory(
+        user=UserFactory(role=role, bio='Reporter', location='Kathmandu'),
+        description='From a forwarded message',
+        language='ne',
+    )
+    context = {'request': APIRequestFactory().get('/api/v1/submissions/')}
+
+    rows = Submission.objects.filter(pk=submission.pk).values(*SubmissionListValuesSerializer.fields)
+    fast = SubmissionListValuesSerializer(rows, context=context).data
+    expected = SubmissionListSerializer(Submission.objects.filter(pk=submission.pk), many=True, context=context).data
+
+    assert fast == [dict(row) for row in expected]
+    assert fast[0]['user']['is_moderator'] == submission.user.is_moderator()
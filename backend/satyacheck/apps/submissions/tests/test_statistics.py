@@ -0,0 +1,71 @@
+"""
+Tests for the materialized submission statistics.
+"""
+
+import pytest
+
+from satyacheck.apps.submissions.models import Submission, SubmissionStatistic
+from satyacheck.apps.submissions.statistics import get_statistics, rebuild_statistics, track_update
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _counts():
+    return {counter.get_key(): counter.count for counter in SubmissionStatistic.objects.all() if counter.count}
+
+
+def _actual():
+    counts = {}
+    for submission in Submission.objects.all():
+        key = submission.get_statistic_key()
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def test_counters_follow_create_save_and_delete(user):
+    first = SubmissionFactory(user=user, status='analyzing')
+    second = SubmissionFactory(user=user, status='analyzing', language='ne')
+
+    first.status = 'completed'
+    first.is_flagged = True
+    first.save()
+    second.delete()
+
+    assert _counts() == _actual()
+    statistics = get_statistics()
+    assert statistics['total'] == 1
+    assert statistics['flagged'] == 1
+    assert statistics['by_status'] == {'completed': 1}
+    assert statistics['updated_at'] is not None
+
+
+def test_track_update_moves_counters_for_queryset_updates(user):
+    SubmissionFactory.create_batch(3, user=user, status='analyzing')
+
+    track_update(Submission.objects.filter(user=user), status='completed')
+
+    assert _counts() == _actual()
+    assert get_statistics()['by_status'] == {'completed': 3}
+
+
+def test_rebuild_corrects_drift(user):
+    SubmissionFactory.create_batch(2, user=user)
+    # A write that bypassed the counters
+    Submission.objects.update(is_flagged=True)
+
+    assert rebuild_statistics() > 0
+    assert _counts() == _actual()
+    assert rebuild_statistics() == 0
+
+
+def test_endpoint_reads_only_the_counters_table(user_client, user, django_assert_num_queries):
+    SubmissionFactory.create_batch(4, user=user)
+    # Warm the per-process ban set, which is built on first use
+    user_client.get('/api/v1/submissions/statistics/')
+
+    with django_assert_num_queries(1):
+        response = user_client.get('/api/v1/submissions/statistics/')
+
+    assert response.data['total_submissions'] == 4
+    assert response.data['updated_at'] is not None
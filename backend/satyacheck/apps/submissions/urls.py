@@ -5,6 +5,7 @@ URL routing for submissions.
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import SubmissionViewSet, VerificationResultViewSet, SourceDatabaseViewSet
+from .events import submission_events
 
 router = DefaultRouter()
 router.register(r'', SubmissionViewSet, basename='submission')
@@ -12,5 +13,6 @@ router.register(r'results', VerificationResultViewSet, basename='verification-re
 router.register(r'sources', SourceDatabaseViewSet, basename='source-database')
 
 urlpatterns = [
+    path('<uuid:pk>/events/', submission_events, name='submission-events'),
     path('', include(router.urls)),
 ]
@@ -8,18 +8,26 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, F
 import logging
 
 from .models import Submission, VerificationResult, SourceDatabase
+from .caching import apply_cache_headers, conditional_response, invalidate_submissions
+from .events import issue_ticket, publish_status_change, publish_submission_event
+from .search import SubmissionSearchFilter, index_submissions
+from .statistics import get_statistics, record_created, track_update
 from .serializers import (
-    SubmissionListSerializer, SubmissionDetailSerializer,
+    SubmissionListSerializer, SubmissionListValuesSerializer, SubmissionDetailSerializer,
     SubmissionCreateSerializer, SubmissionUpdateSerializer,
     VerificationResultSerializer, SourceDatabaseSerializer,
-    BulkSubmissionSerializer
+    BulkSubmissionSerializer, BulkSubmissionCreateSerializer
 )
-from satyacheck.apps.users.models import UserActivity
+from satyacheck.apps.users.activity import build_activity, record_activities, record_activity
+from satyacheck.apps.users.models import User
+from satyacheck.core.pagination import KeysetPagination
 
 logger = logging.getLogger('satyacheck')
 audit_logger = logging.getLogger('satyacheck.audit')
@@ -32,10 +40,11 @@ class SubmissionViewSet(viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, SubmissionSearchFilter, OrderingFilter]
     filterset_fields = ['submission_type', 'language', 'status', 'is_flagged']
     search_fields = ['title', 'description', 'text_content']
-    ordering_fields = ['created_at', 'analyzed_at']
+    ordering_fields = ['created_at']
     ordering = ['-created_at']
     
     def get_queryset(self):
@@ -45,12 +54,30 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         
+        # search_vector is only read by the database
+        queryset = Submission.objects.select_related('user', 'verified_by').defer('search_vector')
+        
+        if self.action in ('retrieve', 'results'):
+            # Reverse one-to-ones rendered by the detail serializers
+            queryset = queryset.select_related('verification_result', 'scraped_content')
+        
         if user.is_admin_user():
-            return Submission.objects.all().select_related('user', 'verified_by')
+            return queryset
         
-        return Submission.objects.filter(
+        return queryset.filter(
             Q(user=user) | Q(status='completed', is_flagged=False)
-        ).select_related('user', 'verified_by')
+        )
+    
+    def get_throttle_cost(self, request):
+        """Charge new submissions by the analysis they will need."""
+        if self.action == 'create':
+            submission_type = request.data.get('submission_type')
+            return settings.THROTTLE_COSTS.get(f'submission_{submission_type}')
+        if self.action == 'bulk_ingest':
+            items = request.data.get('submissions')
+            count = len(items) if isinstance(items, list) else 1
+            return settings.THROTTLE_COSTS['bulk_ingest_item'] * count
+        return None
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -71,45 +98,152 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        submission = serializer.save()
+        now = timezone.now()
         
-        # Update user submission count
-        if request.user.is_authenticated:
-            request.user.submission_count += 1
-            request.user.last_submission_date = timezone.now()
-            request.user.save(update_fields=['submission_count', 'last_submission_date'])
+        with transaction.atomic():
+            # Inserted as 'analyzing' directly; analysis is queued on commit below
+            submission = serializer.save(status='analyzing')
+            
+            # Update user submission count
+            if request.user.is_authenticated:
+                User.objects.filter(pk=request.user.pk).update(
+                    submission_count=F('submission_count') + 1,
+                    last_submission_date=now
+                )
+                request.user.submission_count += 1
+                request.user.last_submission_date = now
+            
+            # Queued until the transaction commits, then written in the background
+            record_activity(
+                request.user,
+                'submission',
+                f'Submitted {submission.submission_type} content: {submission.title}',
+                request,
+                metadata={'submission_id': str(submission.id)}
+            )
+            
+            # Trigger AI analysis (async) once the submission is committed
+            from satyacheck.apps.ai.tasks import analyze_submission
+            submission_id = str(submission.id)
+            transaction.on_commit(lambda: analyze_submission.delay(submission_id))
         
         # Log activity
         audit_logger.info(
             f"Submission created: {submission.id} - Type: {submission.submission_type} - User: {request.user.username if request.user.is_authenticated else 'Anonymous'}"
         )
         
-        UserActivity.objects.create(
-            user=request.user,
-            activity_type='submission',
-            description=f'Submitted {submission.submission_type} content: {submission.title}',
-            ip_address=self._get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            metadata={'submission_id': str(submission.id)}
+        # A new submission has no result or scraped content yet; skip those lookups
+        submission._state.fields_cache['verification_result'] = None
+        submission._state.fields_cache['scraped_content'] = None
+        
+        return Response(
+            SubmissionDetailSerializer(submission).data,
+            status=status.HTTP_201_CREATED
         )
+    
+    @action(detail=False, methods=['post'])
+    def bulk_ingest(self, request):
+        """
+        Ingest many text/link submissions in one request.
+        Rows are inserted with bulk_create and analysis is queued in batches
+        once the transaction commits.
+        POST: /api/v1/submissions/bulk_ingest/
+        """
+        serializer = BulkSubmissionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        now = timezone.now()
+        
+        submissions = [
+            Submission(user=request.user, status='analyzing', **item)
+            for item in serializer.validated_data['submissions']
+        ]
+        for submission in submissions:
+            # bulk_create bypasses Submission.save()
+            submission.content_hash = submission.compute_content_hash()
         
-        # Trigger AI analysis (async)
-        from satyacheck.apps.ai.tasks import analyze_submission
-        analyze_submission.delay(str(submission.id))
+        with transaction.atomic():
+            Submission.objects.bulk_create(
+                submissions,
+                batch_size=settings.BULK_SUBMISSION_INSERT_BATCH_SIZE
+            )
+            index_submissions([submission.id for submission in submissions])
+            record_created(submissions)
+            
+            # Update user submission count
+            User.objects.filter(pk=request.user.pk).update(
+                submission_count=F('submission_count') + len(submissions),
+                last_submission_date=now
+            )
+            
+            # Log activity
+            record_activities(
+                build_activity(
+                    request.user,
+                    'submission',
+                    f'Submitted {submission.submission_type} content: {submission.title}',
+                    request,
+                    metadata={'submission_id': str(submission.id), 'bulk': True}
+                )
+                for submission in submissions
+            )
+            
+            # Trigger batched AI analysis (async) after commit
+            from satyacheck.apps.ai.tasks import dispatch_analysis_batches
+            submission_ids = [submission.id for submission in submissions]
+            transaction.on_commit(lambda: dispatch_analysis_batches(submission_ids))
         
-        submission.status = 'analyzing'
-        submission.save(update_fields=['status'])
+        audit_logger.info(
+            f"Bulk submission ingested: {len(submissions)} items - User: {request.user.username}"
+        )
         
         return Response(
-            SubmissionDetailSerializer(submission).data,
+            {
+                'success': True,
+                'count': len(submissions),
+                'submission_ids': [str(submission_id) for submission_id in submission_ids],
+            },
             status=status.HTTP_201_CREATED
         )
     
+    def perform_update(self, serializer):
+        """Save the update and drop cached validators."""
+        super().perform_update(serializer)
+        invalidate_submissions(serializer.instance.id)
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List submissions.
+        Rows are read with values() and rendered by SubmissionListValuesSerializer,
+        which matches SubmissionListSerializer output without building models.
+        GET: /api/v1/submissions/
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        fields = list(SubmissionListValuesSerializer.fields)
+        if self.paginator.rank_field in queryset.query.annotations:
+            fields.append(self.paginator.rank_field)
+        rows = queryset.values(*fields)
+        
+        page = self.paginate_queryset(rows)
+        serializer = SubmissionListValuesSerializer(
+            page if page is not None else rows,
+            context=self.get_serializer_context()
+        )
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+    
     def retrieve(self, request, *args, **kwargs):
         """
         Get submission details.
         GET: /api/v1/submissions/<id>/
         """
+        not_modified, validators = conditional_response(request, kwargs['pk'], 'detail')
+        if not_modified is not None:
+            return not_modified
+        
         submission = self.get_object()
         
         # Check permissions
@@ -121,7 +255,10 @@ class SubmissionViewSet(viewsets.ModelViewSet):
                 )
         
         serializer = self.get_serializer(submission)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        if validators is not None:
+            apply_cache_headers(response, validators, 'detail')
+        return response
     
     def destroy(self, request, *args, **kwargs):
         """
@@ -139,7 +276,9 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         
         # Soft delete
         submission.status = 'rejected'
-        submission.save(update_fields=['status'])
+        submission.save(update_fields=['status', 'updated_at'])
+        invalidate_submissions(submission.id)
+        publish_submission_event(submission.id, 'rejected')
         
         audit_logger.info(f"Submission deleted: {submission.id} - User: {request.user.username}")
         
@@ -151,6 +290,10 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         Get verification results for a submission.
         GET: /api/v1/submissions/<id>/results/
         """
+        not_modified, validators = conditional_response(request, pk, 'results')
+        if not_modified is not None:
+            return not_modified
+        
         submission = self.get_object()
         
         if not hasattr(submission, 'verification_result'):
@@ -160,7 +303,24 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             )
         
         serializer = VerificationResultSerializer(submission.verification_result)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        if validators is not None and validators['has_result']:
+            apply_cache_headers(response, validators, 'results')
+        return response
+    
+    @action(detail=True, methods=['post'], url_path='events/ticket')
+    def events_ticket(self, request, pk=None):
+        """
+        Get a short-lived ticket for the submission's event stream, which
+        is opened as /api/v1/submissions/<id>/events/?ticket=<ticket>.
+        POST: /api/v1/submissions/<id>/events/ticket/
+        """
+        submission = self.get_object()
+        
+        return Response({
+            'ticket': issue_ticket(request.user, submission.id),
+            'expires_in': settings.SSE_TICKET_MAX_AGE
+        })
     
     @action(detail=True, methods=['post'])
     def flag(self, request, pk=None):
@@ -173,7 +333,11 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         
         submission.is_flagged = True
         submission.flag_reason = reason
-        submission.save(update_fields=['is_flagged', 'flag_reason'])
+        submission.save(update_fields=['is_flagged', 'flag_reason', 'updated_at'])
+        invalidate_submissions(submission.id)
+        
+        from satyacheck.apps.admin_panel.queue import enqueue
+        enqueue(submission, reason or 'Flagged by user')
         
         audit_logger.info(
             f"Submission flagged: {submission.id} - Reason: {reason} - By: {request.user.username}"
@@ -204,19 +368,39 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             submissions = submissions.filter(user=request.user)
         
         if action == 'flag':
-            submissions.update(is_flagged=True, flag_reason=reason)
+            track_update(submissions, is_flagged=True, flag_reason=reason)
         elif action == 'unflag':
-            submissions.update(is_flagged=False, flag_reason='')
+            track_update(submissions, is_flagged=False, flag_reason='')
         elif action == 'delete':
-            submissions.update(status='rejected')
+            deleted_ids = list(submissions.values_list('id', flat=True))
+            track_update(submissions, status='rejected')
+            publish_status_change(deleted_ids, 'rejected')
         elif action == 'export':
-            # Trigger export task
-            pass
+            # Written to a file in the background; queue_export limits non-admins to their own
+            from satyacheck.apps.reporting.exports import queue_export
+            report = queue_export(
+                request.user,
+                serializer.validated_data['export_format'],
+                {'submission_ids': [str(submission_id) for submission_id in submission_ids]}
+            )
+        
+        if action in ('flag', 'unflag', 'delete'):
+            invalidate_submissions(*submission_ids)
         
         audit_logger.info(
             f"Bulk action '{action}' on {len(submission_ids)} submissions - By: {request.user.username}"
         )
         
+        if action == 'export':
+            return Response(
+                {
+                    'success': True,
+                    'message': 'Export queued.',
+                    'report_id': str(report.id),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+        
         return Response(
             {
                 'success': True,
@@ -231,30 +415,19 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         Get submission statistics.
         GET: /api/v1/submissions/statistics/
         """
-        from django.db.models import Count
-        
-        submissions = Submission.objects.all()
+        statistics = get_statistics()
         
         stats = {
-            'total_submissions': submissions.count(),
-            'by_type': dict(submissions.values('submission_type').annotate(count=Count('id')).values_list('submission_type', 'count')),
-            'by_language': dict(submissions.values('language').annotate(count=Count('id')).values_list('language', 'count')),
-            'by_status': dict(submissions.values('status').annotate(count=Count('id')).values_list('status', 'count')),
-            'flagged_count': submissions.filter(is_flagged=True).count(),
-            'verified_count': submissions.filter(status='completed').count(),
+            'total_submissions': statistics['total'],
+            'by_type': statistics['by_type'],
+            'by_language': statistics['by_language'],
+            'by_status': statistics['by_status'],
+            'flagged_count': statistics['flagged'],
+            'verified_count': statistics['by_status'].get('completed', 0),
+            'updated_at': statistics['updated_at'],
         }
         
         return Response(stats)
-    
-    @staticmethod
-    def _get_client_ip(request):
-        """Extract client IP from request."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
 
 
 class VerificationResultViewSet(viewsets.ReadOnlyModelViewSet):
@@ -265,6 +438,7 @@ class VerificationResultViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = VerificationResult.objects.all()
     serializer_class = VerificationResultSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['primary_category', 'confidence_level']
     ordering = ['-created_at']
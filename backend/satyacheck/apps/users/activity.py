@@ -0,0 +1,132 @@
+"""
+Buffered user activity recording.
+Views hand activity rows to an in-process buffer instead of inserting one
+row per request; a background thread writes them with bulk_create.
+"""
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+import atexit
+import logging
+import os
+import threading
+
+from satyacheck.utils.helpers import get_client_ip
+from .models import UserActivity
+
+logger = logging.getLogger('satyacheck')
+
+
+class ActivityBuffer:
+    """
+    Thread-safe buffer of unsaved UserActivity rows.
+
+    The flusher thread writes a batch every flush_interval seconds, or
+    sooner once batch_size rows are waiting. If it falls behind and the
+    buffer reaches max_size, the thread adding rows flushes them itself,
+    so a slow database slows requests down instead of growing memory.
+    """
+
+    def __init__(self, batch_size, flush_interval, max_size):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._activities = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, activities):
+        """Queue unsaved UserActivity instances for writing."""
+        with self._lock:
+            self._ensure_started()
+            self._activities.extend(activities)
+            size = len(self._activities)
+
+        if size >= self.max_size:
+            # Backpressure: the flusher is behind, write on the caller's thread
+            self.flush()
+        elif size >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write everything buffered so far. Returns the number of rows written."""
+        with self._lock:
+            activities, self._activities = self._activities, []
+
+        if not activities:
+            return 0
+
+        try:
+            UserActivity.objects.bulk_create(activities, batch_size=self.batch_size)
+        except Exception as e:
+            with self._lock:
+                # Keep the rows for the next flush unless that would exceed the limit
+                room = max(self.max_size - len(self._activities), 0)
+                kept = activities[max(len(activities) - room, 0):]
+                self._activities[:0] = kept
+                dropped = len(activities) - len(kept)
+            logger.error(f"Could not write {len(activities)} user activities ({dropped} dropped): {str(e)}")
+            return 0
+
+        return len(activities)
+
+    def _ensure_started(self):
+        """Start the flusher thread, once per process (called with the lock held)."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        if self._pid is not None:
+            # Forked child: the parent still owns whatever it had buffered
+            self._activities = []
+
+        self._pid = pid
+        self._thread = threading.Thread(target=self._run, name='activity-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            # The flusher holds its own connection; let it recycle like a request's
+            close_old_connections()
+
+
+activity_buffer = ActivityBuffer(
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+    max_size=settings.ACTIVITY_BUFFER_MAX_SIZE
+)
+
+
+def build_activity(user, activity_type, description, request=None, metadata=None):
+    """Build an unsaved UserActivity, taking IP and user agent from request."""
+    return UserActivity(
+        user=user,
+        activity_type=activity_type,
+        description=description,
+        ip_address=get_client_ip(request) if request is not None else None,
+        user_agent=request.META.get('HTTP_USER_AGENT', '') if request is not None else '',
+        metadata=metadata or {},
+    )
+
+
+def record_activities(activities):
+    """
+    Queue activities for writing.
+    Inside a transaction they are only queued once it commits.
+    """
+    activities = list(activities)
+    if activities:
+        transaction.on_commit(lambda: activity_buffer.add(activities))
+
+
+def record_activity(user, activity_type, description, request=None, metadata=None):
+    """Queue a single activity for user."""
+    if user is None or not user.is_authenticated:
+        return
+    record_activities([build_activity(user, activity_type, description, request, metadata)])
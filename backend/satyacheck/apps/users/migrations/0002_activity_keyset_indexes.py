@@ -0,0 +1,25 @@
+# Generated by Django 4.2.8 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='useractivity',
+            name='user_activi_user_id_133bc2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='user_activi_user_id_4df563_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['created_at', 'id'], name='user_activi_created_9950ee_idx'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+"""
+Convert user_activity into a table range-partitioned by month on PostgreSQL.
+
+PostgreSQL requires the partition key in the primary key, so the table's
+primary key becomes (id, created_at); Django keeps treating id as the
+primary key. Other databases are left unchanged.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from django.db import migrations
+from django.utils import timezone
+
+# Frozen copies of satyacheck.apps.users.partitions, so the migration does
+# not change (or break) along with the live models and helpers
+TABLE = 'user_activity'
+DEFAULT_PARTITION = f'{TABLE}_default'
+STAGING = f'{TABLE}_partitioned'
+SEQUENCE = f'{TABLE}_id_partitioned_seq'
+
+
+def month_start(value):
+    value = timezone.localtime(value, dt_timezone.utc) if timezone.is_aware(value) else value
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def create_partition_sql(start, parent):
+    end = add_months(start, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{TABLE}_y{start.year:04d}m{start.month:02d}" PARTITION OF "{parent}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def partition_user_activity(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        # Indexes and foreign keys are recreated under the same names once the old table is gone
+        cursor.execute(
+            'SELECT indexdef FROM pg_indexes WHERE tablename = %s '
+            'AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)',
+            [TABLE, TABLE]
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT MIN(created_at), MAX(id) FROM "{TABLE}"')
+        oldest, max_id = cursor.fetchone()
+
+        # Without INCLUDING IDENTITY the id column is copied as plain bigint;
+        # identity columns are not supported on partitioned tables before PostgreSQL 17
+        cursor.execute(
+            f'CREATE TABLE "{STAGING}" (LIKE "{TABLE}" INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'CREATE SEQUENCE "{SEQUENCE}" OWNED BY "{STAGING}".id')
+        cursor.execute('SELECT setval(%s, %s, false)', [SEQUENCE, (max_id or 0) + 1])
+        cursor.execute(f'ALTER TABLE "{STAGING}" ALTER COLUMN id SET DEFAULT nextval(\'"{SEQUENCE}"\')')
+
+        # A few months ahead; the maintain_activity_partitions task keeps extending this
+        current = month_start(timezone.now())
+        start = month_start(oldest) if oldest is not None else current
+        while start <= add_months(current, 3):
+            cursor.execute(create_partition_sql(start, parent=STAGING))
+            start = add_months(start, 1)
+        cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{STAGING}" DEFAULT')
+
+        cursor.execute(f'INSERT INTO "{STAGING}" SELECT * FROM "{TABLE}"')
+        cursor.execute(f'DROP TABLE "{TABLE}"')
+        cursor.execute(f'ALTER TABLE "{STAGING}" RENAME TO "{TABLE}"')
+
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY (id, created_at)')
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}')
+        for definition in index_definitions:
+            cursor.execute(definition)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_activity_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_user_activity, migrations.RunPython.noop),
+    ]
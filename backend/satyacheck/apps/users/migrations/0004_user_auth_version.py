@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_partition_user_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='auth_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bumped to revoke issued access tokens (see satyacheck.core.authentication)'),
+        ),
+    ]
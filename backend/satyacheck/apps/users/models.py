@@ -21,6 +21,12 @@ class User(AbstractUser):
         ('ngo', 'NGO'),
         ('admin', 'Admin'),
     )
+    MODERATOR_ROLES = ('journalist', 'ngo', 'admin')
+    
+    # Carried as signed claims in access tokens (see satyacheck.core.authentication)
+    PRINCIPAL_FIELDS = ('username', 'role', 'is_staff', 'is_superuser', 'is_verified')
+    # Changes to these revoke the user's outstanding access tokens
+    AUTH_FIELDS = PRINCIPAL_FIELDS + ('is_active', 'password')
     
     # Primary Fields
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -88,6 +94,11 @@ class User(AbstractUser):
         blank=True,
         null=True
     )
+    auth_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Bumped to revoke issued access tokens (see satyacheck.core.authentication)'
+    )
     
     # Metadata
     last_login_ip = models.GenericIPAddressField(blank=True, null=True)
@@ -108,12 +119,44 @@ class User(AbstractUser):
             models.Index(fields=['is_verified']),
         ]
     
+    _auth_key = None
+    
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded auth fields so saves can tell when tokens go stale."""
+        instance = super().from_db(db, field_names, values)
+        if all(field in field_names for field in cls.AUTH_FIELDS):
+            instance._auth_key = instance.get_auth_key()
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """
+        Save, leaving auth_version alone unless it is named in update_fields:
+        it is only changed by bump_auth_version, and a full save from an
+        instance loaded before a bump must not roll it back.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'auth_version' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+    
+    def get_auth_key(self):
+        """Get the values of the fields tokens depend on."""
+        return tuple(getattr(self, field) for field in self.AUTH_FIELDS)
+    
+    def get_principal_claims(self):
+        """Get the claims access tokens carry for this user."""
+        return {field: getattr(self, field) for field in self.PRINCIPAL_FIELDS}
+    
     def is_moderator(self):
         """Check if user is a moderator (journalist or NGO)."""
-        return self.role in ['journalist', 'ngo', 'admin']
+        return self.role in self.MODERATOR_ROLES
     
     def is_admin_user(self):
         """Check if user is an admin."""
@@ -235,7 +278,8 @@ class UserActivity(models.Model):
         db_table = 'user_activity'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', 'created_at', 'id']),
+            models.Index(fields=['created_at', 'id']),
             models.Index(fields=['activity_type']),
         ]
     
@@ -0,0 +1,114 @@
+"""
+One-time passwords held in Redis.
+
+Each (verification type, email/phone) pair has at most one live code,
+stored as a keyed hash with the user under a key that expires after
+OTP_TTL seconds. Failed attempts are counted per address in a separate
+key, which lasts OTP_TTL seconds from the first failure whatever codes
+are issued meanwhile, so requesting a new code does not earn new
+guesses. Checking a code and counting a failed attempt happen in one Lua
+script, so parallel guesses cannot exceed OTP_MAX_ATTEMPTS.
+
+The plain code is never passed to the delivery task, where it would be
+kept by the broker and task logs. The task gets an opaque handle instead
+and reads the code from Redis, where it is kept for OTP_DELIVERY_TTL
+seconds. Nothing is written to the database.
+"""
+
+from django.conf import settings
+import hashlib
+import hmac
+import secrets
+
+from satyacheck.services.redis_client import get_redis
+
+VERIFIED = 'verified'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+LOCKED = 'locked'
+
+# KEYS[1] otp, KEYS[2] failed attempts; ARGV code hash, max attempts, lockout seconds.
+# Returns {1, user_id} on success, {0} if missing, {-1} if locked, {-2} if wrong.
+VERIFY_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[2]) or 0) >= tonumber(ARGV[2]) then
+    return {-1}
+end
+local otp = redis.call('HMGET', KEYS[1], 'code', 'user_id')
+if not otp[1] then
+    return {0}
+end
+if otp[1] == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return {1, otp[2]}
+end
+if redis.call('INCR', KEYS[2]) == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return {-2}
+"""
+
+_verify_script = None
+
+
+def _key(verification_type, email_or_phone):
+    return f'otp:{verification_type}:{email_or_phone.strip().lower()}'
+
+
+def _attempts_key(verification_type, email_or_phone):
+    return f'{_key(verification_type, email_or_phone)}:attempts'
+
+
+def _delivery_key(handle):
+    return f'otp-delivery:{handle}'
+
+
+def _hash(code):
+    """Codes are stored keyed-hashed, so a Redis dump does not reveal live codes."""
+    return hmac.new(settings.SECRET_KEY.encode(), code.encode(), hashlib.sha256).hexdigest()
+
+
+def issue_otp(user, verification_type, email_or_phone):
+    """
+    Create a code for user, replacing any live one.
+    Returns (code, delivery handle to pass to the deliver_otp task).
+    """
+    code = ''.join(secrets.choice('0123456789') for _ in range(6))
+    handle = secrets.token_urlsafe(16)
+    key = _key(verification_type, email_or_phone)
+
+    pipe = get_redis().pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping={'code': _hash(code), 'user_id': str(user.pk)})
+    pipe.expire(key, settings.OTP_TTL)
+    pipe.set(_delivery_key(handle), code, ex=settings.OTP_DELIVERY_TTL)
+    pipe.execute()
+    return code, handle
+
+
+def read_delivery(handle):
+    """Get the code to deliver for a handle, or None if it has expired."""
+    code = get_redis().get(_delivery_key(handle))
+    return code.decode() if code is not None else None
+
+
+def discard_delivery(handle):
+    """Forget a delivered code's plain text."""
+    get_redis().delete(_delivery_key(handle))
+
+
+def verify_otp(verification_type, email_or_phone, code):
+    """
+    Check a code, using it up on success.
+    Returns (outcome, user_id); user_id is None unless outcome is VERIFIED.
+    """
+    global _verify_script
+    if _verify_script is None:
+        _verify_script = get_redis().register_script(VERIFY_SCRIPT)
+
+    result = _verify_script(
+        keys=[_key(verification_type, email_or_phone), _attempts_key(verification_type, email_or_phone)],
+        args=[_hash(str(code)), settings.OTP_MAX_ATTEMPTS, settings.OTP_TTL]
+    )
+    outcome = {1: VERIFIED, 0: EXPIRED, -1: LOCKED, -2: INVALID}[result[0]]
+    user_id = result[1].decode() if outcome == VERIFIED else None
+    return outcome, user_id
@@ -0,0 +1,198 @@
+"""
+Monthly partitioning and retention for user activity.
+
+On PostgreSQL user_activity is range-partitioned by created_at with one
+partition per calendar month (see migration 0003), so range filters only
+scan the months they cover and expired months are removed with a
+constant-time DROP TABLE. Other databases keep a single table and expire
+old months with a range DELETE.
+
+Either way a month is rolled up into monthly UserStatistic rows before its
+activity is removed.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import logging
+import re
+
+from .models import UserActivity
+
+logger = logging.getLogger('satyacheck')
+
+TABLE = UserActivity._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_PATTERN = re.compile(rf'^{TABLE}_y(\d{{4}})m(\d{{2}})$')
+
+
+def month_start(value):
+    """Get the first instant of value's month (aware, in UTC)."""
+    value = timezone.localtime(value, dt_timezone.utc) if timezone.is_aware(value) else value
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(start, months):
+    """Shift a month start by a number of months."""
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(start):
+    """Get the partition table name for the month starting at start."""
+    return f'{TABLE}_y{start.year:04d}m{start.month:02d}'
+
+
+def create_partition_sql(start, parent=TABLE):
+    """SQL creating the partition for the month starting at start."""
+    end = add_months(start, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(start)}" PARTITION OF "{parent}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def is_partitioned():
+    """Check whether user_activity is a partitioned table on this database."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass',
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Get month starts of existing monthly partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    starts = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            starts.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc))
+    return sorted(starts)
+
+
+def ensure_partitions(months_ahead=None):
+    """
+    Create partitions from the current month through months_ahead months.
+    Returns the number of partitions created.
+    """
+    if not is_partitioned():
+        return 0
+
+    months_ahead = settings.ACTIVITY_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    existing = set(list_partitions())
+    current = month_start(timezone.now())
+    created = 0
+
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            if start not in existing:
+                cursor.execute(create_partition_sql(start))
+                created += 1
+    return created
+
+
+def rollup_month(start):
+    """
+    Summarize a month of activity into monthly UserStatistic rows.
+    Re-running replaces that month's rows. Returns the number of users.
+    """
+    from satyacheck.apps.reporting.models import UserStatistic
+
+    end = add_months(start, 1)
+    rows = UserActivity.objects.filter(
+        created_at__gte=start,
+        created_at__lt=end
+    ).values('user_id', 'user__username', 'user__role').annotate(
+        activity_count=Count('id'),
+        submission_count=Count('id', filter=Q(activity_type='submission')),
+        active_days=Count(TruncDate('created_at'), distinct=True),
+        last_active=Max('created_at'),
+    )
+
+    statistics = [
+        UserStatistic(
+            user_id=row['user_id'],
+            username=row['user__username'],
+            role=row['user__role'],
+            period='monthly',
+            period_start=start.date(),
+            activity_count=row['activity_count'],
+            submission_count=row['submission_count'],
+            active_days=row['active_days'],
+            last_active=row['last_active'],
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        UserStatistic.objects.filter(period='monthly', period_start=start.date()).delete()
+        UserStatistic.objects.bulk_create(statistics)
+    return len(statistics)
+
+
+def expire_month(start, partitioned):
+    """Roll up one month, then remove its activity."""
+    with transaction.atomic():
+        users = rollup_month(start)
+        if partitioned:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE "{partition_name(start)}"')
+        else:
+            UserActivity.objects.filter(
+                created_at__gte=start,
+                created_at__lt=add_months(start, 1)
+            ).delete()
+    logger.info(f"Expired user activity for {start:%Y-%m} ({users} users rolled up)")
+
+
+def apply_retention(retention_months=None):
+    """
+    Roll up and remove every month older than the retention window.
+    Returns the month starts that were expired.
+    """
+    retention_months = settings.ACTIVITY_RETENTION_MONTHS if retention_months is None else retention_months
+    cutoff = add_months(month_start(timezone.now()), -retention_months)
+    partitioned = is_partitioned()
+
+    if partitioned:
+        months = [start for start in list_partitions() if start < cutoff]
+        # Stray rows in the default partition are expired month by month like a plain table
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT MIN(created_at) FROM "{DEFAULT_PARTITION}" WHERE created_at < %s', [cutoff])
+            oldest = cursor.fetchone()[0]
+    else:
+        months = []
+        oldest = UserActivity.objects.filter(created_at__lt=cutoff).order_by('created_at').values_list(
+            'created_at', flat=True
+        ).first()
+
+    for start in months:
+        expire_month(start, partitioned=True)
+
+    if oldest is not None:
+        start = month_start(oldest)
+        while start < cutoff:
+            end = add_months(start, 1)
+            if start not in months and UserActivity.objects.filter(created_at__gte=start, created_at__lt=end).exists():
+                expire_month(start, partitioned=False)
+                months.append(start)
+            start = end
+
+    return sorted(months)
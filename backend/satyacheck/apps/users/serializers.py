@@ -7,6 +7,7 @@ from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import User, OTPVerification, UserActivity
+from satyacheck.apps.admin_panel.bans import is_banned
 import random
 import string
 from django.utils import timezone
@@ -143,6 +144,11 @@ class LoginSerializer(serializers.Serializer):
                 'User account is inactive.'
             )
         
+        if is_banned(user.pk):
+            raise serializers.ValidationError(
+                'User account is banned.'
+            )
+        
         data['user'] = user
         return data
 
@@ -11,3 +11,26 @@ from .models import User
 def update_user_metadata(sender, instance, created, **kwargs):
     """Update user metadata on save."""
     pass
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Revoke a user's access tokens when a field they carry (or the
+    password or active flag) changes, and drop the cached user.
+    """
+    from satyacheck.core.authentication import bump_auth_version, forget_user
+    
+    auth_key = instance.get_auth_key()
+    if created:
+        instance._auth_key = auth_key
+        return
+    
+    forget_user(instance.pk)
+    if update_fields is not None and not set(update_fields) & set(User.AUTH_FIELDS):
+        return
+    
+    # Unknown previous values (e.g. a deferred load) are treated as changed
+    if instance._auth_key != auth_key:
+        bump_auth_version(instance.pk)
+    instance._auth_key = auth_key
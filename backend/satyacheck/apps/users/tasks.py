@@ -0,0 +1,61 @@
+"""
+Celery tasks for users.
+"""
+
+from celery import shared_task
+from django.conf import settings
+import logging
+
+from satyacheck.services.messaging import send_email, send_sms
+from . import otp
+from .partitions import apply_retention, ensure_partitions
+
+logger = logging.getLogger('satyacheck')
+
+
+@shared_task
+def maintain_activity_partitions():
+    """
+    Create upcoming activity partitions and expire months past retention.
+    Scheduled by CELERY_BEAT_SCHEDULE.
+    """
+    created = ensure_partitions()
+    expired = apply_retention()
+    logger.info(f"Activity partitions maintained ({created} created, {len(expired)} months expired)")
+    return {
+        'success': True,
+        'created': created,
+        'expired': [f'{start:%Y-%m}' for start in expired],
+    }
+
+
+@shared_task(
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3
+)
+def deliver_otp(channel, recipient, handle, verification_type):
+    """
+    Send an OTP by 'email' or 'sms' over the worker's pooled connections.
+    Queued by AuthViewSet.request_otp so delivery stays off the request;
+    the code is read from Redis by its delivery handle.
+    """
+    code = otp.read_delivery(handle)
+    if code is None:
+        logger.warning(f"OTP for {recipient} expired before delivery (type: {verification_type})")
+        return {'success': False, 'error': 'expired'}
+
+    if settings.DEBUG:
+        otp.discard_delivery(handle)
+        logger.info(f"[DEBUG] OTP {channel} to {recipient}: {code}")
+        return {'success': True}
+
+    message = f'Your OTP code is: {code}. Valid for {settings.OTP_TTL // 60} minutes.'
+    if channel == 'email':
+        send_email(f'Your SatyaCheck OTP Code: {code}', message, recipient)
+    else:
+        send_sms(recipient, message)
+    otp.discard_delivery(handle)
+
+    logger.info(f"OTP delivered by {channel} to {recipient} (type: {verification_type})")
+    return {'success': True}
@@ -0,0 +1,18 @@
+"""
+Model factories for users.
+"""
+
+import factory
+
+from satyacheck.apps.users.models import User
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = User
+        skip_postgeneration_save = True
+
+    username = factory.Sequence(lambda n: f'user{n}')
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    role = 'user'
+    password = factory.django.Password('password123')
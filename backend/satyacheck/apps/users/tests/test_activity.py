@@ -0,0 +1,76 @@
+import pytest
+from django.db import transaction
+from django.test import RequestFactory
+
+from satyacheck.apps.users.activity import ActivityBuffer, activity_buffer, build_activity, record_activity
+from satyacheck.apps.users.models import UserActivity
+
+pytestmark = pytest.mark.django_db
+
+request = RequestFactory().get('/', REMOTE_ADDR='203.0.113.7', HTTP_USER_AGENT='pytest')
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = ActivityBuffer(batch_size=2, flush_interval=60, max_size=3)
+    monkeypatch.setattr(buffer, '_ensure_started', lambda: None)
+    return buffer
+
+
+def test_activity_is_queued_on_commit(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        record_activity(user, 'login', 'Logged in', request)
+
+    assert UserActivity.objects.count() == 0
+    assert activity_buffer.flush() == 1
+    activity = UserActivity.objects.get()
+    assert activity.activity_type == 'login'
+    assert activity.ip_address == '203.0.113.7'
+
+
+def test_rolled_back_activity_is_not_queued(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                record_activity(user, 'login', 'Logged in', request)
+                raise RuntimeError
+
+    assert activity_buffer.flush() == 0
+
+
+def test_anonymous_activity_is_ignored(django_capture_on_commit_callbacks):
+    from django.contrib.auth.models import AnonymousUser
+
+    with django_capture_on_commit_callbacks(execute=True):
+        record_activity(AnonymousUser(), 'login', 'Logged in')
+
+    assert activity_buffer.flush() == 0
+
+
+def test_batch_size_wakes_the_flusher(buffer, user):
+    buffer.add([build_activity(user, 'login', 'Logged in', request)])
+    assert not buffer._wakeup.is_set()
+
+    buffer.add([build_activity(user, 'login', 'Logged in', request)])
+    assert buffer._wakeup.is_set()
+    assert UserActivity.objects.count() == 0
+
+
+def test_full_buffer_is_written_by_the_caller(buffer, user):
+    buffer.add([build_activity(user, 'login', 'Logged in', request) for _ in range(3)])
+
+    assert UserActivity.objects.count() == 3
+    assert buffer._activities == []
+
+
+def test_failed_write_keeps_rows_up_to_the_limit(buffer, user, monkeypatch):
+    buffer._activities = [build_activity(user, 'login', str(n), request) for n in range(3)]
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(UserActivity.objects, 'bulk_create', fail)
+    buffer._activities.append(build_activity(user, 'login', '3', request))
+
+    assert buffer.flush() == 0
+    assert [activity.description for activity in buffer._activities] == ['1', '2', '3']
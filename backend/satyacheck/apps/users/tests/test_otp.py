@@ -0,0 +1,99 @@
+import pytest
+
+from satyacheck.apps.users import otp, tasks
+from satyacheck.services.redis_client import get_redis
+
+pytestmark = pytest.mark.django_db
+
+ADDRESS = 'someone@example.com'
+
+
+@pytest.fixture(autouse=True)
+def max_attempts(settings):
+    settings.OTP_MAX_ATTEMPTS = 3
+
+
+def wrong(code):
+    return '000000' if code != '000000' else '111111'
+
+
+def test_code_verifies_once(user):
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+
+    assert otp.verify_otp('email', ADDRESS.upper(), code) == (otp.VERIFIED, str(user.pk))
+    assert otp.verify_otp('email', ADDRESS, code) == (otp.EXPIRED, None)
+
+
+def test_code_is_stored_hashed(user):
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+
+    assert code.encode() not in get_redis().hget(otp._key('email', ADDRESS), 'code')
+
+
+def test_failed_attempts_lock_the_code(user):
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+
+    outcomes = [otp.verify_otp('email', ADDRESS, wrong(code))[0] for _ in range(4)]
+
+    assert outcomes == [otp.INVALID] * 3 + [otp.LOCKED]
+    assert otp.verify_otp('email', ADDRESS, code)[0] == otp.LOCKED
+
+
+def test_reissuing_does_not_reset_attempts(user):
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+    for _ in range(3):
+        otp.verify_otp('email', ADDRESS, wrong(code))
+
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+
+    assert otp.verify_otp('email', ADDRESS, code)[0] == otp.LOCKED
+
+
+def test_lockout_expires_after_otp_ttl(user, settings):
+    settings.OTP_TTL = 120
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+    otp.verify_otp('email', ADDRESS, wrong(code))
+
+    assert 0 < get_redis().ttl(otp._attempts_key('email', ADDRESS)) <= 120
+
+
+def test_success_clears_attempts(user):
+    code, _ = otp.issue_otp(user, 'email', ADDRESS)
+    otp.verify_otp('email', ADDRESS, wrong(code))
+
+    otp.verify_otp('email', ADDRESS, code)
+
+    assert not get_redis().exists(otp._attempts_key('email', ADDRESS))
+
+
+def test_request_queues_a_handle_not_the_code(api_client, monkeypatch, settings):
+    settings.DEBUG = False
+    queued = []
+    monkeypatch.setattr(tasks.deliver_otp, 'delay', lambda *args: queued.append(args))
+
+    response = api_client.post('/api/v1/auth/request-otp/', {'email': ADDRESS, 'verification_type': 'email'}, format='json')
+
+    assert response.status_code == 200
+    assert response.data['otp_code'] is None
+    [(channel, recipient, handle, verification_type)] = queued
+    assert (channel, recipient, verification_type) == ('email', ADDRESS, 'email')
+    code = otp.read_delivery(handle)
+    assert code is not None and code not in handle
+
+
+def test_worker_delivers_code_by_handle(user, monkeypatch, settings):
+    settings.DEBUG = False
+    sent = []
+    monkeypatch.setattr(tasks, 'send_email', lambda subject, message, recipient: sent.append(message))
+    code, handle = otp.issue_otp(user, 'email', ADDRESS)
+
+    assert tasks.deliver_otp('email', ADDRESS, handle, 'email')['success']
+
+    assert code in sent[0]
+    assert otp.read_delivery(handle) is None
+
+
+def test_expired_handle_is_not_delivered(monkeypatch):
+    monkeypatch.setattr(tasks, 'send_email', lambda *args: pytest.fail('sent'))
+
+    assert tasks.deliver_otp('email', ADDRESS, 'unknown', 'email') == {'success': False, 'error': 'expired'}
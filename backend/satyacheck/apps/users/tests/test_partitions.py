@@ -0,0 +1,69 @@
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from satyacheck.apps.reporting.models import UserStatistic
+from satyacheck.apps.users import partitions
+from satyacheck.apps.users.models import UserActivity
+
+pytestmark = pytest.mark.django_db
+
+
+def add_activity(user, created_at, activity_type='login'):
+    activity = UserActivity.objects.create(
+        user=user, activity_type=activity_type, description='', ip_address='203.0.113.7'
+    )
+    UserActivity.objects.filter(pk=activity.pk).update(created_at=created_at)
+
+
+def test_month_arithmetic():
+    start = datetime(2024, 11, 1, tzinfo=dt_timezone.utc)
+
+    assert partitions.add_months(start, 2) == datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    assert partitions.add_months(start, -11) == datetime(2023, 12, 1, tzinfo=dt_timezone.utc)
+    assert partitions.month_start(datetime(2024, 11, 30, 23, 59, tzinfo=dt_timezone.utc)) == start
+    assert partitions.partition_name(start) == 'user_activity_y2024m11'
+
+
+def test_migrated_table_is_partitioned():
+    assert partitions.is_partitioned()
+    assert partitions.month_start(timezone.now()) in partitions.list_partitions()
+
+
+def test_ensure_partitions_is_idempotent():
+    partitions.ensure_partitions(months_ahead=6)
+    current = partitions.month_start(timezone.now())
+
+    assert partitions.ensure_partitions(months_ahead=6) == 0
+    assert partitions.add_months(current, 6) in partitions.list_partitions()
+
+
+def test_retention_rolls_up_and_drops_expired_partition(user):
+    old = partitions.add_months(partitions.month_start(timezone.now()), -14)
+    with connection.cursor() as cursor:
+        cursor.execute(partitions.create_partition_sql(old))
+    add_activity(user, old.replace(day=3))
+    add_activity(user, old.replace(day=5), activity_type='submission')
+    add_activity(user, timezone.now())
+    with connection.cursor() as cursor:
+        # Run the deferred foreign key checks, as the commit before a real retention run would
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    assert partitions.apply_retention(retention_months=12) == [old]
+
+    assert old not in partitions.list_partitions()
+    assert UserActivity.objects.count() == 1
+    statistic = UserStatistic.objects.get(period='monthly', period_start=old.date())
+    assert (statistic.activity_count, statistic.submission_count, statistic.active_days) == (2, 1, 2)
+
+
+def test_retention_expires_rows_in_the_default_partition(user):
+    old = partitions.add_months(partitions.month_start(timezone.now()), -30)
+    add_activity(user, old.replace(day=10))
+
+    assert partitions.apply_retention(retention_months=12) == [old]
+
+    assert not UserActivity.objects.exists()
+    assert UserStatistic.objects.filter(period='monthly', period_start=old.date()).exists()
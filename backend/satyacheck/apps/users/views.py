@@ -6,23 +6,25 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
-import random
-import string
 import logging
+import redis
 
-from .models import User, OTPVerification, UserActivity
+from . import otp
+from .activity import record_activity
+from .models import User, UserActivity
 from .serializers import (
     UserSerializer, SignupSerializer, LoginSerializer,
     ChangePasswordSerializer, OTPSerializer, UserProfileUpdateSerializer,
     UserActivitySerializer
 )
+from .tasks import deliver_otp
+from satyacheck.core.authentication import PrincipalRefreshToken
+from satyacheck.core.pagination import KeysetPagination
 
 logger = logging.getLogger('satyacheck')
 audit_logger = logging.getLogger('satyacheck.audit')
@@ -56,16 +58,10 @@ class AuthViewSet(viewsets.ViewSet):
                 audit_logger.info(f"New user signup: {user.username} ({user.email})")
                 
                 # Log activity
-                UserActivity.objects.create(
-                    user=user,
-                    activity_type='signup',
-                    description='User registered',
-                    ip_address=self._get_client_ip(request),
-                    user_agent=request.META.get('HTTP_USER_AGENT', '')
-                )
+                record_activity(user, 'signup', 'User registered', request)
                 
                 # Generate tokens
-                refresh = RefreshToken.for_user(user)
+                refresh = PrincipalRefreshToken.for_user(user)
                 
                 return Response(
                     {
@@ -105,18 +101,12 @@ class AuthViewSet(viewsets.ViewSet):
             user.save(update_fields=['last_login', 'last_login_ip'])
             
             # Log activity
-            UserActivity.objects.create(
-                user=user,
-                activity_type='login',
-                description='User login',
-                ip_address=self._get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
+            record_activity(user, 'login', 'User login', request)
             
             audit_logger.info(f"User login: {user.username}")
             
             # Generate tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = PrincipalRefreshToken.for_user(user)
             
             return Response(
                 {
@@ -144,13 +134,7 @@ class AuthViewSet(viewsets.ViewSet):
         user = request.user
         
         # Log activity
-        UserActivity.objects.create(
-            user=user,
-            activity_type='logout',
-            description='User logout',
-            ip_address=self._get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')
-        )
+        record_activity(user, 'logout', 'User logout', request)
         
         audit_logger.info(f"User logout: {user.username}")
         
@@ -192,13 +176,7 @@ class AuthViewSet(viewsets.ViewSet):
             serializer.save()
             
             # Log activity
-            UserActivity.objects.create(
-                user=user,
-                activity_type='profile_update',
-                description='User profile updated',
-                ip_address=self._get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
+            record_activity(user, 'profile_update', 'User profile updated', request)
             
             return Response(
                 {
@@ -231,20 +209,21 @@ class AuthViewSet(viewsets.ViewSet):
             user.save()
             
             # Log activity
-            UserActivity.objects.create(
-                user=user,
-                activity_type='profile_update',
-                description='User changed password',
-                ip_address=self._get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
+            record_activity(user, 'profile_update', 'User changed password', request)
             
             audit_logger.info(f"User password changed: {user.username}")
             
+            # Tokens issued before the change are revoked
+            refresh = PrincipalRefreshToken.for_user(user)
+            
             return Response(
                 {
                     'success': True,
-                    'message': 'Password changed successfully.'
+                    'message': 'Password changed successfully.',
+                    'tokens': {
+                        'access': str(refresh.access_token),
+                        'refresh': str(refresh),
+                    }
                 },
                 status=status.HTTP_200_OK
             )
@@ -285,35 +264,30 @@ class AuthViewSet(viewsets.ViewSet):
                         status=status.HTTP_404_NOT_FOUND
                     )
             
-            # Generate OTP
-            otp_code = ''.join(random.choices(string.digits, k=6))
-            
-            # Set expiration to 10 minutes
-            from datetime import timedelta
-            expires_at = timezone.now() + timedelta(minutes=10)
-            
-            # Save OTP
-            otp = OTPVerification.objects.create(
-                user=user,
-                code=otp_code,
-                verification_type=verification_type,
-                email_or_phone=email or phone,
-                expires_at=expires_at
-            )
+            # Held in Redis with a TTL; delivery happens on a worker
+            try:
+                otp_code, handle = otp.issue_otp(user, verification_type, email or phone)
+            except redis.RedisError as e:
+                logger.error(f"Failed to issue OTP for {email or phone}: {str(e)}")
+                return Response(
+                    {
+                        'success': False,
+                        'message': 'OTP service is temporarily unavailable.'
+                    },
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
             
-            # Send OTP (in development, log it; in production, use email/SMS service)
-            if email:
-                self._send_otp_email(user, email, otp_code, verification_type)
-            elif phone:
-                self._send_otp_sms(user, phone, otp_code)
+            try:
+                deliver_otp.delay('email' if email else 'sms', email or phone, handle, verification_type)
+            except Exception as e:
+                logger.error(f"Failed to queue OTP delivery to {email or phone}: {str(e)}")
             
             logger.info(f"OTP requested for {email or phone} (type: {verification_type})")
             
             return Response(
                 {
                     'success': True,
-                    'message': f'OTP sent to {email or phone}. Valid for 10 minutes.',
-                    'otp_id': str(otp.id),  # For development/testing
+                    'message': f'OTP sent to {email or phone}. Valid for {settings.OTP_TTL // 60} minutes.',
                     'otp_code': otp_code if settings.DEBUG else None  # Only in DEBUG mode
                 },
                 status=status.HTTP_200_OK
@@ -347,12 +321,18 @@ class AuthViewSet(viewsets.ViewSet):
             )
         
         try:
-            otp = OTPVerification.objects.get(
-                code=code,
-                email_or_phone=email_or_phone,
-                verification_type=verification_type
+            outcome, user_id = otp.verify_otp(verification_type, email_or_phone, code)
+        except redis.RedisError as e:
+            logger.error(f"Failed to verify OTP for {email_or_phone}: {str(e)}")
+            return Response(
+                {
+                    'success': False,
+                    'message': 'OTP service is temporarily unavailable.'
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
-        except OTPVerification.DoesNotExist:
+        
+        if outcome == otp.INVALID:
             return Response(
                 {
                     'success': False,
@@ -361,7 +341,7 @@ class AuthViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if not otp.is_valid():
+        if outcome != otp.VERIFIED:
             return Response(
                 {
                     'success': False,
@@ -370,13 +350,18 @@ class AuthViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Mark as verified
-        otp.is_verified = True
-        otp.verified_at = timezone.now()
-        otp.save()
+        try:
+            user = User.objects.get(pk=user_id)
+        except User.DoesNotExist:
+            return Response(
+                {
+                    'success': False,
+                    'message': 'Invalid OTP code.'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Update user verification status
-        user = otp.user
         if verification_type == 'email':
             user.is_verified = True
             user.email = email_or_phone
@@ -389,7 +374,7 @@ class AuthViewSet(viewsets.ViewSet):
         user.save()
         
         # Generate tokens if needed
-        refresh = RefreshToken.for_user(user)
+        refresh = PrincipalRefreshToken.for_user(user)
         
         return Response(
             {
@@ -413,40 +398,6 @@ class AuthViewSet(viewsets.ViewSet):
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
-    
-    @staticmethod
-    def _send_otp_email(user, email, code, verification_type):
-        """Send OTP via email."""
-        context = {
-            'user': user,
-            'code': code,
-            'verification_type': verification_type,
-        }
-        
-        subject = f'Your SatyaCheck OTP Code: {code}'
-        
-        if settings.DEBUG:
-            logger.info(f"[DEBUG] OTP Email to {email}: {code}")
-        else:
-            try:
-                send_mail(
-                    subject=subject,
-                    message=f'Your OTP code is: {code}. Valid for 10 minutes.',
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[email],
-                    fail_silently=False,
-                )
-            except Exception as e:
-                logger.error(f"Failed to send OTP email to {email}: {str(e)}")
-    
-    @staticmethod
-    def _send_otp_sms(user, phone, code):
-        """Send OTP via SMS."""
-        if settings.DEBUG:
-            logger.info(f"[DEBUG] OTP SMS to {phone}: {code}")
-        else:
-            # Integrate with SMS provider (Twilio, etc.)
-            pass
 
 
 class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
@@ -456,6 +407,7 @@ class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
     
     serializer_class = UserActivitySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """Return activity logs for current user."""
@@ -1,6 +1,8 @@
 """
 ASGI config for SatyaCheck project.
-For WebSocket support and async tasks.
+Served in production by gunicorn with uvicorn workers, so async views
+such as the submission event streams run on the event loop instead of
+holding a worker each.
 """
 
 import os
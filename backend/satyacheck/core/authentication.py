@@ -0,0 +1,352 @@
+"""
+Authentication for the API.
+
+Access tokens carry the user's role and flags as signed claims, so most
+requests are authenticated without loading the user: request.user is a
+TokenPrincipal that answers from the claims and loads the full User
+(from a small per-process LRU, then the database) only when a view reads
+something else. Each token also records the user's auth version, a
+counter bumped when a user's role, flags, password or ban status
+changes; tokens issued before the bump are rejected. The counter is
+User.auth_version, cached in Redis and briefly in each process. If
+Redis is unreachable it is read from the database, so revoked tokens
+stay revoked.
+
+Bans are enforced here, against the cached ban set, so banned users are
+rejected without a database query.
+"""
+
+from django.conf import settings
+from django.db import router
+from django.db.models import F
+from django.db.models.base import ModelState
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication, default_user_authentication_rule
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+import copy
+import logging
+import redis
+
+from satyacheck.apps.admin_panel.bans import is_banned
+from satyacheck.apps.users.models import User
+from satyacheck.services.cache_service import LocalLRU
+from satyacheck.services.redis_client import get_redis
+
+logger = logging.getLogger('satyacheck')
+
+AUTH_VERSION_CLAIM = 'auth_version'
+SESSION_HASH_CLAIM = 'session_hash'
+
+# KEYS[1] cached version; ARGV version, seconds to keep it.
+# Versions only go up, so a reader caching a value it loaded before a
+# bump cannot overwrite the bumped one. Returns the cached version.
+CACHE_VERSION_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or -1)
+local version = tonumber(ARGV[1])
+if version > current then
+    redis.call('SET', KEYS[1], version, 'EX', ARGV[2])
+    return version
+end
+return current
+"""
+
+_users = LocalLRU(settings.AUTH_USER_CACHE_SIZE)
+_versions = LocalLRU(settings.AUTH_USER_CACHE_SIZE)
+_cache_script = None
+
+
+def _version_key(user_id):
+    return f'auth-version:{user_id}'
+
+
+def _load_auth_version(user_id):
+    """Get a user's auth version from the database, or None if there is no such user."""
+    return User.objects.filter(pk=user_id).values_list('auth_version', flat=True).first()
+
+
+def _cache_version(user_id, version):
+    """Raise the Redis copy of a user's auth version to version."""
+    global _cache_script
+    if _cache_script is None:
+        _cache_script = get_redis().register_script(CACHE_VERSION_SCRIPT)
+    return int(_cache_script(keys=[_version_key(user_id)], args=[version, settings.AUTH_VERSION_REDIS_TTL]))
+
+
+def get_auth_version(user_id):
+    """
+    Get a user's current auth version, cached locally for
+    AUTH_VERSION_CACHE_TIMEOUT and in Redis for AUTH_VERSION_REDIS_TTL.
+    Falls back to the database if Redis is unreachable.
+    Returns None if the user does not exist.
+    """
+    key = str(user_id)
+    version = _versions.get(key)
+    if isinstance(version, int):
+        return version
+
+    try:
+        cached = get_redis().get(_version_key(key))
+        if cached is not None:
+            version = int(cached)
+        else:
+            version = _load_auth_version(user_id)
+            if version is not None:
+                version = _cache_version(key, version)
+    except redis.RedisError as e:
+        logger.warning(f"Auth version cache unavailable, reading {key} from the database: {str(e)}")
+        version = _load_auth_version(user_id)
+
+    if version is None:
+        return None
+    _versions.set(key, version, settings.AUTH_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def bump_auth_version(user_id):
+    """
+    Revoke every token issued to a user so far.
+    The new version is written to the database first; if Redis cannot be
+    updated, other processes may accept the old tokens until the cached
+    copy expires (AUTH_VERSION_REDIS_TTL).
+    """
+    key = str(user_id)
+    _users.delete(key)
+    User.objects.filter(pk=user_id).update(auth_version=F('auth_version') + 1)
+    version = _load_auth_version(user_id)
+    if version is None:
+        return
+
+    try:
+        version = _cache_version(key, version)
+    except redis.RedisError as e:
+        logger.error(f"Could not update cached auth version for {key}: {str(e)}")
+    _versions.set(key, version, settings.AUTH_VERSION_CACHE_TIMEOUT)
+
+
+def forget_user(user_id):
+    """Drop a user from this process's LRU after it changes."""
+    _users.delete(str(user_id))
+
+
+def get_user_cached(user_id):
+    """
+    Get the full User from the per-process LRU or the database.
+    Each request gets its own copy, so changes a view makes are not shared.
+    """
+    key = str(user_id)
+    user = _users.get(key)
+    if isinstance(user, User):
+        return copy.copy(user)
+
+    try:
+        user = User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found.', code='user_not_found')
+
+    _users.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return copy.copy(user)
+
+
+class TokenPrincipal(SimpleLazyObject):
+    """
+    request.user for token-authenticated requests.
+    Claim attributes, role checks, equality and foreign key assignment
+    work from the token; any other attribute loads the full User.
+    """
+
+    def __init__(self, claims):
+        user_id = claims[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: get_user_cached(user_id))
+        self.__dict__['_claims'] = claims
+
+    def __getattr__(self, name):
+        # Probes for attributes no User has (e.g. hasattr(value,
+        # 'resolve_expression') in queryset filters) need not load one
+        if self._wrapped is empty and not hasattr(User, name):
+            raise AttributeError(name)
+        return super().__getattr__(name)
+
+    @property
+    def __class__(self):
+        return User
+
+    @property
+    def _meta(self):
+        return User._meta
+
+    @property
+    def _state(self):
+        state = self.__dict__.get('_principal_state')
+        if state is None:
+            state = ModelState()
+            state.adding = False
+            state.db = router.db_for_read(User)
+            self.__dict__['_principal_state'] = state
+        return state
+
+    @property
+    def pk(self):
+        return User._meta.pk.to_python(self._claims[api_settings.USER_ID_CLAIM])
+
+    id = pk
+
+    @property
+    def username(self):
+        return self._claims['username']
+
+    @property
+    def role(self):
+        return self._claims['role']
+
+    @property
+    def is_staff(self):
+        return self._claims['is_staff']
+
+    @property
+    def is_superuser(self):
+        return self._claims['is_superuser']
+
+    @property
+    def is_verified(self):
+        return self._claims['is_verified']
+
+    # Tokens are only issued to active users; deactivation bumps the auth version
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def is_moderator(self):
+        """Check if user is a moderator (journalist or NGO)."""
+        return self.role in User.MODERATOR_ROLES
+
+    def is_admin_user(self):
+        """Check if user is an admin."""
+        return self.role == 'admin'
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, User) and other.pk is not None and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"{self.username} ({dict(User.ROLE_CHOICES).get(self.role, self.role)})"
+
+
+class PrincipalRefreshToken(RefreshToken):
+    """
+    Refresh token whose claims (copied into access tokens) describe the user.
+    It also holds the user's session hash, which changes with the password.
+    """
+
+    no_copy_claims = RefreshToken.no_copy_claims + (SESSION_HASH_CLAIM,)
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.stamp(user)
+        return token
+
+    def stamp(self, user):
+        """Set the principal claims and current auth version from user."""
+        for claim, value in user.get_principal_claims().items():
+            self[claim] = value
+        self[AUTH_VERSION_CLAIM] = get_auth_version(user.pk) or 0
+        self[SESSION_HASH_CLAIM] = user.get_session_auth_hash()
+
+
+class PrincipalTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issue principal tokens from /api/v1/token/."""
+
+    token_class = PrincipalRefreshToken
+
+
+class PrincipalTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh against the user's current state: inactive or banned users and
+    refresh tokens issued before a password change are refused, and the
+    new access token carries the current claims.
+    """
+
+    token_class = PrincipalRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).first()
+        if user is None or not user_authentication_rule(user):
+            raise AuthenticationFailed('No active account found for the given token.', code='no_active_account')
+        if refresh.get(SESSION_HASH_CLAIM, user.get_session_auth_hash()) != user.get_session_auth_hash():
+            raise InvalidToken('Token has been revoked.')
+
+        refresh.stamp(user)
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # token_blacklist app not installed
+                    pass
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class BanAwareJWTAuthentication(JWTAuthentication):
+    """JWT authentication that rejects tokens of banned users."""
+
+    def get_user(self, validated_token):
+        """Check the ban set before loading the user."""
+        self.check_ban(validated_token)
+        return super().get_user(validated_token)
+
+    def check_ban(self, validated_token):
+        """Get the token's user id, rejecting banned users."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        if is_banned(user_id):
+            raise AuthenticationFailed('User is banned.', code='user_banned')
+        return user_id
+
+
+class StatelessJWTAuthentication(BanAwareJWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token's claims.
+    Tokens issued before claims were embedded fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if AUTH_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = self.check_ban(validated_token)
+        version = get_auth_version(user_id)
+        if version is None:
+            raise AuthenticationFailed('User not found.', code='user_not_found')
+        if validated_token[AUTH_VERSION_CLAIM] < version:
+            raise InvalidToken('Token has been revoked.')
+
+        return TokenPrincipal(validated_token.payload)
+
+
+def user_authentication_rule(user):
+    """Allow token issue only to active, unbanned users (SIMPLE_JWT USER_AUTHENTICATION_RULE)."""
+    return default_user_authentication_rule(user) and not is_banned(user.pk)
@@ -0,0 +1,66 @@
+"""
+Logging handlers for SatyaCheck backend.
+"""
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import os
+import queue
+import threading
+
+
+class QueuedRotatingFileHandler(QueueHandler):
+    """
+    RotatingFileHandler whose formatting and file I/O run on a background thread.
+
+    Logging calls only enqueue the record. When the queue is full the
+    caller blocks until there is room, so a slow disk slows logging down
+    instead of dropping records or growing memory.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.queue_size = queue_size
+        self.target = RotatingFileHandler(filename, maxBytes=maxBytes, backupCount=backupCount)
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, with the target's formatter
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def prepare(self, record):
+        # Records never leave the process, so they need no pickling-safe copy
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        self.queue.put(record)
+
+    def _ensure_listener(self):
+        """Start the listener thread, once per process (logging.shutdown() stops it)."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                # Forked child: the parent's listener thread did not survive the fork
+                self.queue = queue.Queue(maxsize=self.queue_size)
+            self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+            self.listener.start()
+            self._pid = pid
+
+    def close(self):
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self._pid = None
+        self.target.close()
+        super().close()
@@ -0,0 +1,197 @@
+"""
+Request metrics in Prometheus format.
+
+MetricsMiddleware times each request on the monotonic clock and records,
+per route (the resolved URL name, so /submissions/<id>/ is one series),
+latency, request and response sizes, and the number and total time of
+database queries. Metrics are served from /metrics to METRICS_ALLOWED_IPS.
+
+Under gunicorn each worker has its own copy of the metrics; setting
+PROMETHEUS_MULTIPROC_DIR makes workers write them to shared files that
+the endpoint adds up, so a scrape sees the whole server whichever worker
+answers it (see gunicorn.conf.py).
+
+Under ASGI, sync views run their queries on a worker thread the
+middleware never sees, so query timing does not wrap connections per
+request: every connection gets one wrapper when it connects, which
+reports to the QueryTimer in the request's context.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, REGISTRY, generate_latest, multiprocess
+)
+import os
+import time
+
+# Route label for requests that matched no URL pattern
+UNMATCHED_ROUTE = '<unmatched>'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000, 100000000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+request_latency = Histogram(
+    'satyacheck_http_request_duration_seconds',
+    'Time to respond to a request',
+    ['method', 'route', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+request_size = Histogram(
+    'satyacheck_http_request_size_bytes',
+    'Request body size',
+    ['method', 'route'],
+    buckets=SIZE_BUCKETS
+)
+response_size = Histogram(
+    'satyacheck_http_response_size_bytes',
+    'Response body size (streamed responses are not counted)',
+    ['method', 'route'],
+    buckets=SIZE_BUCKETS
+)
+db_queries = Histogram(
+    'satyacheck_db_queries_per_request',
+    'Database queries made by a request',
+    ['method', 'route'],
+    buckets=QUERY_COUNT_BUCKETS
+)
+db_time = Histogram(
+    'satyacheck_db_query_duration_seconds',
+    'Time a request spent in database queries',
+    ['method', 'route'],
+    buckets=LATENCY_BUCKETS
+)
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and their total time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.monotonic() - start
+            self.count += 1
+
+
+# QueryTimer of the request being measured, if any
+_query_timer = ContextVar('query_timer', default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(sender=None, connection=None, **kwargs):
+    """Report a connection's queries to the current request's QueryTimer."""
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(install_query_timer)
+
+
+def get_route(request):
+    """Get the URL name a request resolved to, for use as a label."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.view_name or match.route or UNMATCHED_ROUTE
+
+
+def _content_length(request):
+    try:
+        return int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return 0
+
+
+class MetricsMiddleware:
+    """
+    Record request metrics. Goes first in MIDDLEWARE so the timing covers
+    the rest of the middleware too. Runs natively in both sync and async
+    stacks.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        # Connections opened before this module was imported
+        for connection in connections.all():
+            install_query_timer(connection=connection)
+
+        timer = QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.monotonic()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        self._record(request, response, timer, time.monotonic() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.monotonic()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        self._record(request, response, timer, time.monotonic() - start)
+        return response
+
+    @staticmethod
+    def _record(request, response, timer, duration):
+        method = request.method
+        route = get_route(request)
+        request_latency.labels(method, route, response.status_code).observe(duration)
+        request_size.labels(method, route).observe(_content_length(request))
+        if not response.streaming:
+            response_size.labels(method, route).observe(len(response.content))
+        db_queries.labels(method, route).observe(timer.count)
+        db_time.labels(method, route).observe(timer.duration)
+
+
+def metrics_view(request):
+    """
+    Serve metrics in the Prometheus text format.
+    GET: /metrics
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
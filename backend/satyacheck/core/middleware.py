@@ -5,7 +5,9 @@ Handles request logging, audit trails, and security checks.
 
 import logging
 import json
-from django.utils.deprecation import MiddlewareMixin
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject, empty
 from django.contrib.auth.models import AnonymousUser
 from django.conf import settings
 
@@ -13,50 +15,88 @@ logger = logging.getLogger('satyacheck')
 audit_logger = logging.getLogger('satyacheck.audit')
 
 
-class RequestLoggingMiddleware(MiddlewareMixin):
+class HookMiddleware:
+    """
+    Base for middleware whose process_request() and process_response()
+    do no I/O. Unlike MiddlewareMixin, which runs them in a worker thread
+    under ASGI, they run inline in either mode, so async views such as
+    the submission event stream are reached without a thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.process_request(request) or self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = self.process_request(request) or await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_request(self, request):
+        return None
+
+    def process_response(self, request, response):
+        return response
+
+
+class RequestLoggingMiddleware(HookMiddleware):
     """
     Middleware to log all incoming HTTP requests.
     Captures method, path, user, and response status.
+    Messages are only built for records a logger will actually emit.
     """
 
     def process_request(self, request):
         """Log incoming request details."""
-        request._start_time = __import__('time').time()
+        request._start_time = time.monotonic()
         
-        # Capture request details
-        user = request.user.username if request.user.is_authenticated else 'AnonymousUser'
-        method = request.method
-        path = request.path
-        
-        logger.debug(f"Request: {method} {path} - User: {user}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request: %s %s - User: %s", request.method, request.path, self._get_username(request))
         
         return None
 
     def process_response(self, request, response):
         """Log response details."""
         if hasattr(request, '_start_time'):
-            duration = __import__('time').time() - request._start_time
-            user = request.user.username if request.user.is_authenticated else 'AnonymousUser'
+            duration = time.monotonic() - request._start_time
             method = request.method
             path = request.path
-            status = response.status_code
             
             # Log only important endpoints
-            if '/api/' in path:
+            if '/api/' in path and logger.isEnabledFor(logging.INFO):
                 logger.info(
-                    f"{method} {path} - Status: {status} - User: {user} - Duration: {duration:.2f}s"
+                    "%s %s - Status: %s - User: %s - Duration: %.2fs",
+                    method, path, response.status_code, self._get_username(request), duration
                 )
             
             # Audit log for sensitive operations
-            if method in ['POST', 'PATCH', 'PUT', 'DELETE'] and '/api/v1/submissions/' in path:
+            if method in ('POST', 'PATCH', 'PUT', 'DELETE') and '/api/v1/submissions/' in path \
+                    and audit_logger.isEnabledFor(logging.INFO):
                 audit_logger.info(
-                    f"Submission Action: {method} {path} - Status: {status} - User: {user}"
+                    "Submission Action: %s %s - Status: %s - User: %s",
+                    method, path, response.status_code, self._get_username(request)
                 )
         
         return response
 
+    def _get_username(self, request):
+        user = getattr(request, 'user', None)
+        if type(user) is SimpleLazyObject and user._wrapped is empty and iscoroutinefunction(self):
+            # Loading the session user queries the database, which the event loop must not do
+            return '<unresolved>'
+        return user.username if user is not None and user.is_authenticated else 'AnonymousUser'
+
 
-class SecurityHeadersMiddleware(MiddlewareMixin):
+class SecurityHeadersMiddleware(HookMiddleware):
     """
     Adds security headers to all responses.
     """
@@ -72,7 +112,7 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         return response
 
 
-class CORSMiddleware(MiddlewareMixin):
+class CORSMiddleware(HookMiddleware):
     """
     Custom CORS middleware to handle CORS headers.
     """
@@ -0,0 +1,207 @@
+"""
+Pagination classes for SatyaCheck API.
+"""
+
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import datetime
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.settings import api_settings
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on (created_at, id).
+
+    Each page is fetched with a WHERE clause on the last seen key instead of
+    an OFFSET, so deep pages cost the same as the first one. The total
+    COUNT(*) is skipped unless the client asks for it with ?include_count=true.
+
+    Ranked search results page on the rank cast to double precision. The
+    rank itself may be a single-precision float, whose value is not
+    exactly what reaches Python and the cursor, so comparing against the
+    cursor would match the page's last rows again.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+    ordering_query_param = 'ordering'
+    ordering_field = 'created_at'
+    tiebreak_field = 'id'
+    rank_field = 'search_rank'
+    rank_key_field = 'search_rank_key'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of results positioned by the request cursor."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request, queryset, view)
+        self.count = queryset.count() if self.include_count(request) else None
+        if self.field == self.rank_key_field:
+            queryset = queryset.annotate(**{self.rank_key_field: Cast(self.rank_field, FloatField())})
+
+        cursor = self.decode_cursor(request, queryset)
+        reverse = cursor is not None and cursor['reverse']
+
+        # Walk backwards through the ordering when paging to the previous page
+        scan_descending = self.descending != reverse
+        prefix = '-' if scan_descending else ''
+        queryset = queryset.order_by(prefix + self.field, prefix + self.tiebreak_field)
+
+        if cursor is not None:
+            queryset = queryset.filter(
+                self._position_filter(cursor['value'], cursor['id'], scan_descending)
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """Return paginated response with next/previous links."""
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the paginated response for API schema generation."""
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """Get page size from query params, bounded by max_page_size."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return (field, descending) for this request.
+        Ranked search results page by best match first. Otherwise only
+        ?ordering=created_at and ?ordering=-created_at are honoured;
+        anything else falls back to newest first.
+        """
+        if self.rank_field in queryset.query.annotations:
+            return self.rank_key_field, True
+
+        ordering = request.query_params.get(self.ordering_query_param, '')
+        if ordering == self.ordering_field:
+            return self.ordering_field, False
+        return self.ordering_field, True
+
+    def include_count(self, request):
+        """Check whether the client asked for a total count."""
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_next_link(self):
+        """Build link to the next page."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Build link to the previous page."""
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, item, reverse):
+        """Encode the position of item into a cursor URL."""
+        value = self._get_value(item, self.field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+
+        position = {
+            'v': value,
+            'i': str(self._get_value(item, self.tiebreak_field)),
+            'r': reverse,
+        }
+        encoded = b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, queryset):
+        """Decode the request cursor, or return None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            position = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            value = position['v']
+            if self.field == self.ordering_field:
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError(value)
+            else:
+                value = float(value)
+            return {
+                'value': value,
+                'id': queryset.model._meta.pk.to_python(position['i']),
+                'reverse': bool(position.get('r', False)),
+            }
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _position_filter(self, value, pk, descending):
+        """
+        Build the keyset condition (field, id) < (value, pk), or > when ascending.
+        The redundant range on field alone lets the database use the
+        leading column of the composite index.
+        """
+        lookup = 'lt' if descending else 'gt'
+        inclusive = 'lte' if descending else 'gte'
+
+        return Q(**{f'{self.field}__{inclusive}': value}) & (
+            Q(**{f'{self.field}__{lookup}': value}) |
+            Q(**{self.field: value, f'{self.tiebreak_field}__{lookup}': pk})
+        )
+
+    @staticmethod
+    def _get_value(item, name):
+        """Read a field from a model instance or a values() row."""
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
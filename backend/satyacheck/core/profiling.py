@@ -0,0 +1,274 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware profiles a request when it carries a profiling token
+(issued to admins, sent as the X-Profile header or a ?profile= query
+parameter) or when it is picked by PROFILING_SAMPLE_RATE. A profiled
+request runs under cProfile with every SQL statement recorded; queries
+run more than once with the same SQL are reported as duplicates, which
+is how N+1 patterns show up.
+
+Profiles are kept in Redis for PROFILING_TTL seconds (at most
+PROFILING_MAX_STORED of them) so any worker can serve them. The profile
+itself is stored in the pstats format, the same as cProfile's output
+files, and can be opened with pstats, snakeviz or speedscope.
+"""
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from contextlib import ExitStack
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.utils import timezone
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+import random
+import redis
+import time
+import uuid
+
+from satyacheck.core.metrics import get_route
+from satyacheck.services.redis_client import get_redis
+
+logger = logging.getLogger('satyacheck')
+
+TOKEN_SALT = 'satyacheck.profiling'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+
+# Sorted set of profile IDs by capture time
+PROFILE_INDEX_KEY = 'profiles'
+
+# Functions listed in a profile's summary
+TOP_FUNCTIONS = 25
+
+
+def _profile_key(profile_id):
+    return f'profile:{profile_id}'
+
+
+def issue_token(user):
+    """Get a token that has requests profiled for PROFILING_TOKEN_MAX_AGE seconds."""
+    return signing.dumps({'user': str(user.pk)}, salt=TOKEN_SALT)
+
+
+def read_token(token):
+    """Get the user ID a profiling token was issued to, or None if it is invalid."""
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)['user']
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+
+class QueryRecorder:
+    """Database execute wrapper recording each statement and its time."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.queries = []
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.monotonic() - start
+            self.count += 1
+            self.duration += duration
+            if len(self.queries) < self.limit:
+                self.queries.append({
+                    'sql': sql,
+                    'params': None if many else repr(params),
+                    'many': many,
+                    'duration_ms': round(duration * 1000, 3),
+                })
+
+    def duplicates(self):
+        """Get statements run more than once, most repeated first."""
+        groups = {}
+        for query in self.queries:
+            group = groups.setdefault(query['sql'], {'sql': query['sql'], 'count': 0, 'duration_ms': 0.0})
+            group['count'] += 1
+            group['duration_ms'] = round(group['duration_ms'] + query['duration_ms'], 3)
+        return sorted(
+            (group for group in groups.values() if group['count'] > 1),
+            key=lambda group: (-group['count'], -group['duration_ms'])
+        )
+
+
+def summarize(profiler):
+    """Get the functions with the most cumulative time, as text."""
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    return output.getvalue()
+
+
+def _redacted_path(request):
+    """Get the request path and query string, without the profiling token."""
+    query = request.GET.copy()
+    query.pop(PROFILE_PARAM, None)
+    return f'{request.path}?{query.urlencode()}' if query else request.path
+
+
+def save_profile(request, response, profiler, recorder, duration, trigger, requested_by):
+    """Store a profile, returning its ID (None if Redis is unavailable)."""
+    profile_id = uuid.uuid4().hex
+    captured_at = time.time()
+    profiler.create_stats()
+    # Before summarize(), as pstats.Stats takes the stats out of the profiler
+    data = marshal.dumps(profiler.stats)
+
+    report = {
+        'id': profile_id,
+        'method': request.method,
+        'path': _redacted_path(request),
+        'route': get_route(request),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 3),
+        'captured_at': timezone.now().isoformat(),
+        'trigger': trigger,
+        'requested_by': requested_by,
+        'query_count': recorder.count,
+        'query_time_ms': round(recorder.duration * 1000, 3),
+        'duplicate_queries': recorder.duplicates(),
+        'queries': recorder.queries,
+        'summary': summarize(profiler),
+    }
+
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        pipe.hset(_profile_key(profile_id), mapping={
+            'report': json.dumps(report, default=str),
+            'pstats': data,
+        })
+        pipe.expire(_profile_key(profile_id), settings.PROFILING_TTL)
+        pipe.zadd(PROFILE_INDEX_KEY, {profile_id: captured_at})
+        pipe.zremrangebyscore(PROFILE_INDEX_KEY, '-inf', captured_at - settings.PROFILING_TTL)
+        pipe.zrange(PROFILE_INDEX_KEY, 0, -settings.PROFILING_MAX_STORED - 1)
+        dropped = pipe.execute()[-1]
+
+        # Past PROFILING_MAX_STORED the oldest profiles go before their TTL
+        if dropped:
+            pipe = client.pipeline()
+            pipe.delete(*[_profile_key(old_id.decode()) for old_id in dropped])
+            pipe.zrem(PROFILE_INDEX_KEY, *dropped)
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not store profile of {request.path}: {str(e)}")
+        return None
+
+    return profile_id
+
+
+def list_profiles():
+    """Get the stored profiles' reports without their queries, newest first."""
+    client = get_redis()
+    profile_ids = [profile_id.decode() for profile_id in client.zrevrange(PROFILE_INDEX_KEY, 0, -1)]
+    if not profile_ids:
+        return []
+
+    pipe = client.pipeline()
+    for profile_id in profile_ids:
+        pipe.hget(_profile_key(profile_id), 'report')
+
+    profiles = []
+    for report in pipe.execute():
+        if report is None:
+            continue
+        report = json.loads(report)
+        report.pop('queries')
+        report.pop('summary')
+        report['duplicate_queries'] = len(report['duplicate_queries'])
+        profiles.append(report)
+    return profiles
+
+
+def get_report(profile_id):
+    """Get a stored profile's report, or None if it has expired."""
+    report = get_redis().hget(_profile_key(profile_id), 'report')
+    return json.loads(report) if report is not None else None
+
+
+def get_pstats(profile_id):
+    """Get a stored profile in the pstats file format, or None if it has expired."""
+    return get_redis().hget(_profile_key(profile_id), 'pstats')
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that ask for it or are sampled, adding an
+    X-Profile-Id header to their response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trigger, requested_by = self._should_profile(request)
+        if trigger is None:
+            return self.get_response(request)
+        return self._profile(request, self.get_response, trigger, requested_by)
+
+    async def __acall__(self, request):
+        trigger, requested_by = self._should_profile(request)
+        if trigger is None:
+            return await self.get_response(request)
+
+        # cProfile and the query recorder only see their own thread. Run the
+        # request from a worker thread: the sync views further down are then
+        # called back on that same thread rather than on another one.
+        return await sync_to_async(self._profile)(
+            request, async_to_sync(self.get_response), trigger, requested_by
+        )
+
+    @staticmethod
+    def _profile(request, get_response, trigger, requested_by):
+        profiler = cProfile.Profile()
+        recorder = QueryRecorder(settings.PROFILING_MAX_QUERIES)
+        start = time.monotonic()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this thread
+                return get_response(request)
+            try:
+                response = get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.monotonic() - start
+
+        profile_id = save_profile(request, response, profiler, recorder, duration, trigger, requested_by)
+        if profile_id is not None:
+            response['X-Profile-Id'] = profile_id
+        return response
+
+    @staticmethod
+    def _should_profile(request):
+        """Get (trigger, requesting user ID), or (None, None) to run normally."""
+        token = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+        if token:
+            user_id = read_token(token)
+            if user_id is not None:
+                return 'token', user_id
+
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sample', None
+        return None, None
@@ -52,6 +52,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'satyacheck.core.metrics.MetricsMiddleware',
+    'satyacheck.core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # 'whitenoise.middleware.WhiteNoiseMiddleware',  # Disabled for development
     'satyacheck.core.middleware.CORSMiddleware',
@@ -140,7 +142,7 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'satyacheck.core.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -153,9 +155,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ),
     'DEFAULT_THROTTLE_CLASSES': (
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'satyacheck.core.throttling.AnonTokenBucketThrottle',
+        'satyacheck.core.throttling.UserTokenBucketThrottle',
     ),
+    # Token budgets per period, spent according to THROTTLE_COSTS
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
         'user': '1000/hour',
@@ -166,6 +169,21 @@ REST_FRAMEWORK = {
 }
 
 # JWT Configuration
+# Tokens each kind of request takes from its rate limit bucket (see satyacheck.core.throttling)
+THROTTLE_COSTS = {
+    'read': 1,
+    'write': 2,
+    'submission_text': 5,
+    'submission_link': 10,
+    'submission_image': 20,
+    'submission_audio': 40,
+    'submission_video': 60,
+    'bulk_ingest_item': 2,
+    'text_analysis': 10,
+    'image_analysis': 30,
+    'url_analysis': 30,
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=config('JWT_EXPIRATION_HOURS', default=24, cast=int)),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -184,10 +202,10 @@ SIMPLE_JWT = {
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
-    'USER_AUTHENTICATION_RULE': 'rest_framework_simplejwt.authentication.default_user_authentication_rule',
+    'USER_AUTHENTICATION_RULE': 'satyacheck.core.authentication.user_authentication_rule',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
-    'TOKEN_OBTAIN_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenObtainPairSerializer',
-    'TOKEN_REFRESH_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenRefreshSerializer',
+    'TOKEN_OBTAIN_SERIALIZER': 'satyacheck.core.authentication.PrincipalTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'satyacheck.core.authentication.PrincipalTokenRefreshSerializer',
     'TOKEN_VERIFY_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenVerifySerializer',
     'TOKEN_BLACKLIST_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenBlacklistSerializer',
     'SLIDING_TOKEN_REFRESH_SERIALIZER': 'rest_framework_simplejwt.serializers.TokenRefreshSlidingSerializer',
@@ -197,14 +215,50 @@ SIMPLE_JWT = {
 # Redis Configuration
 REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 
-# Caching
+# Caching (shared across web and Celery processes)
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'satyacheck-cache',
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache'),
+        'LOCATION': config('CACHE_URL', default=REDIS_URL),
+        'KEY_PREFIX': 'satyacheck',
     }
 }
 
+# Two-tier cache service (see satyacheck.services.cache_service)
+CACHE_SERVICE_ALIAS = 'default'
+CACHE_DEFAULT_TIMEOUT = config('CACHE_DEFAULT_TIMEOUT', default=300, cast=int)
+CACHE_LOCAL_TIMEOUT = config('CACHE_LOCAL_TIMEOUT', default=5, cast=int)
+CACHE_LOCAL_MAX_ENTRIES = config('CACHE_LOCAL_MAX_ENTRIES', default=1024, cast=int)
+CACHE_LOCK_TIMEOUT = config('CACHE_LOCK_TIMEOUT', default=30, cast=int)
+CACHE_LOCK_WAIT = config('CACHE_LOCK_WAIT', default=5, cast=float)
+CACHE_REFRESH_AHEAD = config('CACHE_REFRESH_AHEAD', default=0.8, cast=float)
+
+ANALYSIS_CACHE_TIMEOUT = config('ANALYSIS_CACHE_TIMEOUT', default=86400, cast=int)
+SCRAPE_CACHE_TIMEOUT = config('SCRAPE_CACHE_TIMEOUT', default=3600, cast=int)
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=60, cast=int)
+ADMIN_DASHBOARD_CACHE_TIMEOUT = config('ADMIN_DASHBOARD_CACHE_TIMEOUT', default=30, cast=int)
+# Seconds before a ban issued in another process applies in this one
+BAN_CACHE_REFRESH = config('BAN_CACHE_REFRESH', default=5, cast=float)
+# Per-process cache of users loaded for token-authenticated requests
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=1024, cast=int)
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=30, cast=int)
+# Seconds before a token revocation in another process applies in this one
+AUTH_VERSION_CACHE_TIMEOUT = config('AUTH_VERSION_CACHE_TIMEOUT', default=5, cast=int)
+# Seconds auth versions are cached in Redis (the database holds them)
+AUTH_VERSION_REDIS_TTL = config('AUTH_VERSION_REDIS_TTL', default=600, cast=int)
+
+# Prometheus metrics (see satyacheck.core.metrics); served at /metrics to these addresses
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=Csv())
+
+# Request profiling (see satyacheck.core.profiling)
+# Fraction of requests profiled without a token
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=3600, cast=int)
+PROFILING_TTL = config('PROFILING_TTL', default=86400, cast=int)
+PROFILING_MAX_STORED = config('PROFILING_MAX_STORED', default=200, cast=int)
+PROFILING_MAX_QUERIES = config('PROFILING_MAX_QUERIES', default=2000, cast=int)
+
 # Celery Configuration (for background tasks)
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
@@ -215,6 +269,31 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 
+# Periodic Tasks
+SUBMISSION_STATISTICS_REBUILD_INTERVAL = config('SUBMISSION_STATISTICS_REBUILD_INTERVAL', default=3600, cast=int)
+ACTIVITY_MAINTENANCE_INTERVAL = config('ACTIVITY_MAINTENANCE_INTERVAL', default=86400, cast=int)
+MODERATION_RESCORE_INTERVAL = config('MODERATION_RESCORE_INTERVAL', default=900, cast=int)
+BAN_SET_REBUILD_INTERVAL = config('BAN_SET_REBUILD_INTERVAL', default=300, cast=int)
+
+CELERY_BEAT_SCHEDULE = {
+    'rebuild-submission-statistics': {
+        'task': 'satyacheck.apps.submissions.tasks.rebuild_submission_statistics',
+        'schedule': SUBMISSION_STATISTICS_REBUILD_INTERVAL,
+    },
+    'maintain-activity-partitions': {
+        'task': 'satyacheck.apps.users.tasks.maintain_activity_partitions',
+        'schedule': ACTIVITY_MAINTENANCE_INTERVAL,
+    },
+    'rescore-moderation-queue': {
+        'task': 'satyacheck.apps.admin_panel.tasks.rescore_moderation_queue',
+        'schedule': MODERATION_RESCORE_INTERVAL,
+    },
+    'rebuild-ban-set': {
+        'task': 'satyacheck.apps.admin_panel.tasks.rebuild_ban_set',
+        'schedule': BAN_SET_REBUILD_INTERVAL,
+    },
+}
+
 # Email Configuration (for OTP and notifications)
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -223,6 +302,19 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 DEFAULT_FROM_EMAIL = config('EMAIL_HOST_USER', default='noreply@satyacheck.com')
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
+
+# SMS Configuration (HTTP provider, used for phone OTPs)
+SMS_API_URL = config('SMS_API_URL', default='')
+SMS_API_KEY = config('SMS_API_KEY', default='')
+SMS_SENDER = config('SMS_SENDER', default='SatyaCheck')
+SMS_TIMEOUT = config('SMS_TIMEOUT', default=10, cast=int)
+
+# One-Time Passwords (held in Redis)
+OTP_TTL = config('OTP_TTL', default=600, cast=int)
+OTP_MAX_ATTEMPTS = config('OTP_MAX_ATTEMPTS', default=5, cast=int)
+# Seconds the delivery task has to pick up a code before it is dropped
+OTP_DELIVERY_TTL = config('OTP_DELIVERY_TTL', default=300, cast=int)
 
 # AWS S3 Configuration (optional for file uploads)
 USE_S3 = config('USE_S3', default=False, cast=bool)
@@ -242,9 +334,60 @@ if USE_S3:
 AI_MODEL_NAME = config('AI_MODEL_NAME', default='distilbert-base-uncased')
 AI_CONFIDENCE_THRESHOLD = config('AI_CONFIDENCE_THRESHOLD', default=0.5, cast=float)
 USE_GPU = config('USE_GPU', default=False, cast=bool)
+ANALYSIS_BATCH_SIZE = config('ANALYSIS_BATCH_SIZE', default=32, cast=int)
+# Hours of analysis stage timings kept in the rolling histograms
+ANALYSIS_TIMING_WINDOW_HOURS = config('ANALYSIS_TIMING_WINDOW_HOURS', default=24, cast=int)
+
+# HTTP Caching for Submission Reads
+SUBMISSION_VALIDATOR_CACHE_TIMEOUT = config('SUBMISSION_VALIDATOR_CACHE_TIMEOUT', default=300, cast=int)
+PUBLIC_RESULT_CACHE_MAX_AGE = config('PUBLIC_RESULT_CACHE_MAX_AGE', default=60, cast=int)
+
+# Server-Sent Events (submission status streams, served by the ASGI app)
+SSE_HEARTBEAT_INTERVAL = config('SSE_HEARTBEAT_INTERVAL', default=15, cast=int)
+SSE_MAX_DURATION = config('SSE_MAX_DURATION', default=600, cast=int)
+SSE_QUEUE_SIZE = config('SSE_QUEUE_SIZE', default=16, cast=int)
+# Seconds a stream ticket can be used to open a submission's event stream
+SSE_TICKET_MAX_AGE = config('SSE_TICKET_MAX_AGE', default=60, cast=int)
+
+# Full-Text Search
+SEARCH_MAX_RESULTS = config('SEARCH_MAX_RESULTS', default=1000, cast=int)
+
+# Analysis Coalescing (identical content is analyzed once)
+ANALYSIS_COALESCE_RETRY_DELAY = config('ANALYSIS_COALESCE_RETRY_DELAY', default=10, cast=int)
+ANALYSIS_COALESCE_MAX_RETRIES = config('ANALYSIS_COALESCE_MAX_RETRIES', default=30, cast=int)
+ANALYSIS_RESULT_REUSE_WINDOW = config('ANALYSIS_RESULT_REUSE_WINDOW', default=86400, cast=int)
+
+# User Activity (buffered in-process, written with bulk_create)
+ACTIVITY_BATCH_SIZE = config('ACTIVITY_BATCH_SIZE', default=200, cast=int)
+ACTIVITY_FLUSH_INTERVAL = config('ACTIVITY_FLUSH_INTERVAL', default=2.0, cast=float)
+ACTIVITY_BUFFER_MAX_SIZE = config('ACTIVITY_BUFFER_MAX_SIZE', default=5000, cast=int)
+# Monthly partitions (PostgreSQL); older months are rolled up into UserStatistic and dropped
+ACTIVITY_RETENTION_MONTHS = config('ACTIVITY_RETENTION_MONTHS', default=12, cast=int)
+ACTIVITY_PARTITIONS_AHEAD = config('ACTIVITY_PARTITIONS_AHEAD', default=3, cast=int)
+
+# Reports (stored daily partials are trusted once their day is this many days old)
+REPORT_PARTIAL_SETTLE_DAYS = config('REPORT_PARTIAL_SETTLE_DAYS', default=2, cast=int)
+# Rows fetched per round trip (and per Parquet row group) when exporting submissions
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Moderation Queue (priority 0-100 from misinformation score and virality, plus age)
+MODERATION_HIGH_PRIORITY = config('MODERATION_HIGH_PRIORITY', default=70, cast=float)
+MODERATION_MEDIUM_PRIORITY = config('MODERATION_MEDIUM_PRIORITY', default=40, cast=float)
+MODERATION_AGE_POINTS_PER_HOUR = config('MODERATION_AGE_POINTS_PER_HOUR', default=1.0, cast=float)
+# Duplicate count at which virality scores its maximum
+MODERATION_VIRALITY_SATURATION = config('MODERATION_VIRALITY_SATURATION', default=50, cast=int)
+# Claimed items go back to the queue if not completed within the lease
+MODERATION_LEASE_SECONDS = config('MODERATION_LEASE_SECONDS', default=900, cast=int)
+MODERATION_MAX_CLAIM = config('MODERATION_MAX_CLAIM', default=50, cast=int)
+
+# Bulk Submission Ingestion
+BULK_SUBMISSION_MAX_ITEMS = config('BULK_SUBMISSION_MAX_ITEMS', default=1000, cast=int)
+BULK_SUBMISSION_INSERT_BATCH_SIZE = config('BULK_SUBMISSION_INSERT_BATCH_SIZE', default=500, cast=int)
 
 # Logging Configuration
 LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+# File handlers write on a background thread; callers block once this many records are waiting
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
 
 LOGGING = {
     'version': 1,
@@ -276,24 +419,27 @@ LOGGING = {
         },
         'file': {
             'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
+            'class': 'satyacheck.core.log_handlers.QueuedRotatingFileHandler',
             'filename': BASE_DIR / 'logs' / 'satyacheck.log',
+            'queue_size': LOG_QUEUE_SIZE,
             'maxBytes': 1024 * 1024 * 15,  # 15MB
             'backupCount': 10,
             'formatter': 'verbose',
         },
         'audit_file': {
             'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
+            'class': 'satyacheck.core.log_handlers.QueuedRotatingFileHandler',
             'filename': BASE_DIR / 'logs' / 'audit.log',
+            'queue_size': LOG_QUEUE_SIZE,
             'maxBytes': 1024 * 1024 * 15,
             'backupCount': 10,
             'formatter': 'verbose',
         },
         'ai_file': {
             'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
+            'class': 'satyacheck.core.log_handlers.QueuedRotatingFileHandler',
             'filename': BASE_DIR / 'logs' / 'ai_analysis.log',
+            'queue_size': LOG_QUEUE_SIZE,
             'maxBytes': 1024 * 1024 * 15,
             'backupCount': 10,
             'formatter': 'verbose',
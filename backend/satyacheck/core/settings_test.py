@@ -0,0 +1,48 @@
+"""
+Settings for the test suite (see pytest.ini).
+
+The models use PostgreSQL array and search vector fields, so the tests
+need PostgreSQL: point the DB_* variables at a server where DB_USER may
+create the test database. Redis is replaced by an in-memory fake in
+conftest.py, and Celery tasks are only queued, never run.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import config
+
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME', default='satyacheck'),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'KEY_PREFIX': 'satyacheck',
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+
+METRICS_ENABLED = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'null': {'class': 'logging.NullHandler'},
+    },
+    'root': {'handlers': ['null']},
+}
@@ -0,0 +1,97 @@
+"""
+Tests for auth version revocation of access tokens.
+"""
+
+import pytest
+
+from satyacheck.apps.users.models import User
+from satyacheck.core import authentication
+from satyacheck.core.authentication import bump_auth_version, get_auth_version
+from satyacheck.services.redis_client import get_redis
+
+URL = '/api/v1/auth/profile/'
+
+pytestmark = pytest.mark.django_db
+
+
+def forget_versions():
+    """As if in another process: nothing cached locally."""
+    authentication._versions.clear_prefix('')
+
+
+def test_bump_revokes_issued_tokens(user_client, user):
+    assert user_client.get(URL).status_code == 200
+
+    bump_auth_version(user.pk)
+
+    assert user_client.get(URL).status_code == 401
+    user.refresh_from_db()
+    assert user.auth_version == 1
+
+
+def test_tokens_issued_after_bump_are_accepted(api_client, authenticate, user):
+    bump_auth_version(user.pk)
+
+    assert authenticate(api_client, user).get(URL).status_code == 200
+
+
+def test_role_change_revokes_tokens(user_client, user):
+    user.role = 'journalist'
+    user.save()
+
+    assert user_client.get(URL).status_code == 401
+
+
+def test_revocation_holds_while_redis_is_down(user_client, user, redis_server):
+    bump_auth_version(user.pk)
+    forget_versions()
+    redis_server.connected = False
+
+    assert user_client.get(URL).status_code == 401
+
+
+def test_bump_is_stored_while_redis_is_down(user_client, user, redis_server):
+    redis_server.connected = False
+
+    bump_auth_version(user.pk)
+
+    user.refresh_from_db()
+    assert user.auth_version == 1
+    forget_versions()
+    assert user_client.get(URL).status_code == 401
+
+
+def test_stale_instance_does_not_roll_back_the_version(user):
+    stale = User.objects.get(pk=user.pk)
+    bump_auth_version(user.pk)
+
+    stale.bio = 'Edited'
+    stale.save()
+
+    stale.refresh_from_db()
+    assert stale.auth_version == 1
+
+
+def test_cache_never_moves_backwards(user):
+    bump_auth_version(user.pk)
+    bump_auth_version(user.pk)
+
+    # A reader that loaded the version before the bumps
+    assert authentication._cache_version(str(user.pk), 0) == 2
+    assert int(get_redis().get(authentication._version_key(user.pk))) == 2
+
+
+def test_version_is_cached_in_redis(user, django_assert_num_queries):
+    get_auth_version(user.pk)
+    forget_versions()
+
+    with django_assert_num_queries(0):
+        assert get_auth_version(user.pk) == 0
+    assert get_redis().ttl(authentication._version_key(user.pk)) > 0
+
+
+def test_deleted_users_tokens_are_rejected(user_client, user):
+    user.delete()
+    forget_versions()
+
+    assert user_client.get(URL).status_code == 401
@@ -0,0 +1,79 @@
+"""
+Tests for request metrics.
+"""
+
+import pytest
+from django.db import connection
+from prometheus_client import REGISTRY
+
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory
+from satyacheck.core.metrics import UNMATCHED_ROUTE, install_query_timer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def metrics_enabled(settings):
+    settings.METRICS_ENABLED = True
+    install_query_timer(connection=connection)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_labelled_by_route_not_path(user_client, user):
+    first, second = SubmissionFactory.create_batch(2, user=user)
+    labels = {'method': 'GET', 'route': 'submission-detail', 'status': '200'}
+    before = sample('satyacheck_http_request_duration_seconds_count', **labels)
+
+    for submission in (first, second):
+        assert user_client.get(f'/api/v1/submissions/{submission.id}/').status_code == 200
+
+    assert sample('satyacheck_http_request_duration_seconds_count', **labels) - before == 2
+
+
+def test_unmatched_paths_share_one_route(client):
+    labels = {'method': 'GET', 'route': UNMATCHED_ROUTE, 'status': '404'}
+    before = sample('satyacheck_http_request_duration_seconds_count', **labels)
+
+    client.get('/no/such/page/')
+    client.get('/nor/this/one/')
+
+    assert sample('satyacheck_http_request_duration_seconds_count', **labels) - before == 2
+
+
+def test_query_count_and_response_size_are_recorded(user_client):
+    labels = {'method': 'GET', 'route': 'profile'}
+    queries_before = sample('satyacheck_db_queries_per_request_sum', **labels)
+    size_before = sample('satyacheck_http_response_size_bytes_sum', **labels)
+
+    response = user_client.get('/api/v1/auth/profile/')
+
+    assert sample('satyacheck_db_queries_per_request_sum', **labels) > queries_before
+    assert sample('satyacheck_http_response_size_bytes_sum', **labels) - size_before == len(response.content)
+
+
+def test_nothing_recorded_when_disabled(settings, client):
+    settings.METRICS_ENABLED = False
+    labels = {'method': 'GET', 'route': UNMATCHED_ROUTE, 'status': '404'}
+    before = sample('satyacheck_http_request_duration_seconds_count', **labels)
+
+    client.get('/no/such/page/')
+
+    assert sample('satyacheck_http_request_duration_seconds_count', **labels) == before
+
+
+def test_metrics_served_to_allowed_addresses(client, settings):
+    settings.METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert b'satyacheck_http_request_duration_seconds' in response.content
+
+
+def test_metrics_hidden_from_other_addresses(client, settings):
+    settings.METRICS_ALLOWED_IPS = ['10.0.0.1']
+
+    assert client.get('/metrics').status_code == 404
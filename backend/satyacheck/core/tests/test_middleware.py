@@ -0,0 +1,60 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from prometheus_client import REGISTRY
+
+from satyacheck.apps.users.models import User
+from satyacheck.core.metrics import MetricsMiddleware, UNMATCHED_ROUTE, install_query_timer
+from satyacheck.core.middleware import CORSMiddleware, RequestLoggingMiddleware, SecurityHeadersMiddleware
+from satyacheck.core.profiling import ProfilingMiddleware
+
+MIDDLEWARE = [MetricsMiddleware, ProfilingMiddleware, CORSMiddleware, RequestLoggingMiddleware, SecurityHeadersMiddleware]
+
+
+def sync_view(request):
+    return HttpResponse('ok')
+
+
+async def async_view(request):
+    return HttpResponse('ok')
+
+
+@pytest.mark.parametrize('middleware', MIDDLEWARE)
+def test_middleware_follows_the_stack_mode(middleware):
+    assert not iscoroutinefunction(middleware(sync_view))
+    assert iscoroutinefunction(middleware(async_view))
+
+
+@pytest.mark.parametrize('middleware', MIDDLEWARE)
+def test_middleware_serves_async_view(middleware):
+    request = RequestFactory().get('/api/v1/health/')
+
+    response = async_to_sync(middleware(async_view))(request)
+
+    assert response.content == b'ok'
+
+
+def test_security_headers_added_in_async_mode():
+    response = async_to_sync(SecurityHeadersMiddleware(async_view))(RequestFactory().get('/'))
+
+    assert response['X-Frame-Options'] == 'DENY'
+
+
+@pytest.mark.django_db
+def test_metrics_count_queries_made_from_sync_code_under_async(settings):
+    settings.METRICS_ENABLED = True
+    # As if the connection had been opened after the metrics module was imported
+    install_query_timer(connection=connection)
+    labels = {'method': 'GET', 'route': UNMATCHED_ROUTE}
+    before = REGISTRY.get_sample_value('satyacheck_db_queries_per_request_sum', labels) or 0
+
+    async def view(request):
+        await sync_to_async(User.objects.count)()
+        await sync_to_async(User.objects.count)()
+        return HttpResponse('ok')
+
+    async_to_sync(MetricsMiddleware(view))(RequestFactory().get('/'))
+
+    assert REGISTRY.get_sample_value('satyacheck_db_queries_per_request_sum', labels) - before == 2
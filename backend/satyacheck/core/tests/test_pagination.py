@@ -0,0 +1,102 @@
+"""
+Tests for keyset pagination.
+"""
+
+from base64 import b64encode
+from datetime import timedelta
+from django.utils import timezone
+import json
+import pytest
+
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory
+
+URL = '/api/v1/submissions/'
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def submissions(user):
+    """Seven submissions, three of them created at the same instant."""
+    submissions = SubmissionFactory.create_batch(7, user=user)
+    now = timezone.now()
+    for i, submission in enumerate(submissions):
+        created_at = now if i < 3 else now - timedelta(minutes=i)
+        Submission.objects.filter(pk=submission.pk).update(created_at=created_at)
+    return submissions
+
+
+def _walk(client, url, link='next', max_pages=50):
+    ids = []
+    while url:
+        assert max_pages, 'paging did not end'
+        max_pages -= 1
+        response = client.get(url)
+        assert response.status_code == 200
+        ids.extend(row['id'] for row in response.data['results'])
+        url = response.data[link]
+    return ids, response
+
+
+def test_pages_cover_every_row_once_newest_first(user_client, submissions):
+    ids, _ = _walk(user_client, f'{URL}?page_size=2')
+
+    expected = Submission.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+    assert ids == [str(pk) for pk in expected]
+
+
+def test_previous_links_walk_back_through_the_same_pages(user_client, submissions):
+    forward, last_page = _walk(user_client, f'{URL}?page_size=3')
+
+    backward = [row['id'] for row in last_page.data['results']]
+    url = last_page.data['previous']
+    while url:
+        response = user_client.get(url)
+        backward[:0] = [row['id'] for row in response.data['results']]
+        url = response.data['previous']
+
+    assert backward == forward
+
+
+def test_ascending_ordering(user_client, submissions):
+    ids, _ = _walk(user_client, f'{URL}?page_size=4&ordering=created_at')
+
+    expected = Submission.objects.order_by('created_at', 'id').values_list('id', flat=True)
+    assert ids == [str(pk) for pk in expected]
+
+
+def test_count_only_on_request(user_client, submissions):
+    assert 'count' not in user_client.get(URL).data
+    assert user_client.get(f'{URL}?include_count=true').data['count'] == 7
+
+
+def test_invalid_cursor_is_not_found(user_client, submissions):
+    assert user_client.get(f'{URL}?cursor=not-a-cursor').status_code == 404
+
+
+def test_page_query_does_not_use_offset(user_client, submissions, django_assert_num_queries):
+    cursor = user_client.get(f'{URL}?page_size=2').data['next']
+
+    with django_assert_num_queries(1) as queries:
+        user_client.get(cursor)
+
+    assert 'OFFSET' not in queries.captured_queries[0]['sql']
+
+
+def test_ranked_search_pages_cover_every_match_once(user_client, user):
+    matches = [
+        SubmissionFactory(user=user, title='Report', text_content=f"{'flood ' * (i % 4 + 1)}warning for district {i}")
+        for i in range(10)
+    ]
+    SubmissionFactory(user=user, title='Report', text_content='Unrelated rumour')
+
+    ids, _ = _walk(user_client, f'{URL}?search=flood&page_size=3')
+
+    assert sorted(ids) == sorted(str(submission.id) for submission in matches)
+
+
+def test_cursor_with_malformed_id_is_not_found(user_client, submissions):
+    cursor = b64encode(json.dumps({'v': timezone.now().isoformat(), 'i': 'zzz'}).encode()).decode()
+
+    assert user_client.get(URL, {'cursor': cursor}).status_code == 404
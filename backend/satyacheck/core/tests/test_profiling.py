@@ -0,0 +1,110 @@
+"""
+Tests for on-demand request profiling.
+"""
+
+import marshal
+
+import pytest
+from rest_framework.test import APIClient
+
+from satyacheck.apps.submissions.tests.factories import SubmissionFactory
+from satyacheck.core import profiling
+from satyacheck.core.profiling import QueryRecorder
+
+PROFILES = '/api/v1/admin/profiles/'
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user_client(authenticate, user):
+    """Profiled requests come from a client of their own."""
+    return authenticate(APIClient(), user)
+
+
+@pytest.fixture
+def token(admin_client):
+    response = admin_client.post(f'{PROFILES}token/')
+    assert response.status_code == 200
+    return response.data['token']
+
+
+def test_only_admins_get_tokens(user_client):
+    assert user_client.post(f'{PROFILES}token/').status_code == 403
+
+
+def test_token_profiles_the_request(user_client, token, admin_client):
+    SubmissionFactory.create_batch(2)
+
+    response = user_client.get('/api/v1/submissions/', HTTP_X_PROFILE=token)
+
+    profile_id = response['X-Profile-Id']
+    report = admin_client.get(f'{PROFILES}{profile_id}/').data
+    assert report['trigger'] == 'token'
+    assert report['status'] == 200
+    assert report['route'] == 'submission-list'
+    assert report['query_count'] == len(report['queries']) > 0
+    assert 'cumulative' in report['summary']
+
+
+def test_token_is_not_stored_with_the_path(user_client, token, admin_client):
+    response = user_client.get(f'/api/v1/submissions/?profile={token}&page_size=5')
+
+    report = admin_client.get(f"{PROFILES}{response['X-Profile-Id']}/").data
+    assert report['path'] == '/api/v1/submissions/?page_size=5'
+
+
+def test_invalid_token_is_ignored(user_client):
+    response = user_client.get('/api/v1/submissions/', HTTP_X_PROFILE='forged')
+
+    assert response.status_code == 200
+    assert not response.has_header('X-Profile-Id')
+
+
+def test_sampled_requests_are_profiled(user_client, settings):
+    settings.PROFILING_SAMPLE_RATE = 1.0
+
+    response = user_client.get('/api/v1/submissions/')
+
+    assert profiling.get_report(response['X-Profile-Id'])['trigger'] == 'sample'
+
+
+def test_download_is_a_pstats_file(user_client, token, admin_client):
+    profile_id = user_client.get('/api/v1/submissions/', HTTP_X_PROFILE=token)['X-Profile-Id']
+
+    response = admin_client.get(f'{PROFILES}{profile_id}/download/')
+
+    assert response.status_code == 200
+    assert response['Content-Disposition'] == f'attachment; filename="profile-{profile_id}.prof"'
+    stats = marshal.loads(response.content)
+    assert any(function == 'list' for _, _, function in stats)
+
+
+def test_listing_is_newest_first_and_bounded(user_client, token, admin_client, settings):
+    settings.PROFILING_MAX_STORED = 2
+    ids = [user_client.get('/api/v1/submissions/', HTTP_X_PROFILE=token)['X-Profile-Id'] for _ in range(3)]
+
+    profiles = admin_client.get(PROFILES).data
+
+    assert [profile['id'] for profile in profiles] == ids[:0:-1]
+    assert 'queries' not in profiles[0]
+    assert admin_client.get(f'{PROFILES}{ids[0]}/').status_code == 404
+
+
+def test_recorder_reports_repeated_statements():
+    recorder = QueryRecorder(limit=10)
+    execute = lambda sql, params, many, context: None
+    for sql in ('SELECT 1', 'SELECT 2', 'SELECT 1', 'SELECT 1', 'SELECT 2', 'SELECT 3'):
+        recorder(execute, sql, (), False, {})
+
+    assert [(group['sql'], group['count']) for group in recorder.duplicates()] == [('SELECT 1', 3), ('SELECT 2', 2)]
+    assert recorder.count == 6
+
+
+def test_recorder_keeps_counting_past_its_limit():
+    recorder = QueryRecorder(limit=2)
+    for _ in range(5):
+        recorder(lambda *args: None, 'SELECT 1', (), False, {})
+
+    assert recorder.count == 5
+    assert len(recorder.queries) == 2
@@ -0,0 +1,102 @@
+"""
+Tests for the Redis token bucket throttle.
+"""
+
+import pytest
+import redis
+from django.test import RequestFactory
+
+from satyacheck.core import throttling
+from satyacheck.services.redis_client import get_redis
+
+
+class BucketThrottle(throttling.TokenBucketThrottle):
+    rate = '3/minute'
+
+    def get_cache_key(self, request, view):
+        return 'throttle_test_client'
+
+
+class View:
+    action = 'list'
+
+
+class CostlyView(View):
+    action = 'analyze'
+    throttle_costs = {'analyze': 'write'}
+
+
+def take(view=None, method='get'):
+    throttle = BucketThrottle()
+    request = getattr(RequestFactory(), method)('/')
+    return throttle.allow_request(request, view or View()), throttle
+
+
+def test_bucket_allows_its_capacity_then_refuses():
+    assert [take()[0] for _ in range(3)] == [True, True, True]
+
+    allowed, throttle = take()
+
+    assert not allowed
+    assert throttle.tokens == pytest.approx(0, abs=0.01)
+    # One token refills every 20 seconds
+    assert 0 < throttle.wait() <= 20
+
+
+def test_requests_are_charged_by_cost(settings):
+    settings.THROTTLE_COSTS = dict(settings.THROTTLE_COSTS, read=1, write=2)
+
+    allowed, throttle = take(CostlyView())
+    assert allowed
+    assert throttle.tokens == pytest.approx(1, abs=0.01)
+
+    allowed, throttle = take(CostlyView())
+    assert not allowed
+    assert take()[0]
+
+
+def test_views_can_price_requests(settings):
+    class PricedView(View):
+        def get_throttle_cost(self, request):
+            return 2
+
+    assert throttling.get_request_cost(RequestFactory().get('/'), PricedView()) == 2
+    assert throttling.get_request_cost(RequestFactory().post('/'), View()) == settings.THROTTLE_COSTS['write']
+
+
+def test_cost_above_capacity_is_capped():
+    class HugeView(View):
+        def get_throttle_cost(self, request):
+            return 100
+
+    assert take(HugeView())[0]
+    assert not take()[0]
+
+
+def test_bucket_refills_over_time():
+    for _ in range(3):
+        take()
+    assert not take()[0]
+
+    # As if a minute had passed since the last request
+    key = 'throttle_test_client:bucket'
+    get_redis().hset(key, 'ts', float(get_redis().hget(key, 'ts')) - 60)
+
+    assert [take()[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_bucket_expires_once_full_again():
+    take()
+
+    ttl = get_redis().pttl('throttle_test_client:bucket')
+
+    assert 1000 < ttl <= 21000
+
+
+def test_requests_allowed_while_redis_is_down(monkeypatch):
+    def unavailable():
+        raise redis.ConnectionError('down')
+
+    monkeypatch.setattr(throttling, '_get_script', unavailable)
+
+    assert all(take()[0] for _ in range(5))
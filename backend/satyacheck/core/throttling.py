@@ -0,0 +1,129 @@
+"""
+Rate limiting shared by every worker.
+
+Each client has a token bucket in Redis holding up to the scope's rate
+(e.g. 1000 for '1000/hour'), refilled continuously over the period.
+Requests take tokens according to what they cost: reads cost
+THROTTLE_COSTS['read'], and views can charge more for expensive actions,
+so inference capacity is shared by cost rather than request count.
+The refill and charge run as one Lua script, so concurrent requests in
+different processes cannot overspend a bucket.
+"""
+
+from django.conf import settings
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle, UserRateThrottle
+import logging
+import redis
+import time
+
+from satyacheck.services.redis_client import get_redis
+
+logger = logging.getLogger('satyacheck')
+
+# KEYS[1] bucket; ARGV capacity, refill per second, cost.
+# Returns {allowed, tokens left, seconds until cost is available}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(wait)}
+"""
+
+_script = None
+_error_logged_at = None
+
+
+def _get_script():
+    global _script
+    if _script is None:
+        _script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+    return _script
+
+
+def get_request_cost(request, view):
+    """
+    Get the tokens a request costs.
+    Views may define get_throttle_cost(request), or map action names to
+    THROTTLE_COSTS entries in throttle_costs; anything else is charged
+    as a read or a write.
+    """
+    if hasattr(view, 'get_throttle_cost'):
+        cost = view.get_throttle_cost(request)
+        if cost is not None:
+            return cost
+
+    name = getattr(view, 'throttle_costs', {}).get(getattr(view, 'action', None))
+    if name is None:
+        name = 'read' if request.method in ('GET', 'HEAD', 'OPTIONS') else 'write'
+    return settings.THROTTLE_COSTS[name]
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Cost-weighted token bucket in Redis.
+    Subclasses supply scope and get_cache_key() as for SimpleRateThrottle.
+    If Redis is unreachable requests are let through.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity = self.num_requests
+        cost = min(get_request_cost(request, view), capacity)
+        try:
+            allowed, tokens, wait = _get_script()(
+                keys=[f'{self.key}:bucket'],
+                args=[capacity, capacity / self.duration, cost]
+            )
+        except redis.RedisError as e:
+            _log_unavailable(e)
+            return True
+
+        self.tokens = float(tokens)
+        self.retry_after = float(wait)
+        return bool(allowed)
+
+    def wait(self):
+        """Seconds until the request's cost is available again."""
+        return self.retry_after
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle, AnonRateThrottle):
+    """Bucket per client IP for anonymous requests ('anon' rate)."""
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle, UserRateThrottle):
+    """Bucket per user for authenticated requests ('user' rate)."""
+
+
+def _log_unavailable(error):
+    """Log Redis outages at most once per minute rather than per request."""
+    global _error_logged_at
+    now = time.monotonic()
+    if _error_logged_at is None or now - _error_logged_at > 60:
+        _error_logged_at = now
+        logger.warning(f"Rate limiter unavailable, not throttling: {str(error)}")
@@ -9,6 +9,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from satyacheck.core.metrics import metrics_view
 
 urlpatterns = [
     # Admin Panel
@@ -18,6 +19,9 @@ urlpatterns = [
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     
+    # Prometheus metrics (local scrapers only)
+    path('metrics', metrics_view, name='metrics'),
+    
     # JWT Token Endpoints
     path('api/v1/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/v1/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
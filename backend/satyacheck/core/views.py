@@ -2,13 +2,13 @@
 Custom error views for SatyaCheck backend.
 """
 
-from rest_framework.response import Response
+from django.http import JsonResponse
 from rest_framework import status
 
 
 def custom_404(request, exception=None):
     """Handle 404 errors with JSON response."""
-    return Response(
+    return JsonResponse(
         {
             'error': 'Not Found',
             'message': 'The requested resource was not found.',
@@ -19,7 +19,7 @@ def custom_404(request, exception=None):
 
 def custom_500(request):
     """Handle 500 errors with JSON response."""
-    return Response(
+    return JsonResponse(
         {
             'error': 'Internal Server Error',
             'message': 'An unexpected error occurred. Please try again later.',
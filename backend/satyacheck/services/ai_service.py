@@ -11,10 +11,15 @@ from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassifica
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from django.conf import settings
-from django.core.cache import cache
+import hashlib
+
+from satyacheck.services.cache_service import get_namespace
+from satyacheck.services.stage_timing import timed
 
 logger = logging.getLogger('satyacheck.ai')
 
+analysis_cache = get_namespace('analysis', timeout=settings.ANALYSIS_CACHE_TIMEOUT)
+
 
 class MisinformationDetectionModel:
     """
@@ -68,20 +73,80 @@ class MisinformationDetectionModel:
         Returns:
             dict: Analysis results with score and explanation
         """
-        if not text:
-            return {
-                'score': 50,
-                'confidence': 'low',
-                'category': 'unverifiable',
-                'explanation': 'No text provided for analysis.'
-            }
+        return self.analyze_texts([text], [language])[0]
+    
+    def analyze_texts(self, texts, languages=None, batch_size=None):
+        """
+        Analyze a batch of texts for misinformation.
+        The classifier runs once over the whole batch instead of once per text,
+        and only for texts whose result is not already cached.
         
-        try:
-            # Text preprocessing
-            cleaned_text = self._preprocess_text(text)
+        Args:
+            texts (list): Texts to analyze
+            languages (list): Language code per text (defaults to 'en')
+            batch_size (int): Classifier batch size (defaults to ANALYSIS_BATCH_SIZE)
+        
+        Returns:
+            list: Analysis results, in the same order as texts
+        """
+        if languages is None:
+            languages = ['en'] * len(texts)
+        
+        results = [None] * len(texts)
+        pending = []
+        
+        for index, text in enumerate(texts):
+            if not text:
+                results[index] = {
+                    'score': 50,
+                    'confidence': 'low',
+                    'category': 'unverifiable',
+                    'explanation': 'No text provided for analysis.'
+                }
+            else:
+                pending.append(index)
+        
+        if not pending:
+            return results
+        
+        with timed('preprocess'):
+            cleaned = {index: self._preprocess_text(texts[index]) for index in pending}
+            cache_keys = {index: self._analysis_cache_key(cleaned[index], languages[index]) for index in pending}
+        
+        cached = analysis_cache.get_many(set(cache_keys.values()))
+        for index in pending:
+            if cache_keys[index] in cached:
+                results[index] = cached[cache_keys[index]]
+        pending = [index for index in pending if results[index] is None]
+        
+        if not pending:
+            return results
+        
+        with timed('inference'):
+            sentiment_scores = self._analyze_sentiment_batch(
+                [cleaned[index] for index in pending],
+                batch_size=batch_size or settings.ANALYSIS_BATCH_SIZE
+            )
             
+            computed = {}
+            for index, sentiment_score in zip(pending, sentiment_scores):
+                results[index] = self._score_text(cleaned[index], sentiment_score, languages[index])
+                # Failed analyses carry no component scores and are not cached
+                if 'component_scores' in results[index]:
+                    computed[cache_keys[index]] = results[index]
+        
+        analysis_cache.set_many(computed)
+        return results
+    
+    @staticmethod
+    def _analysis_cache_key(cleaned_text, language):
+        """Cache key for the analysis of a preprocessed text."""
+        return f"{language}:{hashlib.sha256(cleaned_text.encode('utf-8')).hexdigest()}"
+    
+    def _score_text(self, cleaned_text, sentiment_score, language):
+        """Combine component scores for a preprocessed text."""
+        try:
             # Get multiple analysis scores
-            sentiment_score = self._analyze_sentiment(cleaned_text)
             keyword_score = self._check_misinformation_keywords(cleaned_text)
             length_score = self._analyze_text_length(cleaned_text)
             urgency_score = self._check_urgency_language(cleaned_text)
@@ -239,18 +304,30 @@ class MisinformationDetectionModel:
     
     def _analyze_sentiment(self, text):
         """Analyze sentiment and credibility."""
+        return self._analyze_sentiment_batch([text])[0]
+    
+    def _analyze_sentiment_batch(self, texts, batch_size=None):
+        """Analyze sentiment and credibility for several texts in one classifier call."""
         try:
             if self.classifier:
-                result = self.classifier(text[:512])  # Limit to 512 tokens
-                if result[0]['label'] == 'NEGATIVE':
-                    return 70  # Negative sentiment might indicate misinformation
-                elif result[0]['label'] == 'POSITIVE':
-                    return 40
-                else:
-                    return 50
+                # Limit to 512 tokens
+                predictions = self.classifier(
+                    [text[:512] for text in texts],
+                    batch_size=batch_size or len(texts)
+                )
+                return [self._sentiment_label_score(p['label']) for p in predictions]
         except Exception as e:
             logger.debug(f"Sentiment analysis error: {str(e)}")
         
+        return [50] * len(texts)
+    
+    @staticmethod
+    def _sentiment_label_score(label):
+        """Map a classifier label to a misinformation score."""
+        if label == 'NEGATIVE':
+            return 70  # Negative sentiment might indicate misinformation
+        elif label == 'POSITIVE':
+            return 40
         return 50
     
     def _check_misinformation_keywords(self, text):
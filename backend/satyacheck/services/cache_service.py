@@ -0,0 +1,337 @@
+"""
+Cache Service Module
+Two-tier cache shared by views, Celery tasks and services.
+
+Tier 1 is a small in-process LRU; tier 2 is the shared Django cache
+(Redis). Keys live in namespaces that can be invalidated wholesale by
+bumping a version. get_or_set() guards against stampedes with a
+recompute lock and probabilistic early refresh. If Redis is unreachable
+every call degrades to a miss instead of failing the request.
+"""
+
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+import logging
+import pickle
+import random
+import threading
+import time
+
+logger = logging.getLogger('satyacheck')
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """
+    Thread-safe in-process LRU with per-entry expiry.
+    Values are stored pickled so callers can never mutate a cached object.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get a value, or _MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, data = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(data)
+
+    def set(self, key, value, timeout):
+        """Store a value for timeout seconds."""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear_prefix(self, prefix):
+        """Remove every key starting with prefix."""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_local = LocalLRU(settings.CACHE_LOCAL_MAX_ENTRIES)
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+
+
+class CacheNamespace:
+    """
+    A group of related keys with a shared timeout and version.
+
+    Entries are stored in Redis as (value, refresh_at) so get_or_set() can
+    recompute shortly before expiry while other callers keep reading the
+    current value.
+    """
+
+    def __init__(self, name, timeout, local_timeout=None):
+        """
+        Args:
+            name (str): Key prefix, also used in stats
+            timeout (int): Shared (Redis) timeout in seconds
+            local_timeout (int): In-process timeout; 0 disables the local tier
+        """
+        self.name = name
+        self.timeout = timeout
+        self.local_timeout = min(
+            settings.CACHE_LOCAL_TIMEOUT if local_timeout is None else local_timeout,
+            timeout
+        )
+        self.version_check_interval = settings.CACHE_LOCAL_TIMEOUT
+        self.stats = {'local_hits': 0, 'hits': 0, 'misses': 0, 'errors': 0, 'recomputes': 0}
+        self._version = None
+        self._version_checked_at = 0
+        self._error_logged_at = None
+
+    @property
+    def backend(self):
+        return caches[settings.CACHE_SERVICE_ALIAS]
+
+    # Versioning
+
+    def _version_key(self):
+        return f'ns-version:{self.name}'
+
+    def get_version(self):
+        """
+        Get the namespace version.
+        Re-read from Redis at most once per CACHE_LOCAL_TIMEOUT, which bounds
+        how long another process's invalidate() can take to be seen here.
+        """
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at > self.version_check_interval:
+            version = self._call(self.backend.get, self._version_key())
+            if version is _MISSING or version is None:
+                version = 1
+                self._call(self.backend.add, self._version_key(), version, None)
+            if version != self._version:
+                _local.clear_prefix(f'{self.name}:')
+            self._version = version
+            self._version_checked_at = now
+        return self._version
+
+    def invalidate(self):
+        """Invalidate every key in the namespace, in all processes."""
+        version = self._call(self.backend.incr, self._version_key())
+        if version is _MISSING:
+            # Key missing or Redis down; start a fresh version either way
+            version = (self._version or 1) + 1
+            self._call(self.backend.set, self._version_key(), version, None)
+        _local.clear_prefix(f'{self.name}:')
+        self._version = version
+        self._version_checked_at = time.monotonic()
+
+    def make_key(self, key):
+        return f'{self.name}:{self.get_version()}:{key}'
+
+    # Basic operations
+
+    def get(self, key, default=None):
+        """Get a value from the local tier, then Redis."""
+        value = self._get_entry(self.make_key(key))
+        if value is _MISSING:
+            return default
+        return value[0]
+
+    def set(self, key, value, timeout=None):
+        """Store a value in both tiers."""
+        timeout = self.timeout if timeout is None else timeout
+        self._set_entry(self.make_key(key), value, timeout)
+
+    def delete(self, key):
+        """Remove a key from both tiers in this process and from Redis."""
+        full_key = self.make_key(key)
+        _local.delete(full_key)
+        self._call(self.backend.delete, full_key)
+
+    def delete_many(self, keys):
+        """Remove several keys."""
+        full_keys = [self.make_key(key) for key in keys]
+        for full_key in full_keys:
+            _local.delete(full_key)
+        self._call(self.backend.delete_many, full_keys)
+
+    def get_many(self, keys):
+        """Get {key: value} for the keys that are cached."""
+        found = {}
+        remote = {}
+        for key in keys:
+            full_key = self.make_key(key)
+            entry = _local.get(full_key) if self.local_timeout > 0 else _MISSING
+            if entry is _MISSING:
+                remote[full_key] = key
+            else:
+                self.stats['local_hits'] += 1
+                found[key] = entry[0]
+
+        if remote:
+            entries = self._call(self.backend.get_many, list(remote))
+            if entries is _MISSING:
+                entries = {}
+            for full_key, key in remote.items():
+                entry = entries.get(full_key)
+                if entry is None:
+                    self.stats['misses'] += 1
+                    continue
+                self.stats['hits'] += 1
+                self._set_local(full_key, entry, self.local_timeout)
+                found[key] = entry[0]
+
+        return found
+
+    def set_many(self, values, timeout=None):
+        """Store several {key: value} pairs."""
+        timeout = self.timeout if timeout is None else timeout
+        entries = {}
+        for key, value in values.items():
+            full_key = self.make_key(key)
+            entry = (value, time.time() + timeout * settings.CACHE_REFRESH_AHEAD)
+            self._set_local(full_key, entry, min(self.local_timeout, timeout))
+            entries[full_key] = entry
+        self._call(self.backend.set_many, entries, timeout)
+
+    def get_or_set(self, key, compute, timeout=None):
+        """
+        Get a value, computing and storing it on a miss.
+
+        Only the caller holding the recompute lock runs compute(); others
+        wait briefly for its result. Near expiry, one caller refreshes the
+        value early while the rest keep the current one.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        full_key = self.make_key(key)
+        lock_key = f'lock:{full_key}'
+
+        entry = self._get_entry(full_key)
+        if entry is not _MISSING:
+            value, refresh_at = entry
+            if not self._should_refresh(refresh_at, timeout):
+                return value
+            # Early recompute: whoever takes the lock refreshes, others serve the current value
+            if self._call(self.backend.add, lock_key, 1, settings.CACHE_LOCK_TIMEOUT) is not True:
+                return value
+            return self._recompute(full_key, lock_key, compute, timeout)
+
+        acquired = self._call(self.backend.add, lock_key, 1, settings.CACHE_LOCK_TIMEOUT)
+        if acquired is True or acquired is _MISSING:
+            # Holding the lock, or Redis is down and there is no one to coordinate with
+            return self._recompute(full_key, lock_key, compute, timeout)
+
+        # Someone else is computing: wait for their value rather than duplicating work
+        deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self._get_entry(full_key, count=False)
+            if entry is not _MISSING:
+                return entry[0]
+
+        logger.warning(f"Cache lock wait timed out for {full_key}, computing locally")
+        return self._recompute(full_key, None, compute, timeout)
+
+    # Internals
+
+    def _should_refresh(self, refresh_at, timeout):
+        """Randomized refresh-ahead so concurrent callers rarely refresh together."""
+        now = time.time()
+        if now < refresh_at:
+            return False
+        window = timeout * (1 - settings.CACHE_REFRESH_AHEAD)
+        return window <= 0 or random.random() < (now - refresh_at) / window
+
+    def _recompute(self, full_key, lock_key, compute, timeout):
+        self.stats['recomputes'] += 1
+        try:
+            value = compute()
+            self._set_entry(full_key, value, timeout)
+            return value
+        finally:
+            if lock_key is not None:
+                self._call(self.backend.delete, lock_key)
+
+    def _get_entry(self, full_key, count=True):
+        entry = _local.get(full_key) if self.local_timeout > 0 else _MISSING
+        if entry is not _MISSING:
+            if count:
+                self.stats['local_hits'] += 1
+            return entry
+
+        entry = self._call(self.backend.get, full_key)
+        if entry is _MISSING or entry is None:
+            if count:
+                self.stats['misses'] += 1
+            return _MISSING
+
+        if count:
+            self.stats['hits'] += 1
+        self._set_local(full_key, entry, self.local_timeout)
+        return entry
+
+    def _set_entry(self, full_key, value, timeout):
+        entry = (value, time.time() + timeout * settings.CACHE_REFRESH_AHEAD)
+        self._set_local(full_key, entry, min(self.local_timeout, timeout))
+        self._call(self.backend.set, full_key, entry, timeout)
+
+    def _set_local(self, full_key, entry, timeout):
+        """Store in the local tier unless it is disabled for this namespace."""
+        if timeout > 0:
+            _local.set(full_key, entry, timeout)
+
+    def _call(self, method, *args):
+        """Call the shared backend, returning _MISSING if it is unavailable."""
+        try:
+            return method(*args)
+        except Exception as e:
+            self.stats['errors'] += 1
+            # Log once per lock timeout rather than on every call during an outage
+            now = time.monotonic()
+            if self._error_logged_at is None or now - self._error_logged_at > settings.CACHE_LOCK_TIMEOUT:
+                self._error_logged_at = now
+                logger.warning(f"Shared cache unavailable ({self.name}): {str(e)}")
+            return _MISSING
+
+
+def get_namespace(name, timeout=None, local_timeout=None):
+    """Get (or create) the process-wide namespace called name."""
+    namespace = _namespaces.get(name)
+    if namespace is None:
+        with _namespaces_lock:
+            namespace = _namespaces.get(name)
+            if namespace is None:
+                namespace = CacheNamespace(
+                    name,
+                    settings.CACHE_DEFAULT_TIMEOUT if timeout is None else timeout,
+                    local_timeout
+                )
+                _namespaces[name] = namespace
+    return namespace
+
+
+def get_stats():
+    """Get hit/miss counters for this process, per namespace."""
+    stats = {}
+    for name, namespace in _namespaces.items():
+        lookups = namespace.stats['local_hits'] + namespace.stats['hits'] + namespace.stats['misses']
+        hits = namespace.stats['local_hits'] + namespace.stats['hits']
+        stats[name] = dict(namespace.stats, hit_rate=round(hits / lookups, 3) if lookups else None)
+    return {'local_entries': len(_local), 'namespaces': stats}
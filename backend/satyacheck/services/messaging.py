@@ -0,0 +1,83 @@
+"""
+Outgoing email and SMS over long-lived connections.
+Each worker thread keeps one SMTP connection and one HTTP session to the
+SMS provider open between messages instead of connecting per message.
+"""
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+import logging
+import requests
+import smtplib
+import threading
+
+logger = logging.getLogger('satyacheck')
+
+_local = threading.local()
+
+
+def _get_mail_connection():
+    """Get this thread's open email connection."""
+    connection = getattr(_local, 'mail_connection', None)
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        _local.mail_connection = connection
+    return connection
+
+
+def _reset_mail_connection():
+    connection = getattr(_local, 'mail_connection', None)
+    _local.mail_connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def send_email(subject, body, recipient):
+    """
+    Send a plain-text email over the pooled connection.
+    A connection the server has dropped (e.g. after an idle timeout) is
+    reopened once; other errors are raised to the caller.
+    """
+    message = EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient])
+    try:
+        message.connection = _get_mail_connection()
+        return message.send()
+    except smtplib.SMTPServerDisconnected:
+        _reset_mail_connection()
+        message.connection = _get_mail_connection()
+        return message.send()
+    except Exception:
+        _reset_mail_connection()
+        raise
+
+
+def _get_sms_session():
+    """Get this thread's HTTP session for the SMS provider."""
+    session = getattr(_local, 'sms_session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['Authorization'] = f'Bearer {settings.SMS_API_KEY}'
+        _local.sms_session = session
+    return session
+
+
+def send_sms(phone, body):
+    """
+    Send an SMS through the HTTP provider at SMS_API_URL.
+    Returns False if no provider is configured.
+    """
+    if not settings.SMS_API_URL:
+        logger.warning(f"SMS_API_URL is not set, SMS to {phone} not sent")
+        return False
+
+    response = _get_sms_session().post(
+        settings.SMS_API_URL,
+        json={'to': phone, 'from': settings.SMS_SENDER, 'body': body},
+        timeout=settings.SMS_TIMEOUT
+    )
+    response.raise_for_status()
+    return True
@@ -0,0 +1,28 @@
+"""
+Shared Redis connections.
+One connection pool per process for sync code (views, Celery tasks) and
+one asyncio client per process for ASGI streaming views.
+"""
+
+from django.conf import settings
+import redis
+import redis.asyncio
+
+_client = None
+_async_client = None
+
+
+def get_redis():
+    """Get the process-wide synchronous Redis client."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+def get_async_redis():
+    """Get the process-wide asyncio Redis client (ASGI only)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+    return _async_client
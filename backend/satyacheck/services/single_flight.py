@@ -0,0 +1,85 @@
+"""
+Single-flight coordination over Redis.
+Lets one worker own a unit of work (identified by a key) while other
+workers register as waiters to receive its result.
+"""
+
+import logging
+
+from satyacheck.services.redis_client import get_redis
+
+logger = logging.getLogger('satyacheck')
+
+# Delete the lock only if we still own it
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Distributed lock plus waiting list per key.
+
+    If Redis is unavailable every caller is treated as the owner, so work
+    is duplicated rather than blocked.
+    """
+
+    def __init__(self, name, lock_timeout, waiter_timeout):
+        """
+        Args:
+            name (str): Redis key prefix
+            lock_timeout (int): Seconds before an abandoned lock expires
+            waiter_timeout (int): Seconds a waiting list is kept
+        """
+        self.name = name
+        self.lock_timeout = lock_timeout
+        self.waiter_timeout = waiter_timeout
+        self._release = None
+
+    def _lock_key(self, key):
+        return f'{self.name}:lock:{key}'
+
+    def _waiters_key(self, key):
+        return f'{self.name}:waiters:{key}'
+
+    def acquire(self, key, token):
+        """Try to become the owner of key. Returns True on success."""
+        try:
+            return bool(get_redis().set(self._lock_key(key), token, nx=True, ex=self.lock_timeout))
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable for {key}: {str(e)}")
+            return True
+
+    def release(self, key, token):
+        """Release key if token still owns it."""
+        try:
+            if self._release is None:
+                self._release = get_redis().register_script(RELEASE_SCRIPT)
+            self._release(keys=[self._lock_key(key)], args=[token])
+        except Exception as e:
+            logger.warning(f"Could not release single-flight lock for {key}: {str(e)}")
+
+    def add_waiter(self, key, member):
+        """Register member to receive the owner's result."""
+        try:
+            pipeline = get_redis().pipeline()
+            pipeline.sadd(self._waiters_key(key), member)
+            pipeline.expire(self._waiters_key(key), self.waiter_timeout)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Could not register single-flight waiter for {key}: {str(e)}")
+
+    def drain_waiters(self, key):
+        """Atomically take and clear the waiting list for key."""
+        try:
+            pipeline = get_redis().pipeline()
+            pipeline.smembers(self._waiters_key(key))
+            pipeline.delete(self._waiters_key(key))
+            members, _ = pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Could not read single-flight waiters for {key}: {str(e)}")
+            return []
+        return [member.decode('utf-8') for member in members]
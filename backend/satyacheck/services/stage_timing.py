@@ -0,0 +1,171 @@
+"""
+Per-stage analysis timing.
+
+A StageTimer collects how long each stage of one submission's analysis
+took, in milliseconds. While a timer is active (inside `with timer:`),
+code further down, such as the scraper and the model, reports its stages
+with timed() without the timer being passed through. Code outside an
+analysis, such as the ad-hoc analysis endpoints, records nothing.
+
+Finished timings are stored on the VerificationResult and added to
+hourly histograms in Redis. get_timing_histograms() sums those over the
+last ANALYSIS_TIMING_WINDOW_HOURS, so per-stage distributions are shared
+by all workers and roll forward on their own.
+"""
+
+from contextlib import contextmanager
+from django.conf import settings
+import logging
+import redis
+import threading
+import time
+
+from satyacheck.services.redis_client import get_redis
+
+logger = logging.getLogger('satyacheck')
+
+STAGES = ('queue_wait', 'fetch', 'parse', 'preprocess', 'inference', 'persist', 'notify')
+# Histogram of the whole analysis, from task start to notification
+TOTAL = 'total'
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+
+_local = threading.local()
+
+
+class StageTimer:
+    """Stage durations for one analysis."""
+
+    def __init__(self):
+        self.timings = {}
+        self.started = time.monotonic()
+
+    def add(self, stage, seconds):
+        """Add time spent in a stage (stages may be entered more than once)."""
+        self.timings[stage] = self.timings.get(stage, 0.0) + max(seconds, 0.0) * 1000
+
+    def merge(self, timings):
+        """Add {stage: milliseconds} recorded elsewhere, e.g. by a subtask."""
+        for stage, milliseconds in timings.items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + milliseconds
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage name."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def as_dict(self):
+        """Get {stage: whole milliseconds} for the stages that ran."""
+        return {stage: round(milliseconds) for stage, milliseconds in self.timings.items()}
+
+    def elapsed_ms(self):
+        """Get milliseconds since the timer was created."""
+        return round((time.monotonic() - self.started) * 1000)
+
+    def __enter__(self):
+        self._previous = getattr(_local, 'timer', None)
+        _local.timer = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _local.timer = self._previous
+
+
+def current_timer():
+    """Get this thread's active StageTimer, or None."""
+    return getattr(_local, 'timer', None)
+
+
+@contextmanager
+def timed(stage):
+    """Time the enclosed block as stage on the active timer, if there is one."""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    with timer.stage(stage):
+        yield
+
+
+def _histogram_key(hour, stage):
+    return f'analysis-timings:{hour}:{stage}'
+
+
+def _bucket(milliseconds):
+    for bound in BUCKETS_MS:
+        if milliseconds <= bound:
+            return str(bound)
+    return 'inf'
+
+
+def record_timings(results):
+    """Add the stage timings of analysis results to the current hour's histograms."""
+    hour = int(time.time() // 3600)
+    ttl = (settings.ANALYSIS_TIMING_WINDOW_HOURS + 1) * 3600
+
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for result in results:
+            for stage, milliseconds in list(result.stage_timings.items()) + [(TOTAL, result.analysis_duration_ms)]:
+                key = _histogram_key(hour, stage)
+                pipe.hincrby(key, _bucket(milliseconds), 1)
+                pipe.hincrby(key, 'count', 1)
+                pipe.hincrby(key, 'sum', round(milliseconds))
+                pipe.expire(key, ttl)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not record analysis timings: {str(e)}")
+
+
+def _percentile(buckets, count, fraction):
+    """Estimate a percentile as the upper bound of the bucket it falls in."""
+    seen = 0
+    for bound in BUCKETS_MS:
+        seen += buckets.get(str(bound), 0)
+        if seen >= count * fraction:
+            return bound
+    return None
+
+
+def get_timing_histograms(hours=None):
+    """
+    Get per-stage histograms summed over the last hours
+    (ANALYSIS_TIMING_WINDOW_HOURS by default).
+    Returns {stage: {count, mean_ms, p50_ms, p95_ms, buckets}}; a percentile
+    above the largest bucket is None.
+    """
+    hours = hours or settings.ANALYSIS_TIMING_WINDOW_HOURS
+    current = int(time.time() // 3600)
+    stages = STAGES + (TOTAL,)
+
+    pipe = get_redis().pipeline(transaction=False)
+    for stage in stages:
+        for hour in range(current - hours + 1, current + 1):
+            pipe.hgetall(_histogram_key(hour, stage))
+    rows = iter(pipe.execute())
+
+    histograms = {}
+    for stage in stages:
+        totals = {}
+        for _ in range(hours):
+            for field, value in next(rows).items():
+                totals[field.decode()] = totals.get(field.decode(), 0) + int(value)
+
+        count = totals.pop('count', 0)
+        total = totals.pop('sum', 0)
+        if not count:
+            continue
+
+        histograms[stage] = {
+            'count': count,
+            'mean_ms': round(total / count, 1),
+            'p50_ms': _percentile(totals, count, 0.5),
+            'p95_ms': _percentile(totals, count, 0.95),
+            'buckets': {bound: totals.get(bound, 0) for bound in [str(b) for b in BUCKETS_MS] + ['inf']},
+        }
+    return histograms
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from satyacheck.services import cache_service
+from satyacheck.services.cache_service import LocalLRU
+
+
+@pytest.fixture
+def namespace():
+    namespace = cache_service.CacheNamespace('test', timeout=60)
+    yield namespace
+    cache_service._local.clear_prefix('test:')
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LocalLRU(2)
+    lru.set('a', 1, 60)
+    lru.set('b', 2, 60)
+    lru.get('a')
+    lru.set('c', 3, 60)
+
+    assert lru.get('a') == 1
+    assert lru.get('b') is cache_service._MISSING
+    assert lru.get('c') == 3
+
+
+def test_lru_expires_entries():
+    lru = LocalLRU(2)
+    lru.set('a', 1, -1)
+
+    assert lru.get('a') is cache_service._MISSING
+    assert len(lru) == 0
+
+
+def test_lru_returns_copies():
+    lru = LocalLRU(2)
+    lru.set('a', [1], 60)
+    lru.get('a').append(2)
+
+    assert lru.get('a') == [1]
+
+
+def test_get_or_set_computes_once(namespace):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'total': 3}
+
+    assert namespace.get_or_set('stats', compute) == {'total': 3}
+    assert namespace.get_or_set('stats', compute) == {'total': 3}
+    assert len(calls) == 1
+
+
+def test_shared_tier_serves_other_processes(namespace):
+    namespace.set('stats', 5)
+    # As seen by another process, whose local tier is empty
+    cache_service._local.clear_prefix('test:')
+
+    assert namespace.get('stats') == 5
+    assert namespace.stats['hits'] == 1
+
+
+def test_invalidate_drops_every_key(namespace):
+    namespace.set('a', 1)
+    namespace.set('b', 2)
+
+    namespace.invalidate()
+
+    assert namespace.get('a') is None
+    assert namespace.get('b') is None
+
+
+def test_invalidate_reaches_other_processes(namespace):
+    other = cache_service.CacheNamespace('test', timeout=60)
+    namespace.set('a', 1)
+    assert other.get('a') == 1
+
+    namespace.invalidate()
+    other._version_checked_at = 0
+
+    assert other.get('a') is None
+
+
+def test_waits_for_the_lock_holder(namespace, settings):
+    settings.CACHE_LOCK_WAIT = 0.2
+    namespace.backend.add(f"lock:{namespace.make_key('stats')}", 1, 30)
+    start = time.monotonic()
+
+    value = namespace.get_or_set('stats', lambda: 'computed locally')
+
+    assert value == 'computed locally'
+    assert time.monotonic() - start >= 0.2
+
+
+def test_outage_degrades_to_compute(namespace, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError('down')
+
+    for method in ('get', 'set', 'add', 'delete'):
+        monkeypatch.setattr(namespace.backend, method, unavailable)
+
+    assert namespace.get_or_set('stats', lambda: 7) == 7
+    assert namespace.stats['errors'] > 0
+
+
+def test_get_many_reads_both_tiers(namespace):
+    namespace.set_many({'a': 1, 'b': 2})
+    cache_service._local.delete(namespace.make_key('b'))
+
+    assert namespace.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 2}
+    assert namespace.stats['local_hits'] == 1
+    assert namespace.stats['hits'] == 1
+    assert namespace.stats['misses'] == 1
@@ -0,0 +1,46 @@
+import pytest
+import redis
+
+from satyacheck.services import redis_client
+from satyacheck.services.single_flight import SingleFlight
+
+
+@pytest.fixture
+def flight():
+    return SingleFlight('test-flight', lock_timeout=60, waiter_timeout=60)
+
+
+def test_only_one_owner(flight):
+    assert flight.acquire('hash', 'first')
+    assert not flight.acquire('hash', 'second')
+    assert flight.acquire('other-hash', 'second')
+
+
+def test_release_requires_ownership(flight):
+    flight.acquire('hash', 'first')
+
+    flight.release('hash', 'second')
+    assert not flight.acquire('hash', 'second')
+
+    flight.release('hash', 'first')
+    assert flight.acquire('hash', 'second')
+
+
+def test_waiters_are_drained_once(flight):
+    flight.add_waiter('hash', 'a')
+    flight.add_waiter('hash', 'b')
+
+    assert sorted(flight.drain_waiters('hash')) == ['a', 'b']
+    assert flight.drain_waiters('hash') == []
+
+
+def test_everyone_owns_when_redis_is_down(flight, monkeypatch):
+    class Unavailable:
+        def __getattr__(self, name):
+            raise redis.ConnectionError('down')
+
+    monkeypatch.setattr(redis_client, '_client', Unavailable())
+
+    assert flight.acquire('hash', 'first')
+    assert flight.acquire('hash', 'second')
+    assert flight.drain_waiters('hash') == []
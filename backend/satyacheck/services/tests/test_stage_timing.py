@@ -0,0 +1,106 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import redis
+
+from satyacheck.services import stage_timing
+from satyacheck.services.redis_client import get_redis
+from satyacheck.services.stage_timing import (
+    StageTimer, TOTAL, current_timer, get_timing_histograms, record_timings, timed
+)
+
+
+def result(total, **stages):
+    return SimpleNamespace(stage_timings=stages, analysis_duration_ms=total)
+
+
+def test_stages_add_up_when_entered_again():
+    timer = StageTimer()
+    timer.add('fetch', 0.010)
+    timer.add('fetch', 0.0125)
+    timer.merge({'inference': 40.4})
+
+    assert timer.as_dict() == {'fetch': 22, 'inference': 40}
+
+
+def test_timed_reports_to_the_active_timer():
+    with StageTimer() as timer:
+        with timed('parse'):
+            time.sleep(0.01)
+
+    assert timer.as_dict()['parse'] >= 10
+    assert current_timer() is None
+
+
+def test_timed_without_a_timer_records_nothing():
+    with timed('parse'):
+        pass
+
+    assert current_timer() is None
+
+
+def test_nested_timers_restore_the_outer_one():
+    with StageTimer() as outer:
+        with StageTimer() as inner:
+            with timed('inference'):
+                pass
+        with timed('persist'):
+            pass
+
+    assert set(inner.as_dict()) == {'inference'}
+    assert set(outer.as_dict()) == {'persist'}
+
+
+def test_timer_is_not_shared_between_threads():
+    seen = []
+    with StageTimer():
+        thread = threading.Thread(target=lambda: seen.append(current_timer()))
+        thread.start()
+        thread.join()
+
+    assert seen == [None]
+
+
+def test_histograms_summarize_recorded_timings(settings):
+    settings.ANALYSIS_TIMING_WINDOW_HOURS = 24
+    record_timings([result(120, fetch=40, inference=70) for _ in range(9)] + [result(900, fetch=600)])
+
+    histograms = get_timing_histograms()
+
+    assert histograms['fetch']['count'] == 10
+    assert histograms['fetch']['mean_ms'] == 96.0
+    assert histograms['fetch']['p50_ms'] == 50
+    assert histograms['fetch']['p95_ms'] == 1000
+    assert histograms['fetch']['buckets']['50'] == 9
+    assert histograms['inference']['count'] == 9
+    assert histograms[TOTAL]['count'] == 10
+    assert 'queue_wait' not in histograms
+
+
+def test_percentile_beyond_the_largest_bucket_is_none():
+    record_timings([result(400000)])
+
+    histogram = get_timing_histograms()[TOTAL]
+
+    assert histogram['buckets']['inf'] == 1
+    assert histogram['p50_ms'] is None
+
+
+def test_histograms_roll_forward(settings):
+    settings.ANALYSIS_TIMING_WINDOW_HOURS = 3
+    hour = int(time.time() // 3600)
+    for offset, count in ((2, 5), (3, 7)):
+        get_redis().hset(stage_timing._histogram_key(hour - offset, TOTAL), mapping={'10': count, 'count': count, 'sum': count})
+
+    assert get_timing_histograms()[TOTAL]['count'] == 5
+    assert get_timing_histograms(hours=4)[TOTAL]['count'] == 12
+
+
+def test_recording_survives_redis_errors(monkeypatch):
+    def unavailable():
+        raise redis.ConnectionError('down')
+
+    monkeypatch.setattr(stage_timing, 'get_redis', unavailable)
+
+    record_timings([result(100, fetch=10)])
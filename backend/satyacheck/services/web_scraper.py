@@ -5,11 +5,18 @@ Web scraping utilities for extracting content from URLs.
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
+from django.conf import settings
+import hashlib
 import logging
 from datetime import datetime
 
+from satyacheck.services.cache_service import get_namespace
+from satyacheck.services.stage_timing import timed
+
 logger = logging.getLogger('satyacheck')
 
+scrape_cache = get_namespace('scraper', timeout=settings.SCRAPE_CACHE_TIMEOUT)
+
 
 class WebScraper:
     """
@@ -33,6 +40,7 @@ class WebScraper:
     def scrape_url(self, url):
         """
         Scrape content from URL.
+        Successful scrapes are cached for SCRAPE_CACHE_TIMEOUT seconds.
         
         Args:
             url (str): URL to scrape
@@ -40,33 +48,47 @@ class WebScraper:
         Returns:
             dict: Scraped content
         """
+        cache_key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        result = scrape_cache.get(cache_key)
+        if result is not None:
+            return result
+        
+        result = self._fetch_and_parse(url)
+        if result['success']:
+            scrape_cache.set(cache_key, result)
+        return result
+    
+    def _fetch_and_parse(self, url):
+        """Fetch and parse a URL without caching."""
         try:
             # Fetch the page
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=self.timeout,
-                verify=True
-            )
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with timed('fetch'):
+                response = requests.get(
+                    url,
+                    headers=self.headers,
+                    timeout=self.timeout,
+                    verify=True
+                )
+                response.raise_for_status()
             
-            # Extract data
-            result = {
-                'success': True,
-                'url': url,
-                'domain': urlparse(url).netloc,
-                'title': self._extract_title(soup),
-                'description': self._extract_description(soup),
-                'main_text': self._extract_main_text(soup),
-                'authors': self._extract_authors(soup),
-                'publish_date': self._extract_publish_date(soup),
-                'language': self._detect_language(soup),
-                'links': self._extract_links(soup),
-                'images': self._extract_images(soup),
-            }
+            with timed('parse'):
+                # Parse HTML
+                soup = BeautifulSoup(response.content, 'html.parser')
+                
+                # Extract data
+                result = {
+                    'success': True,
+                    'url': url,
+                    'domain': urlparse(url).netloc,
+                    'title': self._extract_title(soup),
+                    'description': self._extract_description(soup),
+                    'main_text': self._extract_main_text(soup),
+                    'authors': self._extract_authors(soup),
+                    'publish_date': self._extract_publish_date(soup),
+                    'language': self._detect_language(soup),
+                    'links': self._extract_links(soup),
+                    'images': self._extract_images(soup),
+                }
             
             return result
         
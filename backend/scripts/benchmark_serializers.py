@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Benchmark submission list serialization.
+Compares SubmissionListSerializer with SubmissionListValuesSerializer on
+in-memory rows (no database needed) and checks both render identical JSON.
+
+Usage: python scripts/benchmark_serializers.py [--rounds N]
+"""
+
+import os
+import sys
+import argparse
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'satyacheck.core.settings')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import django
+django.setup()
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from satyacheck.apps.users.models import User
+from satyacheck.apps.submissions.models import Submission
+from satyacheck.apps.submissions.serializers import (
+    SubmissionListSerializer, SubmissionListValuesSerializer
+)
+
+PAGE_SIZES = (20, 100, 1000)
+
+
+def build_rows(count):
+    """Build matching model instances and values() rows."""
+    now = timezone.now()
+    users = [
+        User(
+            id=uuid.uuid4(),
+            username=f'user{index}',
+            email=f'user{index}@example.com',
+            first_name='Test' if index % 2 else '',
+            last_name='User' if index % 2 else '',
+            role=User.ROLE_CHOICES[index % len(User.ROLE_CHOICES)][0],
+            profile_picture='profiles/avatar.png' if index % 3 == 0 else None,
+            submission_count=index,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(10)
+    ]
+
+    instances = []
+    rows = []
+    for index in range(count):
+        user = users[index % len(users)] if index % 7 else None
+        submission = Submission(
+            id=uuid.uuid4(),
+            user=user,
+            title=f'Submission {index}',
+            description='Example description' if index % 2 else None,
+            submission_type=Submission.SUBMISSION_TYPE_CHOICES[index % 5][0],
+            status=Submission.STATUS_CHOICES[index % 5][0],
+            language=Submission.LANGUAGE_CHOICES[index % 4][0],
+            is_anonymous=index % 11 == 0,
+            is_flagged=index % 13 == 0,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+            analyzed_at=now if index % 2 else None,
+        )
+        instances.append(submission)
+
+        row = {field: getattr(submission, field) for field in SubmissionListValuesSerializer.fields
+               if not field.startswith('user__')}
+        for field in SubmissionListValuesSerializer.user_fields:
+            value = getattr(user, field) if user else None
+            row[f'user__{field}'] = value.name if field == 'profile_picture' and user else value
+        rows.append(row)
+
+    return instances, rows
+
+
+def rows_per_second(serialize, rounds):
+    """Time serialize() and return the best rows/second over rounds."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = len(serialize())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    request = APIRequestFactory().get('/api/v1/submissions/', HTTP_HOST='localhost')
+    context = {'request': request}
+    renderer = JSONRenderer()
+
+    print(f"{'page size':>10} {'serializer rows/s':>20} {'values rows/s':>16} {'speedup':>9}")
+
+    for page_size in PAGE_SIZES:
+        instances, rows = build_rows(page_size)
+
+        current = lambda: SubmissionListSerializer(instances, many=True, context=context).data
+        fast = lambda: SubmissionListValuesSerializer(rows, context=context).data
+
+        if renderer.render(current()) != renderer.render(fast()):
+            print(f"✗ Output mismatch at page size {page_size}")
+            sys.exit(1)
+
+        current_rate = rows_per_second(current, args.rounds)
+        fast_rate = rows_per_second(fast, args.rounds)
+        print(f"{page_size:>10} {current_rate:>20,.0f} {fast_rate:>16,.0f} {fast_rate / current_rate:>8.1f}x")
+
+    print("✓ Outputs are byte-identical")
+
+
+if __name__ == '__main__':
+    main()